@@ -0,0 +1,318 @@
+"""
+Delivery load test against local stand-in subscribers.
+
+Synthetic create and update events of `User`, `Transaction`, `PurchasedItem` and
+`Punishment` go through the real mixin code paths (`get_triggered_events`,
+`get_payload_for_scope` with an `AsyncSession` on an in-memory SQLite database,
+which needs `aiosqlite`), then fan out to every stand-in subscriber through
+`ShardedWebhookDispatcher` and `WebhookDeliverer`. Subscribers are in-process
+ASGI apps reached through `httpx.ASGITransport`, with configurable latency and
+error rate, so runs need no network and are comparable between changes.
+
+    python benchmarks/delivery_load.py --events 5000 --subscribers 4 --latency 0.005
+"""
+
+import argparse
+import asyncio
+import random
+import resource
+import time
+import tracemalloc
+import warnings
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, NamedTuple
+
+import httpx
+from sqlalchemy import inspect
+from sqlalchemy.exc import SAWarning
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import configure_mappers, make_transient_to_detached
+
+import uaproject_backend_schemas.models as models
+from uaproject_backend_schemas.payments.purchases.schemas import PurchasedItemStatus
+from uaproject_backend_schemas.payments.transactions.schemas import TransactionType
+from uaproject_backend_schemas.punishments.schemas import PunishmentStatus, PunishmentType
+from uaproject_backend_schemas.webhooks import (
+    InMemoryMetricsSink,
+    ShardedWebhookDispatcher,
+    WebhookDeliverer,
+    WebhookDeliveryError,
+    WebhookDeliveryJob,
+    WebhookEncoding,
+    register_all_scopes,
+    scope_priority,
+    set_metrics,
+)
+
+
+class StandInSubscriber:
+    """ASGI endpoint answering after `latency` ± `jitter` seconds, failing `error_rate` of requests"""
+
+    def __init__(self, latency: float, jitter: float, error_rate: float, seed: int):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.received = 0
+        self.failed = 0
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        while (await receive()).get("more_body"):
+            pass
+        self.received += 1
+
+        delay = self.latency + self.random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        status = 204
+        if self.random.random() < self.error_rate:
+            self.failed += 1
+            status = 503
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+
+class StandInRouter:
+    """ASGI app routing `/<index>` to the stand-in subscriber with that index"""
+
+    def __init__(self, subscribers: List[StandInSubscriber]):
+        self.subscribers = subscribers
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        await self.subscribers[int(scope["path"].strip("/"))](scope, receive, send)
+
+
+def as_loaded(instance: Any) -> None:
+    """Turn a new instance into a detached one, as if loaded with its current values"""
+    state = inspect(instance)
+    for column in instance.__table__.columns.keys():
+        if column not in state.dict:
+            setattr(instance, column, None)
+    make_transient_to_detached(instance)
+
+
+def user_event(index: int, create: bool) -> Any:
+    user = models.User(
+        id=index, discord_id=index * 7, minecraft_nickname=f"player{index}", is_superuser=False
+    )
+    if create:
+        return user
+    as_loaded(user)
+    user.minecraft_nickname = f"renamed{index}"
+    return user
+
+
+def transaction_event(index: int, create: bool) -> Any:
+    transaction = models.Transaction(
+        id=index,
+        user_id=index,
+        recipient_id=index,
+        amount=Decimal("10.50"),
+        type=TransactionType.DEPOSIT,
+        description="load test",
+        transaction_metadata={"source": "benchmark"},
+        service=None,
+    )
+    if create:
+        return transaction
+    as_loaded(transaction)
+    transaction.amount = Decimal("12.75")
+    return transaction
+
+
+def purchased_item_event(index: int, create: bool) -> Any:
+    item = models.PurchasedItem(
+        id=index,
+        user_id=index,
+        service_id=1,
+        transaction_id=index,
+        status=PurchasedItemStatus.ACTIVE,
+        quantity=1,
+        expires_at=datetime.now(UTC) + timedelta(days=30),
+        purchase_metadata={"server": "survival"},
+        user=None,
+        service=None,
+        transaction=None,
+    )
+    if create:
+        return item
+    as_loaded(item)
+    item.status = PurchasedItemStatus.SUSPENDED
+    return item
+
+
+def punishment_event(index: int, create: bool) -> Any:
+    punishment = models.Punishment(
+        id=index,
+        user_id=index,
+        admin_id=1,
+        type=PunishmentType.MUTE,
+        status=PunishmentStatus.ACTIVE,
+        reason="load test",
+        expires_at=datetime.now(UTC) + timedelta(hours=1),
+        punishment_metadata={},
+        user=models.User(id=index, discord_id=index * 7, minecraft_nickname=f"player{index}"),
+        admin=None,
+        config=None,
+    )
+    if create:
+        return punishment
+    as_loaded(punishment)
+    punishment.status = PunishmentStatus.REVOKED
+    return punishment
+
+
+EVENT_FACTORIES = (user_event, transaction_event, purchased_item_event, punishment_event)
+
+
+class Delivery(NamedTuple):
+    job: WebhookDeliveryJob
+    queued_at: float
+
+
+def percentile(values: List[float], share: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+async def run(args: argparse.Namespace) -> None:
+    subscribers = [
+        StandInSubscriber(args.latency, args.jitter, args.error_rate, args.seed + index)
+        for index in range(args.subscribers)
+    ]
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=StandInRouter(subscribers)), base_url="http://standin"
+    )
+    deliverer = WebhookDeliverer(client)
+    encoding = WebhookEncoding(args.encoding)
+    # Relationships of the synthetic rows are preloaded, so the session never queries
+    engine = create_async_engine("sqlite+aiosqlite://")
+    session = AsyncSession(engine)
+
+    request_latencies: List[float] = []
+    delivery_latencies: List[float] = []
+    failures = 0
+
+    async def deliver(delivery: Delivery) -> None:
+        nonlocal failures
+        started = time.perf_counter()
+        try:
+            await deliverer.deliver(delivery.job)
+        except WebhookDeliveryError:
+            failures += 1
+        finished = time.perf_counter()
+        request_latencies.append(finished - started)
+        delivery_latencies.append(finished - delivery.queued_at)
+
+    dispatcher = ShardedWebhookDispatcher(
+        deliver,
+        shards=args.shards,
+        key=lambda delivery: delivery.job.entity_id,
+        priority=lambda delivery: scope_priority(delivery.job.scope),
+    )
+    dispatcher.start()
+
+    webhook_events = 0
+    started = time.perf_counter()
+    for index in range(1, args.events + 1):
+        if args.rate:
+            # Pace the producer instead of submitting one burst
+            await asyncio.sleep(max(0.0, started + index / args.rate - time.perf_counter()))
+        factory = EVENT_FACTORIES[index % len(EVENT_FACTORIES)]
+        instance = factory(index, create=(index // len(EVENT_FACTORIES)) % 2 == 0)
+        for event in instance.get_triggered_events():
+            payload = await instance.get_payload_for_scope(session, event.scope, event.changes)
+            webhook_events += 1
+            for subscriber_index in range(args.subscribers):
+                job = WebhookDeliveryJob(
+                    webhook_id=subscriber_index,
+                    endpoint=f"http://standin/{subscriber_index}",
+                    authorization="load-test-secret",
+                    scope=event.scope,
+                    entity_id=event.entity_id,
+                    event_id=webhook_events,
+                    payload=payload,
+                    encoding=encoding,
+                )
+                await dispatcher.submit(Delivery(job, time.perf_counter()))
+    generated = time.perf_counter() - started
+
+    await dispatcher.stop(drain=True)
+    elapsed = time.perf_counter() - started
+    await deliverer.aclose()
+    await session.close()
+    await engine.dispose()
+
+    deliveries = len(request_latencies)
+    print(f"changes:      {args.events} in {generated:.2f}s ({args.events / generated:,.0f}/s)")
+    print(f"events:       {webhook_events} webhook events ({webhook_events / elapsed:,.0f}/s)")
+    print(
+        f"deliveries:   {deliveries} in {elapsed:.2f}s ({deliveries / elapsed:,.0f}/s), "
+        f"{failures} failed"
+    )
+    print(
+        f"request:      p50 {percentile(request_latencies, 0.5) * 1000:.2f}ms, "
+        f"p99 {percentile(request_latencies, 0.99) * 1000:.2f}ms"
+    )
+    print(
+        f"end to end:   p50 {percentile(delivery_latencies, 0.5) * 1000:.2f}ms, "
+        f"p99 {percentile(delivery_latencies, 0.99) * 1000:.2f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=2000, help="Number of model changes")
+    parser.add_argument(
+        "--rate", type=float, default=0, help="Model changes per second, 0 for a burst"
+    )
+    parser.add_argument("--subscribers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.005, help="Subscriber latency in s")
+    parser.add_argument(
+        "--jitter", type=float, default=0.002, help="Subscriber latency jitter in s"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--encoding", choices=[encoding.value for encoding in WebhookEncoding])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--metrics", action="store_true", help="Print pipeline stage timings")
+    parser.add_argument("--trace-memory", action="store_true", help="Report the tracemalloc peak")
+    parser.set_defaults(encoding=WebhookEncoding.JSON.value)
+    args = parser.parse_args()
+
+    # The overlapping Role/User/UserRoles relationships of the models warn once at mapper
+    # configuration; they are unrelated to delivery and would only clutter the report
+    warnings.filterwarnings(
+        "ignore", message=r"relationship '(Role|User)\.\w+' will copy column", category=SAWarning
+    )
+    configure_mappers()
+    register_all_scopes()
+    sink = InMemoryMetricsSink()
+    if args.metrics:
+        set_metrics(sink)
+    if args.trace_memory:
+        tracemalloc.start()
+
+    asyncio.run(run(args))
+
+    print(
+        f"memory:       {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB max RSS"
+    )
+    if args.trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        print(f"              {peak / 1024 / 1024:.1f} MiB traced peak")
+    if args.metrics:
+        for name in sorted(sink.histograms):
+            if not name.endswith("_seconds"):
+                continue
+            label = "model" if name == "webhook_relationships_seconds" else "scope"
+            for value, total in sink.top(name, label, limit=3):
+                print(f"{name}: {value} {total * 1000:.1f}ms total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Events per second of `WebhookReceiver`.
+
+Signed delivery bodies are built once with `WebhookDeliverer.build_body`, then
+fed to `WebhookReceiver.handle` and to the receiver as an ASGI application.
+
+    python benchmarks/receiver_throughput.py --events 50000 --duplicates 0.1
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Tuple
+
+from uaproject_backend_schemas.webhooks.delivery import (
+    EVENT_ID_HEADER,
+    SCOPE_HEADER,
+    SIGNATURE_HEADER,
+    WebhookDeliverer,
+    WebhookDeliveryJob,
+    sign_payload,
+)
+from uaproject_backend_schemas.webhooks.receiver import ReceivedWebhook, WebhookReceiver
+
+SECRET = "benchmark-secret"
+SCOPES = {
+    "user.minecraft_nickname": {
+        "before": {"id": 1, "discord_id": 42, "minecraft_nickname": "old"},
+        "after": {"id": 1, "discord_id": 42, "minecraft_nickname": "new"},
+    },
+    "transaction.created": {
+        "id": 1,
+        "user_id": 1,
+        "amount": "10.50",
+        "type": "deposit",
+        "description": "benchmark",
+    },
+    "role.weight": {
+        "before": {"id": 1, "name": "vip", "display_name": "VIP", "weight": 1},
+        "after": {"id": 1, "name": "vip", "display_name": "VIP", "weight": 2},
+    },
+}
+
+
+def build_requests(events: int, duplicates: float) -> List[Tuple[bytes, Dict[str, str]]]:
+    scopes = list(SCOPES)
+    repeat_every = int(1 / duplicates) if duplicates else 0
+    requests = []
+    for index in range(events):
+        event_id = index - 1 if repeat_every and index and index % repeat_every == 0 else index
+        scope = scopes[event_id % len(scopes)]
+        job = WebhookDeliveryJob(1, "http://bench", SECRET, scope, 1, event_id, SCOPES[scope])
+        body = WebhookDeliverer.build_body(job)
+        headers = {
+            "content-type": "application/json",
+            SCOPE_HEADER.lower(): scope,
+            EVENT_ID_HEADER.lower(): str(event_id),
+            SIGNATURE_HEADER.lower(): sign_payload(SECRET, body),
+        }
+        requests.append((body, headers))
+    return requests
+
+
+def build_receiver() -> Tuple[WebhookReceiver, Dict[str, int]]:
+    receiver = WebhookReceiver(SECRET)
+    counts: Dict[str, int] = {}
+
+    @receiver.on("*")
+    async def count(event: ReceivedWebhook) -> None:
+        counts[event.scope] = counts.get(event.scope, 0) + 1
+
+    return receiver, counts
+
+
+async def bench_handle(requests: List[Tuple[bytes, Dict[str, str]]]) -> float:
+    receiver, _ = build_receiver()
+    started = time.perf_counter()
+    for body, headers in requests:
+        await receiver.handle(body, headers)
+    return time.perf_counter() - started
+
+
+async def bench_asgi(requests: List[Tuple[bytes, Dict[str, str]]]) -> float:
+    receiver, _ = build_receiver()
+
+    async def send(message: dict) -> None:
+        pass
+
+    started = time.perf_counter()
+    for body, headers in requests:
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": "/",
+            "headers": [(name.encode(), value.encode()) for name, value in headers.items()],
+        }
+
+        async def receive(body: bytes = body) -> dict:
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await receiver(scope, receive, send)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--duplicates", type=float, default=0.0, help="Share of retried events")
+    args = parser.parse_args()
+
+    requests = build_requests(args.events, args.duplicates)
+    for name, bench in (("handle", bench_handle), ("asgi", bench_asgi)):
+        elapsed = asyncio.run(bench(requests))
+        print(
+            f"{name:>6}: {args.events} events in {elapsed:.3f}s, "
+            f"{args.events / elapsed:,.0f} events/s, {elapsed / args.events * 1e6:.1f} us/event"
+        )
+
+
+if __name__ == "__main__":
+    main()
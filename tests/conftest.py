@@ -0,0 +1,11 @@
+import pytest
+from sqlalchemy.orm import configure_mappers
+
+import uaproject_backend_schemas.models  # noqa: F401
+from uaproject_backend_schemas.webhooks import register_all_scopes
+
+
+@pytest.fixture(scope="session", autouse=True)
+def webhook_scopes():
+    configure_mappers()
+    return register_all_scopes()
@@ -0,0 +1,46 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from uaproject_backend_schemas.applications.models import Application
+from uaproject_backend_schemas.applications.schemas import ApplicationStatus
+from uaproject_backend_schemas.payloads import PAYLOAD_MODELS, parse_webhook_payload
+from uaproject_backend_schemas.payments.transactions.models import Transaction
+from uaproject_backend_schemas.payments.transactions.schemas import TransactionType
+from uaproject_backend_schemas.users.models import User
+from uaproject_backend_schemas.webhooks import WebhookDeliverer, WebhookDeliveryJob, WebhookEncoding
+
+
+def created_instances():
+    transaction = Transaction(
+        user_id=1, recipient_id=2, amount=Decimal("10.5"), type=TransactionType.DEPOSIT
+    )
+    transaction.service = None
+    return [
+        User(discord_id=1, minecraft_nickname="steve", is_superuser=True),
+        transaction,
+        Application(user_id=1, status=ApplicationStatus.REVIEW, launcher="vanilla"),
+    ]
+
+
+async def created_bodies(encoding):
+    bodies = []
+    for instance in created_instances():
+        for scope, changes in instance.get_triggered_scopes().items():
+            if scope not in PAYLOAD_MODELS:
+                continue
+            payload = await instance.get_payload_for_scope(None, scope, changes)
+            job = WebhookDeliveryJob(1, "http://hook", None, scope, instance.id, 1, payload)
+            bodies.append((scope, WebhookDeliverer.build_body(job._replace(encoding=encoding))))
+    return bodies
+
+
+@pytest.mark.parametrize("encoding", [WebhookEncoding.JSON, WebhookEncoding.MSGPACK])
+def test_created_payloads_parse_into_their_models(encoding):
+    bodies = asyncio.run(created_bodies(encoding))
+
+    assert {scope for scope, _ in bodies} == set(PAYLOAD_MODELS)
+    for scope, body in bodies:
+        parsed = parse_webhook_payload(body, scope, encoding)
+        assert isinstance(parsed, PAYLOAD_MODELS[scope])
@@ -0,0 +1,64 @@
+import asyncio
+
+from uaproject_backend_schemas.payments.transactions.models import Transaction
+from uaproject_backend_schemas.payments.transactions.schemas import TransactionType
+from uaproject_backend_schemas.webhooks import ActionExecutor, WebhookActionStatus
+from uaproject_backend_schemas.webhooks.mixins.config import ActionConfigModel
+
+
+def test_purchase_flow_updates_balance_before_the_purchased_item():
+    events = []
+
+    def recording_handler(name):
+        async def handler(instance, action):
+            events.append(f"{name}:start")
+            await asyncio.sleep(0.01)
+            events.append(f"{name}:end")
+
+        return handler
+
+    actions = []
+    for action in Transaction.get_webhook_scopes()["transaction.purchase_flow"].actions:
+        action = action.model_copy()
+        action._handler = recording_handler(action.name)
+        actions.append(action)
+
+    transaction = Transaction(
+        id=1, user_id=1, recipient_id=2, amount=10, type=TransactionType.PURCHASE, service_id=3
+    )
+    results = asyncio.run(ActionExecutor().run(transaction, actions))
+
+    assert [result.status for result in results] == [WebhookActionStatus.SUCCEEDED] * 2
+    assert events == [
+        "update_balance:start",
+        "update_balance:end",
+        "create_or_update_purchased_item:start",
+        "create_or_update_purchased_item:end",
+    ]
+
+
+def test_batched_actions_are_aggregated_per_key():
+    calls = []
+
+    async def handler(key, total, instances, action):
+        calls.append((key, total, len(instances)))
+
+    action = ActionConfigModel(
+        type="update_balance", batch=True, user_id="recipient_id", amount="amount"
+    )
+    action._handler = handler
+    transactions = [
+        Transaction(id=index, user_id=1, recipient_id=recipient_id, amount=amount)
+        for index, (recipient_id, amount) in enumerate([(1, 5), (2, 7), (1, 3)], start=1)
+    ]
+
+    async def run():
+        executor = ActionExecutor()
+        return await asyncio.gather(
+            *(executor.run(transaction, [action]) for transaction in transactions)
+        )
+
+    results = asyncio.run(run())
+
+    assert sorted(calls) == [(1, 8, 2), (2, 7, 1)]
+    assert {result.status for [result] in results} == {WebhookActionStatus.SUCCEEDED}
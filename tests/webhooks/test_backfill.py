@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from uaproject_backend_schemas.users.roles.models import Role
+from uaproject_backend_schemas.webhooks import WebhookBackfill
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    async def create_tables() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(
+                lambda sync_connection: Role.metadata.create_all(
+                    sync_connection, tables=[Role.__table__]
+                )
+            )
+
+    asyncio.run(create_tables())
+    yield async_sessionmaker(engine)
+    asyncio.run(engine.dispose())
+
+
+async def add_roles(session_factory, count: int) -> None:
+    async with session_factory() as session:
+        session.add_all(
+            Role(name=f"role-{index}", permissions=[], weight=index) for index in range(count)
+        )
+        await session.commit()
+
+
+def test_rows_are_replayed_page_by_page(session_factory):
+    items = []
+
+    async def deliver(item):
+        items.append(item)
+
+    async def run():
+        await add_roles(session_factory, 5)
+        backfill = WebhookBackfill(Role, ["role.created", "role.weight"], deliver, page_size=2)
+        return await backfill.run(session_factory, Role.weight >= 1)
+
+    assert asyncio.run(run()) == 8
+    assert [item.scope for item in items[:2]] == ["role.created", "role.weight"]
+    assert [item.payload["weight"] for item in items[::2]] == [1, 2, 3, 4]
+
+
+def test_an_interrupted_run_resumes_after_the_last_id(session_factory):
+    items = []
+
+    async def deliver(item):
+        items.append(item)
+
+    async def run():
+        await add_roles(session_factory, 5)
+        first = WebhookBackfill(Role, ["role.created"], deliver, page_size=2)
+        async with session_factory() as session:
+            await first.backfill_page(session, [])
+
+        resumed = WebhookBackfill(Role, ["role.created"], deliver, page_size=2)
+        return await resumed.run(session_factory, start_after=first.last_id)
+
+    assert asyncio.run(run()) == 3
+    assert [item.payload["name"] for item in items] == [f"role-{index}" for index in range(5)]
+
+
+def test_unknown_scopes_are_rejected():
+    async def deliver(item):
+        pass
+
+    with pytest.raises(ValueError, match="role.missing"):
+        WebhookBackfill(Role, ["role.missing"], deliver)
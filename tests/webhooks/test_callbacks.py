@@ -0,0 +1,42 @@
+import asyncio
+
+from uaproject_backend_schemas.webhooks import TemporalCallbackExecutor, TemporalExpirationNotice
+
+
+def test_executor_follows_a_new_event_loop():
+    executor = TemporalCallbackExecutor(concurrency=1)
+    seen = []
+
+    async def callback(notices):
+        seen.extend(notice.entity_id for notice in notices)
+
+    async def notify(entity_id: int) -> None:
+        executor.notify(callback, TemporalExpirationNotice(entity_id, "scope", {}), batch=True)
+        await executor.join()
+
+    asyncio.run(notify(1))
+    asyncio.run(notify(2))
+    asyncio.run(executor.stop())
+
+    assert seen == [1, 2]
+    assert executor.stats()["processed"] == 2
+
+
+def test_queued_batches_move_to_the_new_loop():
+    executor = TemporalCallbackExecutor(concurrency=1)
+    seen = []
+
+    def callback(notices):
+        seen.extend(notice.entity_id for notice in notices)
+
+    async def enqueue() -> None:
+        executor.notify(callback, TemporalExpirationNotice(1, "scope", {}), batch=True)
+        await asyncio.sleep(0)
+        # Closing the loop cancels the worker before it takes the batch
+        for worker in executor._workers:
+            worker.cancel()
+
+    asyncio.run(enqueue())
+    asyncio.run(executor.stop())
+
+    assert seen == [1]
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from uaproject_backend_schemas.webhooks import (
+    CircuitBreakerConfig,
+    EndpointCircuitBreaker,
+    WebhookCircuitBreakers,
+    WebhookCircuitOpenError,
+    WebhookCircuitState,
+    WebhookDeliveryError,
+    WebhookDeliveryJob,
+    WebhookStatus,
+    WebhookStatusTracker,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class RecordingTracker(WebhookStatusTracker):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.changes = []
+
+    async def set_webhook_status(self, webhook_id: int, status: WebhookStatus) -> None:
+        self.changes.append((webhook_id, status))
+
+
+def config(**overrides) -> CircuitBreakerConfig:
+    return CircuitBreakerConfig(
+        **{"min_requests": 2, "half_open_probes": 1, "open_duration": 1.0, **overrides}
+    )
+
+
+def test_opens_on_error_rate_and_closes_after_probes():
+    clock = FakeClock()
+    breaker = EndpointCircuitBreaker("http://hook", config(), clock)
+    for _ in range(2):
+        breaker.record(breaker.allow_request(), False, 0.1)
+    assert breaker.state == WebhookCircuitState.OPEN
+    assert breaker.allow_request() is None
+
+    clock.now = 1.0
+    probe = breaker.allow_request()
+    assert probe.probe and breaker.state == WebhookCircuitState.HALF_OPEN
+    assert breaker.allow_request() is None
+    assert breaker.record(probe, True, 0.1) == WebhookCircuitState.CLOSED
+
+
+def test_ignores_calls_permitted_before_the_circuit_opened():
+    clock = FakeClock()
+    breaker = EndpointCircuitBreaker("http://hook", config(), clock)
+    slow = breaker.allow_request()
+    for _ in range(2):
+        breaker.record(breaker.allow_request(), False, 0.1)
+
+    clock.now = 1.0
+    probe = breaker.allow_request()
+    assert breaker.record(slow, True, 5.0) is None
+    assert breaker.state == WebhookCircuitState.HALF_OPEN
+    assert breaker.record(probe, False, 0.1) == WebhookCircuitState.OPEN
+
+
+def test_closing_a_circuit_keeps_the_status_of_a_failing_webhook():
+    tracker = RecordingTracker(failure_threshold=1)
+    clock = FakeClock()
+    job = WebhookDeliveryJob(7, "http://hook", None, "user.discord_id", 1, 1, {})
+
+    async def deliver(job: WebhookDeliveryJob) -> None:
+        raise WebhookDeliveryError("refused", retryable=False)
+
+    breakers = WebhookCircuitBreakers(deliver, config=config(), clock=clock, status_tracker=tracker)
+
+    async def run() -> None:
+        for _ in range(2):
+            with pytest.raises(WebhookDeliveryError):
+                await breakers.deliver(job)
+            await tracker.record_failure(job.webhook_id, WebhookDeliveryError("refused"))
+        with pytest.raises(WebhookCircuitOpenError):
+            await breakers.deliver(job)
+
+        async def succeed(job: WebhookDeliveryJob) -> None:
+            pass
+
+        breakers.deliver_job = succeed
+        clock.now = 1.0
+        await breakers.deliver(job)
+
+    asyncio.run(run())
+    assert tracker.changes == [
+        (7, WebhookStatus.ERROR),
+        (7, WebhookStatus.UNRESPONSIVE),
+        (7, WebhookStatus.ERROR),
+    ]
+    assert tracker.status_of(7) == WebhookStatus.ERROR
@@ -0,0 +1,20 @@
+from datetime import UTC, datetime, timedelta
+
+from uaproject_backend_schemas.webhooks import ManualClock, SystemClock
+
+
+def test_manual_clock_moves_only_when_told():
+    clock = ManualClock(datetime(2026, 1, 1))
+
+    assert clock() == datetime(2026, 1, 1, tzinfo=UTC)
+    assert clock.advance(30) == datetime(2026, 1, 1, 0, 0, 30, tzinfo=UTC)
+    assert clock.advance(timedelta(minutes=1)) == datetime(2026, 1, 1, 0, 1, 30, tzinfo=UTC)
+
+
+def test_system_clock_never_goes_backwards():
+    clock = SystemClock()
+    future = datetime.now(UTC) + timedelta(hours=1)
+    clock._last = future
+
+    assert clock() == future
+    assert clock().tzinfo is not None
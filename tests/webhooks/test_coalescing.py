@@ -0,0 +1,51 @@
+from uaproject_backend_schemas.webhooks import WebhookCoalescer, WebhookEvent
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def change(field: str, before, after):
+    return {field: {"before": before, "after": after}}
+
+
+def test_merges_events_of_the_same_key_within_the_window():
+    clock = FakeClock()
+    coalescer = WebhookCoalescer(window=1.0, clock=clock)
+    coalescer.push(WebhookEvent("user.minecraft_nickname", 1, change("nick", "a", "b")))
+    coalescer.push(WebhookEvent("user.minecraft_nickname", 1, change("nick", "b", "c")))
+
+    assert coalescer.pop_ready() == []
+    clock.now = 1.0
+    [event] = coalescer.pop_ready()
+    assert event.changes["nick"] == {"before": "a", "after": "c"}
+    assert len(coalescer) == 0
+
+
+def test_zero_window_disables_coalescing():
+    coalescer = WebhookCoalescer(window=0, clock=FakeClock())
+    coalescer.push(WebhookEvent("user.minecraft_nickname", 1, change("nick", "a", "b")))
+    coalescer.push(WebhookEvent("user.minecraft_nickname", 1, change("nick", "b", "c")))
+
+    events = coalescer.pop_ready()
+    assert [event.changes["nick"]["after"] for event in events] == ["b", "c"]
+
+
+def test_keeps_arrival_order_of_an_entity_across_scopes():
+    coalescer = WebhookCoalescer(window=1.0, clock=FakeClock())
+    coalescer.push(WebhookEvent("user.minecraft_nickname", 1, change("nick", "a", "b")))
+    coalescer.push(WebhookEvent("user.discord_id", 1, change("discord_id", 1, 2)))
+    coalescer.push(WebhookEvent("user.minecraft_nickname", 1, change("nick", "b", "c")))
+    coalescer.push(WebhookEvent("user.minecraft_nickname", 2, change("nick", "x", "y")))
+
+    events = coalescer.flush()
+    assert [(event.scope, event.entity_id) for event in events] == [
+        ("user.minecraft_nickname", 1),
+        ("user.discord_id", 1),
+        ("user.minecraft_nickname", 1),
+        ("user.minecraft_nickname", 2),
+    ]
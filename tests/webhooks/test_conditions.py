@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+import pytest
+
+from uaproject_backend_schemas.payments.transactions.schemas import TransactionType
+from uaproject_backend_schemas.webhooks.conditions import (
+    ConditionSyntaxError,
+    compile_condition,
+    compile_field_condition,
+)
+
+NAMESPACE = {"TransactionType": TransactionType}
+
+
+@pytest.mark.parametrize(
+    ("expression", "instance", "expected"),
+    [
+        ("type == TransactionType.PURCHASE", {"type": TransactionType.PURCHASE}, True),
+        ("type == TransactionType.PURCHASE", {"type": TransactionType.DEPOSIT}, False),
+        ("amount > 0 and not frozen", {"amount": 5, "frozen": False}, True),
+        ("amount > 0 and not frozen", {"amount": 5, "frozen": True}, False),
+        ("0 < amount <= 10", {"amount": 10}, True),
+        ("0 < amount <= 10", {"amount": 11}, False),
+        ("status in ('active', 'paused')", {"status": "paused"}, True),
+        ("service_id is not None or amount", {"service_id": None, "amount": 0}, False),
+    ],
+)
+def test_conditions_evaluate_against_instances(expression, instance, expected):
+    condition = compile_condition(expression, namespace=NAMESPACE)
+
+    assert condition(SimpleNamespace(**instance)) is expected
+
+
+def test_referenced_fields_are_collected():
+    condition = compile_condition(
+        "amount > 0 and type == TransactionType.PURCHASE", None, NAMESPACE
+    )
+
+    assert condition.fields == {"amount", "type"}
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "amount >",
+        "__import__('os').system('true')",
+        "amount.real > 0",
+        "Unknown.MEMBER == type",
+        "TransactionType._member_map_",
+        "amount + 1 > 0",
+        "balance > 0",
+    ],
+)
+def test_unsupported_expressions_are_rejected(expression):
+    with pytest.raises(ConditionSyntaxError):
+        compile_condition(expression, ["amount", "type"], NAMESPACE)
+
+
+def test_type_errors_count_as_unmet():
+    condition = compile_condition("amount > 0")
+
+    assert condition(SimpleNamespace(amount=None)) is False
+
+
+def test_field_conditions():
+    condition = compile_field_condition("type", TransactionType.PURCHASE, "==")
+
+    assert condition(SimpleNamespace(type=TransactionType.PURCHASE))
+    assert not condition(SimpleNamespace(type=TransactionType.REFUND))
+    with pytest.raises(ConditionSyntaxError):
+        compile_field_condition("type", 1, "~=")
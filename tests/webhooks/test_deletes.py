@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from uaproject_backend_schemas.users.roles.models import UserRoles
+from uaproject_backend_schemas.webhooks import capture_deleted_events, pop_deleted_events
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    async def create_tables() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(
+                lambda sync_connection: UserRoles.metadata.create_all(
+                    sync_connection, tables=[UserRoles.__table__]
+                )
+            )
+
+    asyncio.run(create_tables())
+    yield async_sessionmaker(engine)
+    asyncio.run(engine.dispose())
+
+
+async def add_expired_user_role(session):
+    user_role = UserRoles(user_id=1, role_id=2)
+    entity_id = user_role.id
+    session.add(user_role)
+    await session.commit()
+    return user_role, entity_id
+
+
+def test_deleted_events_of_expired_instances_load_their_fields(session_factory):
+    async def run():
+        async with session_factory() as session:
+            event.listen(session.sync_session, "before_flush", capture_deleted_events)
+            user_role, entity_id = await add_expired_user_role(session)
+
+            await session.delete(user_role)
+            await session.flush()
+            return entity_id, pop_deleted_events(session.sync_session)
+
+    entity_id, events = asyncio.run(run())
+
+    assert [(item.scope, item.entity_id) for item in events] == [("user_role.deleted", entity_id)]
+    changes = events[0].changes
+    assert changes["user_id"] == {"before": 1, "after": None}
+    assert changes["role_id"] == {"before": 2, "after": None}
+
+
+def test_expired_fields_that_cannot_be_loaded_are_left_out(session_factory):
+    async def run():
+        async with session_factory() as session:
+            user_role, entity_id = await add_expired_user_role(session)
+            # Outside a flush there is no greenlet to load the expired fields
+            return entity_id, user_role.get_deleted_events()
+
+    entity_id, events = asyncio.run(run())
+
+    assert [item.entity_id for item in events] == [entity_id]
+    assert "user_id" not in events[0].changes
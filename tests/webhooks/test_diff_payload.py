@@ -0,0 +1,25 @@
+import asyncio
+
+from uaproject_backend_schemas.base import DiffPayloadBaseModel
+from uaproject_backend_schemas.users.models import User
+
+
+def test_diff_payload_rebuilds_both_states():
+    user = User(id=1, discord_id=7, minecraft_nickname="alex", is_superuser=False)
+    changes = {
+        "minecraft_nickname": {"before": "steve", "after": "alex"},
+        "_untracked": {"is_superuser": {"before": True, "after": False}},
+    }
+
+    payload = asyncio.run(
+        user._build_diff_payload(
+            None, changes, ("id", "discord_id", "minecraft_nickname", "is_superuser"), {}
+        )
+    )
+
+    assert payload["unchanged"] == {"id": 1, "discord_id": 7}
+    assert set(payload["changes"]) == {"minecraft_nickname", "is_superuser"}
+    assert DiffPayloadBaseModel.model_validate({"payload": payload}).payload.to_both() == {
+        "before": {"id": 1, "discord_id": 7, "minecraft_nickname": "steve", "is_superuser": True},
+        "after": {"id": 1, "discord_id": 7, "minecraft_nickname": "alex", "is_superuser": False},
+    }
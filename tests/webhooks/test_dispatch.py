@@ -0,0 +1,74 @@
+import asyncio
+
+from uaproject_backend_schemas.webhooks import (
+    ShardedWebhookDispatcher,
+    WebhookPriority,
+    WeightedFairQueue,
+)
+
+
+def test_dispatcher_keeps_the_order_of_every_key():
+    handled = {}
+
+    async def handler(item):
+        key, sequence = item
+        await asyncio.sleep(0.001 * (key % 3))
+        handled.setdefault(key, []).append(sequence)
+
+    async def run():
+        dispatcher = ShardedWebhookDispatcher(
+            handler,
+            shards=4,
+            key=lambda item: item[0],
+            priority=lambda item: WebhookPriority.NORMAL,
+        )
+        dispatcher.start()
+        for sequence in range(20):
+            for key in range(10):
+                await dispatcher.submit((key, sequence))
+        await dispatcher.stop()
+
+    asyncio.run(run())
+
+    assert handled == {key: list(range(20)) for key in range(10)}
+
+
+def test_weighted_fair_queue_serves_priorities_by_weight():
+    async def run():
+        queue = WeightedFairQueue({WebhookPriority.HIGH: 8, WebhookPriority.LOW: 1})
+        for index in range(20):
+            await queue.put(("low", index), WebhookPriority.LOW, key=f"low-{index}")
+            await queue.put(("high", index), WebhookPriority.HIGH, key=f"high-{index}")
+        return [(await queue.get())[0] for _ in range(18)]
+
+    served = asyncio.run(run())
+
+    assert served.count("high") == 16
+    assert served.count("low") == 2
+
+
+def test_weighted_fair_queue_keeps_key_order_across_priorities():
+    async def run():
+        queue = WeightedFairQueue()
+        await queue.put("other", WebhookPriority.NORMAL, key="other")
+        await queue.put("first", WebhookPriority.LOW, key="entity")
+        await queue.put("second", WebhookPriority.HIGH, key="entity")
+        return [await queue.get() for _ in range(3)]
+
+    served = asyncio.run(run())
+
+    # The HIGH item lifts the earlier LOW item of its key ahead of the NORMAL key
+    assert served[0] == "first"
+    assert served.index("first") < served.index("second")
+
+
+def test_full_low_priority_does_not_block_high_priority_puts():
+    async def run():
+        queue = WeightedFairQueue(maxsize=1)
+        await queue.put("low", WebhookPriority.LOW)
+        await asyncio.wait_for(queue.put("high", WebhookPriority.HIGH), timeout=1)
+        return queue.depths()
+
+    depths = asyncio.run(run())
+
+    assert depths[WebhookPriority.LOW] == depths[WebhookPriority.HIGH] == 1
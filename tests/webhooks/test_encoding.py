@@ -0,0 +1,40 @@
+import uuid
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import pytest
+
+from uaproject_backend_schemas.webhooks import WebhookEncoding
+from uaproject_backend_schemas.webhooks.encoding import (
+    decode_payload,
+    encode_entry,
+    encode_map,
+    encode_payload,
+)
+
+pytest.importorskip("msgpack")
+
+BODY = {
+    "id": 2**62,
+    "amount": Decimal("10.50"),
+    "token": uuid.UUID(int=1),
+    "at": datetime(2026, 1, 1, 12, 30, tzinfo=UTC),
+    "tags": ["a", "b"],
+}
+
+
+def test_msgpack_round_trips_native_types():
+    decoded = decode_payload(encode_payload(BODY, WebhookEncoding.MSGPACK), WebhookEncoding.MSGPACK)
+
+    assert decoded == BODY
+    assert isinstance(decoded["amount"], Decimal)
+
+
+@pytest.mark.parametrize("encoding", list(WebhookEncoding))
+def test_prebuilt_maps_match_encoded_payloads(encoding):
+    body = {"scope": "user.discord_id", "payload": {"id": 1}}
+    entries = [
+        encode_entry(key, encode_payload(value, encoding), encoding) for key, value in body.items()
+    ]
+
+    assert encode_map(entries, encoding) == encode_payload(body, encoding)
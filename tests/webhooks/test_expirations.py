@@ -0,0 +1,109 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from uaproject_backend_schemas.punishments.models import Punishment
+from uaproject_backend_schemas.punishments.schemas import PunishmentStatus, PunishmentType
+from uaproject_backend_schemas.webhooks import TemporalExpirationScheduler
+
+pytest.importorskip("aiosqlite")
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = START
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    async def create_tables() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(
+                lambda sync_connection: Punishment.metadata.create_all(
+                    sync_connection, tables=[Punishment.__table__]
+                )
+            )
+
+    asyncio.run(create_tables())
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+async def add_punishment(session_factory, expires_in: timedelta) -> int:
+    async with session_factory() as session:
+        punishment = Punishment(
+            user_id=1,
+            type=PunishmentType.MUTE,
+            status=PunishmentStatus.ACTIVE,
+            expires_at=START + expires_in,
+        )
+        session.add(punishment)
+        await session.commit()
+        return punishment.id
+
+
+def test_refill_loads_rows_written_inside_the_loaded_horizon(session_factory):
+    async def run():
+        clock = FakeClock()
+        scheduler = TemporalExpirationScheduler([Punishment], clock=clock)
+        first = await add_punishment(session_factory, timedelta(minutes=30))
+        async with session_factory() as session:
+            assert await scheduler.refill(session) == 1
+
+        # Written by another process, so track_instance never saw it
+        second = await add_punishment(session_factory, timedelta(minutes=10))
+        async with session_factory() as session:
+            assert await scheduler.refill(session) == 1
+            assert await scheduler.refill(session) == 0
+
+        assert len(scheduler) == 2
+        clock.now = START + timedelta(minutes=45)
+        assert [expiration.entity_id for expiration in scheduler.pop_due()] == [second, first]
+
+    asyncio.run(run())
+
+
+def test_extended_rows_are_rescheduled(session_factory):
+    async def run():
+        clock = FakeClock()
+        scheduler = TemporalExpirationScheduler([Punishment], clock=clock)
+        punishment_id = await add_punishment(session_factory, timedelta(minutes=10))
+        async with session_factory() as session:
+            await scheduler.refill(session)
+
+        async with session_factory() as session:
+            await session.execute(
+                update(Punishment)
+                .where(Punishment.id == punishment_id)
+                .values(expires_at=START + timedelta(minutes=40))
+            )
+            await session.commit()
+
+        clock.now = START + timedelta(minutes=15)
+        async with session_factory() as session:
+            assert await scheduler.expire(session, scheduler.pop_due()) == []
+
+        assert len(scheduler) == 1
+        clock.now = START + timedelta(minutes=45)
+        async with session_factory() as session:
+            events = await scheduler.expire(session, scheduler.pop_due())
+            await session.commit()
+
+        assert [(event.scope, event.entity_id) for event in events] == [
+            ("punishment.status_changed", punishment_id)
+        ]
+        async with session_factory() as session:
+            punishment = await session.get(Punishment, punishment_id)
+            assert punishment.status == PunishmentStatus.EXPIRED
+
+    asyncio.run(run())
@@ -0,0 +1,40 @@
+from uaproject_backend_schemas.webhooks import InMemoryMetricsSink, PrometheusMetricsSink
+
+
+def test_series_are_kept_per_label_set():
+    sink = InMemoryMetricsSink(buckets=(0.1, 1.0))
+    sink.increment("webhook_deliveries_total", scope="user.created")
+    sink.increment("webhook_deliveries_total", 2, scope="user.updated")
+    sink.increment("webhook_deliveries_total", scope="user.updated")
+    sink.observe("webhook_delivery_seconds", 0.5, scope="user.created")
+    sink.observe("webhook_delivery_seconds", 1.5, scope="user.created")
+
+    assert sink.counter("webhook_deliveries_total", scope="user.updated") == 3
+    assert sink.counter("webhook_deliveries_total", scope="missing") == 0
+    assert sink.summary("webhook_delivery_seconds", scope="user.created") == {
+        "count": 2,
+        "sum": 2.0,
+        "mean": 1.0,
+    }
+    assert sink.top("webhook_deliveries_total", "scope") == [
+        ("user.updated", 3),
+        ("user.created", 1),
+    ]
+
+
+def test_prometheus_histograms_are_cumulative():
+    sink = PrometheusMetricsSink(prefix="app_", buckets=(0.1, 1.0))
+    sink.increment("deliveries_total", scope='say "hi"')
+    sink.observe("delivery_seconds", 0.05)
+    sink.observe("delivery_seconds", 0.5)
+
+    assert sink.render().splitlines() == [
+        "# TYPE app_deliveries_total counter",
+        'app_deliveries_total{scope="say \\"hi\\""} 1',
+        "# TYPE app_delivery_seconds histogram",
+        'app_delivery_seconds_bucket{le="0.1"} 1',
+        'app_delivery_seconds_bucket{le="1"} 2',
+        'app_delivery_seconds_bucket{le="+Inf"} 2',
+        "app_delivery_seconds_sum 0.55",
+        "app_delivery_seconds_count 2",
+    ]
@@ -0,0 +1,171 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from uaproject_backend_schemas.base import utcnow
+from uaproject_backend_schemas.webhooks import (
+    RetryPolicy,
+    Webhook,
+    WebhookDeadLetter,
+    WebhookDeliveryError,
+    WebhookOutbox,
+    WebhookOutboxDrainer,
+    WebhookOutboxStatus,
+    WebhookPriority,
+)
+
+pytest.importorskip("aiosqlite")
+
+TABLES = [Webhook.__table__, WebhookOutbox.__table__, WebhookDeadLetter.__table__]
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    async def create_tables() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(
+                lambda sync_connection: Webhook.metadata.create_all(sync_connection, tables=TABLES)
+            )
+
+    asyncio.run(create_tables())
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+async def add_rows(session_factory, *rows: WebhookOutbox) -> None:
+    async with session_factory() as session:
+        session.add_all(rows)
+        await session.commit()
+
+
+async def outbox_rows(session_factory):
+    async with session_factory() as session:
+        result = await session.execute(select(WebhookOutbox).order_by(WebhookOutbox.id))
+        return list(result.scalars())
+
+
+def test_failed_rows_back_off_and_are_dead_lettered(session_factory):
+    async def run():
+        async with session_factory() as session:
+            webhook = Webhook(endpoint="http://hook")
+            session.add(webhook)
+            await session.commit()
+        await add_rows(
+            session_factory, WebhookOutbox(scope="user.discord_id", entity_id=1, payload={})
+        )
+
+        async def deliver(record):
+            raise WebhookDeliveryError("refused", webhook_id=webhook.id)
+
+        policy = RetryPolicy(base_delay=0, jitter=False, max_attempts=2)
+        drainer = WebhookOutboxDrainer(session_factory, deliver, policy=policy)
+        assert await drainer.drain_once() == 1
+        [row] = await outbox_rows(session_factory)
+        assert (row.status, row.attempts) == (WebhookOutboxStatus.PENDING, 1)
+
+        assert await drainer.drain_once() == 1
+        assert await drainer.drain_once() == 0
+        [row] = await outbox_rows(session_factory)
+        assert (row.status, row.attempts) == (WebhookOutboxStatus.FAILED, 2)
+
+        async with session_factory() as session:
+            [letter] = (await session.execute(select(WebhookDeadLetter))).scalars()
+        assert (letter.webhook_id, letter.event_id) == (webhook.id, row.id)
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("blocked", ["backoff", "leased"])
+def test_newer_rows_wait_for_a_blocked_earlier_row_of_their_entity(session_factory, blocked):
+    async def run():
+        now = utcnow()
+        earlier = WebhookOutbox(scope="user.discord_id", entity_id=1, payload={})
+        if blocked == "backoff":
+            earlier.available_at = now + timedelta(minutes=5)
+        else:
+            earlier.status = WebhookOutboxStatus.PROCESSING
+            earlier.locked_until = now + timedelta(minutes=5)
+        await add_rows(session_factory, earlier)
+        await add_rows(
+            session_factory,
+            WebhookOutbox(scope="user.discord_id", entity_id=1, payload={}),
+            WebhookOutbox(scope="user.discord_id", entity_id=2, payload={}),
+        )
+
+        delivered = []
+
+        async def deliver(record):
+            delivered.append(record.entity_id)
+
+        assert await WebhookOutboxDrainer(session_factory, deliver).drain_once() == 1
+        assert delivered == [2]
+
+    asyncio.run(run())
+
+
+def test_dead_rows_do_not_block_their_entity(session_factory):
+    async def run():
+        await add_rows(
+            session_factory,
+            WebhookOutbox(
+                scope="user.discord_id",
+                entity_id=1,
+                payload={},
+                status=WebhookOutboxStatus.FAILED,
+            ),
+        )
+        await add_rows(
+            session_factory, WebhookOutbox(scope="user.discord_id", entity_id=1, payload={})
+        )
+
+        delivered = []
+
+        async def deliver(record):
+            delivered.append(record.entity_id)
+
+        assert await WebhookOutboxDrainer(session_factory, deliver).drain_once() == 1
+        assert delivered == [1]
+
+    asyncio.run(run())
+
+
+def test_low_priority_rows_get_a_share_of_every_page(session_factory):
+    async def run():
+        await add_rows(
+            session_factory,
+            *(
+                WebhookOutbox(
+                    scope="service.content",
+                    entity_id=entity_id,
+                    payload={},
+                    priority=WebhookPriority.LOW.rank,
+                )
+                for entity_id in range(1, 5)
+            ),
+        )
+        await add_rows(
+            session_factory,
+            *(
+                WebhookOutbox(
+                    scope="punishment.created",
+                    entity_id=entity_id,
+                    payload={},
+                    priority=WebhookPriority.HIGH.rank,
+                )
+                for entity_id in range(5, 25)
+            ),
+        )
+
+        drainer = WebhookOutboxDrainer(session_factory, None, batch_size=4)
+        async with session_factory() as session:
+            records = await drainer.claim_batch(session)
+
+        assert [record.scope for record in records].count("service.content") == 1
+        assert len(records) == 4
+
+    asyncio.run(run())
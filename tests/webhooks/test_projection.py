@@ -0,0 +1,40 @@
+import pytest
+
+from uaproject_backend_schemas.webhooks import (
+    WebhookDeliverer,
+    WebhookDeliveryJob,
+    WebhookEncoding,
+)
+from uaproject_backend_schemas.webhooks.projection import PayloadSlicer, union_fields
+
+PAYLOAD = {
+    "before": {"id": 1, "discord_id": None, "minecraft_nickname": "steve"},
+    "after": {"id": 1, "discord_id": 7, "minecraft_nickname": "steve"},
+}
+
+
+def deliverer_body(payload, encoding):
+    job = WebhookDeliveryJob(1, "http://hook", None, "user.discord_id", 1, 5, payload)
+    return WebhookDeliverer.build_body(job._replace(encoding=encoding))
+
+
+@pytest.mark.parametrize("encoding", list(WebhookEncoding))
+def test_sliced_bodies_match_the_deliverer(encoding):
+    if encoding == WebhookEncoding.MSGPACK:
+        pytest.importorskip("msgpack")
+    slicer = PayloadSlicer(5, "user.discord_id", PAYLOAD, ("before", "after"))
+    projected = {
+        section: {key: value for key, value in values.items() if key in {"id", "discord_id"}}
+        for section, values in PAYLOAD.items()
+    }
+
+    assert slicer.body(None, encoding) == deliverer_body(PAYLOAD, encoding)
+    assert slicer.body(["id", "discord_id"], encoding) == deliverer_body(projected, encoding)
+    assert slicer.body(["discord_id", "id"], encoding) is slicer.body(
+        ["id", "discord_id"], encoding
+    )
+
+
+def test_union_of_projections():
+    assert union_fields([["id"], ["discord_id", "id"]]) == {"id", "discord_id"}
+    assert union_fields([["id"], None]) is None
@@ -0,0 +1,100 @@
+import asyncio
+
+from uaproject_backend_schemas.webhooks import WebhookDeliverer, WebhookDeliveryJob
+from uaproject_backend_schemas.webhooks.receiver import WebhookReceiver
+
+SECRET = "secret"
+
+
+def delivery(event_id: int = 1, authorization: str = SECRET):
+    job = WebhookDeliveryJob(
+        1,
+        "http://hook",
+        authorization,
+        "user.superuser",
+        2,
+        event_id,
+        {"before": {"id": 2, "is_superuser": False}, "after": {"id": 2, "is_superuser": True}},
+    )
+    body = WebhookDeliverer.build_body(job)
+    headers = WebhookDeliverer.build_headers(job, body)
+    return body, [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+
+
+async def post(receiver: WebhookReceiver, body: bytes, headers):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "headers": headers}
+    await receiver(scope, receive, send)
+    return sent[0]["status"], dict(sent[0]["headers"])
+
+
+def test_signatures_are_checked():
+    receiver = WebhookReceiver(SECRET)
+    received = []
+
+    @receiver.on("user.*")
+    async def handler(event):
+        received.append(event)
+
+    async def run():
+        return [
+            (await post(receiver, *delivery(1)))[0],
+            (await post(receiver, *delivery(2, authorization="other")))[0],
+        ]
+
+    statuses = asyncio.run(run())
+
+    assert statuses == [204, 401]
+    assert [event.event_id for event in received] == [1]
+    assert received[0].payload.payload["after"].is_superuser is True
+
+
+def test_duplicates_are_acknowledged_only_after_processing():
+    receiver = WebhookReceiver(SECRET)
+    started = asyncio.Event()
+    release = asyncio.Event()
+    calls = []
+
+    @receiver.on("user.superuser")
+    async def handler(event):
+        calls.append(event.event_id)
+        started.set()
+        await release.wait()
+
+    async def run():
+        first = asyncio.create_task(post(receiver, *delivery()))
+        await started.wait()
+        in_flight = await post(receiver, *delivery())
+        release.set()
+        return in_flight, await first, await post(receiver, *delivery())
+
+    in_flight, first, processed = asyncio.run(run())
+
+    assert in_flight == (503, {b"retry-after": b"5"})
+    assert first[0] == 204
+    assert processed[0] == 204
+    assert calls == [1]
+
+
+def test_failed_events_are_accepted_again():
+    receiver = WebhookReceiver(SECRET)
+    calls = []
+
+    @receiver.on("user.superuser")
+    async def handler(event):
+        calls.append(event.event_id)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+
+    async def run():
+        return [(await post(receiver, *delivery()))[0] for _ in range(3)]
+
+    assert asyncio.run(run()) == [500, 204, 204]
+    assert calls == [1, 1]
@@ -0,0 +1,67 @@
+import logging
+
+import pytest
+from pydantic.fields import FieldInfo
+from pydantic_core import from_json, to_json
+
+from uaproject_backend_schemas.payments.services.schemas import ServiceResponse
+from uaproject_backend_schemas.payments.transactions.models import Transaction
+from uaproject_backend_schemas.payments.transactions.schemas import TransactionType
+from uaproject_backend_schemas.webhooks.registry import (
+    _dump_scopes,
+    _load_scopes,
+    register_all_scopes,
+    scope_schema_hash,
+)
+
+
+def test_schema_hash_covers_referenced_pydantic_models(monkeypatch):
+    before = scope_schema_hash([Transaction])
+    monkeypatch.setitem(ServiceResponse.__pydantic_fields__, "slug", FieldInfo.from_annotation(str))
+
+    assert scope_schema_hash([Transaction]) != before
+
+
+def test_cached_scopes_keep_enum_condition_values():
+    scopes = Transaction.get_webhook_scopes()
+    original = dict(scopes)
+    try:
+        _load_scopes(Transaction, from_json(to_json(_dump_scopes(Transaction))))
+        service = scopes["transaction.purchase_flow"].relationships["service"]
+
+        assert service.condition_value is TransactionType.PURCHASE
+        assert service.is_met(Transaction(type=TransactionType.PURCHASE))
+        assert not service.is_met(Transaction(type=TransactionType.DEPOSIT))
+    finally:
+        scopes.clear()
+        scopes.update(original)
+        Transaction._webhook_scope_index = None
+
+
+@pytest.fixture
+def fresh_transaction_scopes():
+    original = Transaction.get_webhook_scopes()
+    Transaction._webhook_scopes_registry = {}
+    yield
+    Transaction._webhook_scopes_registry = original
+    Transaction._webhook_scope_index = None
+
+
+def test_scopes_are_restored_from_the_cache(tmp_path, caplog, fresh_transaction_scopes):
+    cache_path = tmp_path / "scopes.json"
+    register_all_scopes([Transaction], cache_path=cache_path)
+    registered = _dump_scopes(Transaction)
+    handlers = [
+        action._handler
+        for action in Transaction.get_webhook_scopes()["transaction.purchase_flow"].actions
+    ]
+    assert cache_path.exists()
+
+    Transaction._webhook_scopes_registry = {}
+    with caplog.at_level(logging.DEBUG, logger="uaproject_backend_schemas.webhooks.registry"):
+        register_all_scopes([Transaction], cache_path=cache_path)
+
+    assert "Restored webhook scopes of 1 model(s)" in caplog.text
+    assert _dump_scopes(Transaction) == registered
+    actions = Transaction.get_webhook_scopes()["transaction.purchase_flow"].actions
+    assert [action._handler for action in actions] == handlers
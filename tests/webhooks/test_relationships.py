@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from uaproject_backend_schemas.users.roles.models import Role, UserRoles
+
+pytest.importorskip("aiosqlite")
+
+TABLES = [Role.__table__, UserRoles.__table__]
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    async def create_tables() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(
+                lambda sync_connection: Role.metadata.create_all(sync_connection, tables=TABLES)
+            )
+
+    asyncio.run(create_tables())
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+@pytest.mark.parametrize("flush", [False, True])
+def test_loaded_relationship_is_refreshed_after_its_key_changed(session_factory, flush):
+    relationships = UserRoles.get_webhook_scopes()["user_role.created"].relationships
+
+    async def run():
+        async with session_factory() as session:
+            old_role = Role(name="old", permissions=[])
+            new_role = Role(name="new", permissions=[])
+            user_role = UserRoles(user_id=1, role_id=old_role.id)
+            session.add_all([old_role, new_role, user_role])
+            await session.commit()
+            await session.refresh(user_role, attribute_names=["role"])
+            assert user_role.role is old_role
+
+            user_role.role_id = new_role.id
+            if flush:
+                await session.flush()
+
+            payload = {}
+            await user_role._add_relationship_data(
+                session, payload, {"role": relationships["role"]}
+            )
+            return payload
+
+    assert asyncio.run(run())["role"]["name"] == "new"
+
+
+def test_relationships_of_new_rows_are_used_as_set():
+    relationships = UserRoles.get_webhook_scopes()["user_role.created"].relationships
+    role = Role(name="new", permissions=[])
+    user_role = UserRoles(user_id=1, role_id=role.id, role=role)
+
+    payload = {}
+    asyncio.run(user_role._add_relationship_data(None, payload, {"role": relationships["role"]}))
+
+    assert payload["role"]["name"] == "new"
@@ -0,0 +1,24 @@
+import random
+
+from uaproject_backend_schemas.webhooks import RetryPolicy, WebhookDeliveryError
+
+
+def test_backoff_grows_exponentially_up_to_the_cap():
+    policy = RetryPolicy(base_delay=1, multiplier=2, max_delay=10, jitter=False)
+
+    assert [policy.delay_for(attempt) for attempt in range(1, 6)] == [1, 2, 4, 8, 10]
+
+
+def test_jitter_stays_within_the_backoff():
+    policy = RetryPolicy(base_delay=1, multiplier=2, max_delay=10)
+    rng = random.Random(0)
+
+    assert all(0 <= policy.delay_for(3, rng) <= 4 for _ in range(100))
+
+
+def test_only_retryable_errors_are_retried_until_the_last_attempt():
+    policy = RetryPolicy(max_attempts=3)
+
+    assert policy.should_retry(2, WebhookDeliveryError("503"))
+    assert not policy.should_retry(3, WebhookDeliveryError("503"))
+    assert not policy.should_retry(1, WebhookDeliveryError("400", retryable=False))
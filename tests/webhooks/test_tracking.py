@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from uaproject_backend_schemas.users.roles.models import Role
+from uaproject_backend_schemas.webhooks import flag_json_mutations
+from uaproject_backend_schemas.webhooks.mixins.tracking import json_field_change, track_json_fields
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture
+def session_factory():
+    track_json_fields(Role)
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    async def create_tables() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(
+                lambda sync_connection: Role.metadata.create_all(
+                    sync_connection, tables=[Role.__table__]
+                )
+            )
+
+    asyncio.run(create_tables())
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+async def add_role(session_factory) -> int:
+    async with session_factory() as session:
+        role = Role(name="admin", permissions=["read"])
+        session.add(role)
+        await session.commit()
+        return role.id
+
+
+def test_in_place_mutations_keep_the_value_they_replaced(session_factory):
+    async def run():
+        role_id = await add_role(session_factory)
+        async with session_factory() as session:
+            role = await session.get(Role, role_id)
+            assert json_field_change(role, "permissions") is None
+
+            role.permissions.append("write")
+            return json_field_change(role, "permissions")
+
+    assert asyncio.run(run()) == {"before": ["read"], "after": ["read", "write"]}
+
+
+def test_untracked_mutations_are_flagged_before_commit(session_factory):
+    async def run():
+        role_id = await add_role(session_factory)
+        async with session_factory() as session:
+            role = await session.get(Role, role_id)
+            # Bypasses MutableList, like a mutation of a nested container would
+            list.append(role.permissions, "write")
+            flag_json_mutations(session.sync_session)
+            await session.commit()
+
+        async with session_factory() as session:
+            return (await session.get(Role, role_id)).permissions
+
+    assert asyncio.run(run()) == ["read", "write"]
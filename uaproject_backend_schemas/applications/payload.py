@@ -23,14 +23,15 @@ __all__ = [
 
 
 class ApplicationStatusPayload(UsersIDMixin):
-    """Payload for application status"""
+    """Payload for application status, `status` is None before an application is created"""
 
-    status: ApplicationStatus
+    status: Optional[ApplicationStatus] = None
 
 
 class ApplicationFormPayload(ApplicationStatusPayload):
     """Detailed form payload"""
 
+    status: ApplicationStatus
     birth_date: Optional[datetime] = None
     launcher: Optional[str] = None
     server_source: Optional[str] = None
@@ -69,4 +69,28 @@ class BothPayloadBaseModel(BaseModel):
     payload: dict[Literal["before", "after"], dict[str, Any]]
 
 
-PayloadModels = PayloadBaseModel | BothPayloadBaseModel
+class FieldDiff(BaseModel):
+    before: Any = None
+    after: Any = None
+
+
+class DiffPayload(BaseModel):
+    unchanged: dict[str, Any] = {}
+    changes: dict[str, FieldDiff] = {}
+
+    def state(self, stage: PayloadBoth) -> dict[str, Any]:
+        """Rebuild the complete before or after state"""
+        return {
+            **self.unchanged,
+            **{field: getattr(diff, stage) for field, diff in self.changes.items()},
+        }
+
+    def to_both(self) -> dict[PayloadBoth, dict[str, Any]]:
+        return {"before": self.state("before"), "after": self.state("after")}
+
+
+class DiffPayloadBaseModel(BaseModel):
+    payload: DiffPayload
+
+
+PayloadModels = PayloadBaseModel | BothPayloadBaseModel | DiffPayloadBaseModel
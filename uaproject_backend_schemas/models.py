@@ -16,6 +16,8 @@ __all__ = [
     "User",  # noqa: F405
     "UserRoles",  # noqa: F405
     "Webhook",  # noqa: F405
+    "WebhookOutbox",  # noqa: F405
+    "WebhookDeadLetter",  # noqa: F405
     "PurchasedItem",  # noqa: F405
     "Service",  # noqa: F405
     "Transaction",  # noqa: F405
@@ -0,0 +1,85 @@
+from typing import Any, Dict, Optional, Type, Union
+
+from pydantic import BaseModel, TypeAdapter
+
+from uaproject_backend_schemas.applications.payload import (
+    ApplicationFormPayloadFull,
+    ApplicationStatusPayloadFull,
+)
+from uaproject_backend_schemas.base import PayloadBaseModel
+from uaproject_backend_schemas.payments.transactions.payload import (
+    TransactionAmountPayloadFull,
+    TransactionCreatedPayloadFull,
+    TransactionTypePayloadFull,
+)
+from uaproject_backend_schemas.users.payload import (
+    DiscordIdPayloadFull,
+    MinecraftNicknamePayloadFull,
+    UserUpdatedPayloadFull,
+)
+from uaproject_backend_schemas.webhooks.encoding import decode_payload
+from uaproject_backend_schemas.webhooks.schemas import WebhookEncoding
+
+__all__ = [
+    "PAYLOAD_MODELS",
+    "register_payload_model",
+    "get_payload_model",
+    "get_payload_adapter",
+    "parse_webhook_payload",
+]
+
+PAYLOAD_MODELS: Dict[str, Type[BaseModel]] = {
+    "user.minecraft_nickname": MinecraftNicknamePayloadFull,
+    "user.discord_id": DiscordIdPayloadFull,
+    "user.superuser": UserUpdatedPayloadFull,
+    "transaction.created": TransactionCreatedPayloadFull,
+    "transaction.type": TransactionTypePayloadFull,
+    "transaction.amount": TransactionAmountPayloadFull,
+    "application.status": ApplicationStatusPayloadFull,
+    "application.form": ApplicationFormPayloadFull,
+}
+
+_adapters: Dict[str, TypeAdapter] = {
+    scope: TypeAdapter(model) for scope, model in PAYLOAD_MODELS.items()
+}
+_default_adapter: TypeAdapter = TypeAdapter(PayloadBaseModel)
+
+
+def register_payload_model(scope: str, model: Type[BaseModel]) -> None:
+    """Map a scope key such as `user.discord_id` to the model its delivery bodies validate into"""
+    PAYLOAD_MODELS[scope] = model
+    _adapters[scope] = TypeAdapter(model)
+
+
+def get_payload_model(scope: str) -> Type[BaseModel]:
+    """Payload model of a scope, `PayloadBaseModel` for scopes without a typed model"""
+    return PAYLOAD_MODELS.get(scope, PayloadBaseModel)
+
+
+def get_payload_adapter(scope: str) -> TypeAdapter:
+    """Prebuilt `TypeAdapter` of a scope's payload model"""
+    return _adapters.get(scope, _default_adapter)
+
+
+def parse_webhook_payload(
+    data: Union[bytes, str],
+    scope: Optional[str] = None,
+    encoding: WebhookEncoding = WebhookEncoding.JSON,
+) -> Any:
+    """
+    Validate a delivery body straight into the payload model of its scope.
+
+    JSON bodies are validated with a single native `validate_json` call when the
+    scope is known, e.g. from the `X-Webhook-Scope` header. Without it, the body
+    is parsed once and its `scope` field selects the model.
+
+    Args:
+        data: Raw request body
+        scope: Scope key of the delivery, read from the body if omitted
+        encoding: Encoding of the body, see `Webhook.encoding`
+    """
+    if scope is not None and encoding == WebhookEncoding.JSON:
+        return get_payload_adapter(scope).validate_json(data)
+
+    body: Dict[str, Any] = decode_payload(data, encoding)
+    return get_payload_adapter(scope or body.get("scope", "")).validate_python(body)
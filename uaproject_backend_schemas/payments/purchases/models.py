@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from sqlalchemy import JSON
+from sqlalchemy.ext.mutable import MutableDict
 from sqlmodel import BigInteger, Column, DateTime, Enum, Field, ForeignKey, Relationship
 
 from uaproject_backend_schemas.base import Base, IDMixin, TimestampsMixin
@@ -9,7 +10,7 @@ from uaproject_backend_schemas.payments.purchases.schemas import PurchasedItemSt
 from uaproject_backend_schemas.payments.services.models import Service
 from uaproject_backend_schemas.payments.transactions.models import Transaction
 from uaproject_backend_schemas.webhooks.mixins import WebhookChangesMixin
-from uaproject_backend_schemas.webhooks.schemas import WebhookStage
+from uaproject_backend_schemas.webhooks.schemas import WebhookPriority, WebhookStage
 
 if TYPE_CHECKING:
     from uaproject_backend_schemas.users.models import User
@@ -44,7 +45,9 @@ class PurchasedItem(
     )
     quantity: int = Field(default=1, ge=1)
     expires_at: Optional[datetime] = Field(sa_column=Column(DateTime(timezone=True), nullable=True))
-    purchase_metadata: Optional[Dict[str, Any]] = Field(sa_column=Column(JSON), default=None)
+    purchase_metadata: Optional[Dict[str, Any]] = Field(
+        sa_column=Column(MutableDict.as_mutable(JSON)), default=None
+    )
 
     user: Optional["User"] = Relationship()
     service: Optional["Service"] = Relationship()
@@ -64,6 +67,7 @@ class PurchasedItem(
                 "purchase_metadata",
             },
             stage=WebhookStage.AFTER,
+            priority=WebhookPriority.HIGH,
         )
 
         cls.register_scope(
@@ -90,6 +94,7 @@ class PurchasedItem(
                     "expires_at_field": "expires_at",
                     "status_field": "status",
                     "status_value": PurchasedItemStatus.EXPIRED.value,
+                    "active_value": PurchasedItemStatus.ACTIVE.value,
                     "scope_name": "expiration",
                 }
             ],
@@ -1,5 +1,6 @@
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+from sqlalchemy.ext.mutable import MutableDict, MutableList
 from sqlmodel import DECIMAL, JSON, Column, Enum, Field, Relationship
 
 from uaproject_backend_schemas.base import Base, IDMixin, TimestampsMixin
@@ -10,7 +11,7 @@ from uaproject_backend_schemas.payments.services.schemas import (
 )
 from uaproject_backend_schemas.schemas import SerializableDecimal
 from uaproject_backend_schemas.webhooks.mixins import WebhookChangesMixin
-from uaproject_backend_schemas.webhooks.schemas import WebhookStage
+from uaproject_backend_schemas.webhooks.schemas import WebhookPriority, WebhookStage
 
 if TYPE_CHECKING:
     from uaproject_backend_schemas.payments.transactions.models import Transaction
@@ -31,7 +32,9 @@ class Service(
     name: str = Field(max_length=255, unique=True, nullable=False)
     display_name: Optional[str] = Field(max_length=255, nullable=True)
     description: Optional[str] = Field(max_length=1000, nullable=True)
-    points: Optional[List[ServicePoint]] = Field(sa_column=Column(JSON), default=None)
+    points: Optional[List[ServicePoint]] = Field(
+        sa_column=Column(MutableList.as_mutable(JSON)), default=None
+    )
     image: Optional[str] = Field(max_length=500, nullable=True)
     price: SerializableDecimal = Field(sa_column=Column(DECIMAL(10, 2), nullable=False))
     is_active: bool = Field(default=True)
@@ -41,8 +44,12 @@ class Service(
     is_upgradable: bool = Field(default=False)
     upgrade_from: Optional[str] = Field(max_length=100, nullable=True)
     upgrade_to: Optional[str] = Field(max_length=100, nullable=True)
-    service_metadata: Optional[Dict[str, Any]] = Field(sa_column=Column(JSON), default=None)
-    discounts: Optional[List[ServiceDiscount]] = Field(sa_column=Column(JSON), default=None)
+    service_metadata: Optional[Dict[str, Any]] = Field(
+        sa_column=Column(MutableDict.as_mutable(JSON)), default=None
+    )
+    discounts: Optional[List[ServiceDiscount]] = Field(
+        sa_column=Column(MutableList.as_mutable(JSON)), default=None
+    )
 
     transactions: list["Transaction"] = Relationship(back_populates="service")
 
@@ -89,6 +96,7 @@ class Service(
             trigger_fields={"description", "points", "image"},
             fields={"id", "name", "display_name", "description", "points", "image"},
             stage=WebhookStage.AFTER,
+            priority=WebhookPriority.LOW,
         )
 
         cls.register_scope(
@@ -122,6 +122,7 @@ class Transaction(
                 },
                 {
                     "type": "create_or_update_purchased_item",
+                    "depends_on": ["update_balance"],
                     "condition": "type == TransactionType.PURCHASE",
                     "fields": {
                         "user_id": "recipient_id",
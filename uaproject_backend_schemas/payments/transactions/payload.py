@@ -44,21 +44,21 @@ class TransactionCreatedPayload(TransactionBasePayload):
 
 
 class TransactionTypePayload(TransactionBasePayload):
-    """Payload for transaction type updates"""
+    """Payload for transaction type updates, `type` is None before a transaction is created"""
 
     id: int
     user_id: int
     amount: SerializableDecimal
-    type: TransactionType
+    type: Optional[TransactionType] = None
     description: Optional[str] = None
 
 
 class TransactionAmountPayload(TransactionBasePayload):
-    """Payload for transaction amount updates"""
+    """Payload for transaction amount updates, `amount` is None before a transaction is created"""
 
     id: int
     user_id: int
-    amount: SerializableDecimal
+    amount: Optional[SerializableDecimal] = None
     type: TransactionType
     description: Optional[str] = None
 
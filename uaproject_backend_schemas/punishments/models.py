@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+from sqlalchemy.ext.mutable import MutableDict
 from sqlmodel import JSON, BigInteger, Column, DateTime, Enum, Field, ForeignKey, Relationship
 
 from uaproject_backend_schemas.base import Base, IDMixin, TimestampsMixin
@@ -9,7 +10,7 @@ from uaproject_backend_schemas.webhooks.mixins import (
     WebhookChangesMixin,
     WebhookRelationshipsMixin,
 )
-from uaproject_backend_schemas.webhooks.schemas import WebhookStage
+from uaproject_backend_schemas.webhooks.schemas import WebhookPriority, WebhookStage
 
 if TYPE_CHECKING:
     from uaproject_backend_schemas.users.models import User
@@ -32,7 +33,9 @@ class PunishmentConfig(
     is_active: bool = Field(default=True)
     warn_threshold: int = Field(default=3)
     warn_decay_days: int = Field(default=30)
-    config_data: Dict[str, Any] = Field(sa_column=Column(JSON, nullable=False, default={}))
+    config_data: Dict[str, Any] = Field(
+        sa_column=Column(MutableDict.as_mutable(JSON), nullable=False, default={})
+    )
 
     punishments: List["Punishment"] = Relationship(back_populates="config")
 
@@ -114,6 +117,7 @@ class Punishment(
             },
             fields={"id", "user_id", "admin_id", "type", "status", "reason", "expires_at"},
             stage=WebhookStage.AFTER,
+            priority=WebhookPriority.HIGH,
             relationships={
                 "user": {"fields": ["id", "discord_id", "minecraft_nickname"]},
                 "admin": {"fields": ["id", "discord_id", "minecraft_nickname"]},
@@ -126,6 +130,7 @@ class Punishment(
             trigger_fields={"status"},
             fields={"id", "user_id", "admin_id", "type", "status", "reason", "punishment_metadata"},
             stage=WebhookStage.BOTH,
+            priority=WebhookPriority.HIGH,
             relationships={
                 "user": {"fields": ["id", "discord_id", "minecraft_nickname"]},
                 "admin": {"fields": ["id", "discord_id", "minecraft_nickname"]},
@@ -135,6 +140,7 @@ class Punishment(
                     "expires_at_field": "expires_at",
                     "status_field": "status",
                     "status_value": PunishmentStatus.EXPIRED.value,
+                    "active_value": PunishmentStatus.ACTIVE.value,
                     "scope_name": "punishment.status_changed",
                 }
             ],
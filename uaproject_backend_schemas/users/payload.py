@@ -85,10 +85,10 @@ class MinecraftNicknamePayload(BaseModel):
 
 
 class DiscordIdPayload(BaseModel):
-    """Payload for Discord ID scope"""
+    """Payload for Discord ID scope, `discord_id` is None before a user is created"""
 
     id: int
-    discord_id: int
+    discord_id: Optional[int] = None
     minecraft_nickname: Optional[str] = None
 
 
@@ -1,5 +1,6 @@
 from typing import TYPE_CHECKING, List, Optional
 
+from sqlalchemy.ext.mutable import MutableList
 from sqlmodel import JSON, BigInteger, Column, Field, ForeignKey, Relationship
 
 from uaproject_backend_schemas.base import Base, IDMixin, TimestampsMixin
@@ -60,6 +61,7 @@ class UserRoles(
                 "user": {"fields": ["id", "discord_id", "minecraft_nickname"]},
                 "role": {"fields": ["id", "name", "display_name"]},
             },
+            on_delete=True,
         )
 
 
@@ -75,7 +77,7 @@ class Role(
 
     name: str = Field(unique=True, index=True)
     display_name: str | None = Field(default=None, nullable=True)
-    permissions: List[str] = Field(sa_column=Column(JSON))
+    permissions: List[str] = Field(sa_column=Column(MutableList.as_mutable(JSON)))
     weight: int = Field(default=0, index=True)
 
     users: List["User"] = Relationship(
@@ -1,16 +1,77 @@
+from .backfill import BackfillItem, WebhookBackfill
+from .callbacks import (
+    TemporalCallbackExecutor,
+    TemporalExpirationNotice,
+    get_temporal_callback_executor,
+    set_temporal_callback_executor,
+)
+from .circuit_breaker import (
+    CircuitBreakerConfig,
+    CircuitPermit,
+    EndpointCircuitBreaker,
+    WebhookCircuitBreakers,
+    WebhookCircuitOpenError,
+)
+from .clock import ManualClock, SystemClock, get_clock, set_clock
+from .coalescing import WebhookCoalescer
+from .conditions import CompiledCondition, ConditionSyntaxError, compile_condition
+from .deletes import capture_deleted_events, delete_with_events, pop_deleted_events
+from .delivery import (
+    WebhookDeliverer,
+    WebhookDeliveryError,
+    WebhookDeliveryJob,
+    sign_payload,
+)
+from .dispatch import ShardedWebhookDispatcher, WeightedFairQueue, shard_for
+from .encoding import decode_payload, decode_payload_model, encode_payload
+from .expirations import (
+    TemporalExpiration,
+    TemporalExpirationScheduler,
+    TemporalExpirationSweeper,
+)
+from .metrics import (
+    InMemoryMetricsSink,
+    MetricsSink,
+    NoOpMetricsSink,
+    PrometheusMetricsSink,
+    get_metrics,
+    set_metrics,
+)
 from .mixins import (
+    ActionBatcher,
+    ActionExecutor,
+    ActionResult,
     WebhookActionsMixin,
     WebhookBaseMixin,
     WebhookChangesMixin,
     WebhookRelationshipsMixin,
     WebhookScopeFields,
+    WebhookScopeIndex,
     WebhookTemporalMixin,
+    flag_json_mutations,
+    scope_priority,
+)
+from .mixins.changes import WebhookEvent
+from .models import Webhook, WebhookDeadLetter, WebhookOutbox
+from .outbox import (
+    WebhookOutboxDrainer,
+    WebhookOutboxRecord,
+    enqueue_deleted_events,
+    enqueue_webhook_events,
 )
-from .models import Webhook
+from .projection import PayloadSlicer, payload_sections, union_fields
+from .registry import register_all_scopes, verify_all_action_handlers
+from .retry import RetryPolicy, WebhookRetryScheduler, WebhookStatusTracker
 from .schemas import (
+    WebhookActionStatus,
     WebhookBase,
+    WebhookCircuitState,
     WebhookCreate,
+    WebhookEncoding,
     WebhookFilterParams,
+    WebhookOutboxStatus,
+    WebhookPayloadFormat,
+    WebhookPriority,
     WebhookResponse,
     WebhookSort,
     WebhookStatus,
@@ -32,4 +93,72 @@ __all__ = [
     "WebhookUpdate",
     "WebhookResponse",
     "WebhookFilterParams",
+    "WebhookEvent",
+    "WebhookCoalescer",
+    "WebhookOutbox",
+    "WebhookOutboxStatus",
+    "WebhookOutboxRecord",
+    "WebhookOutboxDrainer",
+    "enqueue_webhook_events",
+    "WebhookDeadLetter",
+    "WebhookDeliveryJob",
+    "WebhookDeliveryError",
+    "WebhookDeliverer",
+    "sign_payload",
+    "RetryPolicy",
+    "WebhookRetryScheduler",
+    "WebhookStatusTracker",
+    "WebhookCircuitState",
+    "CircuitBreakerConfig",
+    "CircuitPermit",
+    "EndpointCircuitBreaker",
+    "WebhookCircuitBreakers",
+    "WebhookCircuitOpenError",
+    "ShardedWebhookDispatcher",
+    "shard_for",
+    "TemporalExpiration",
+    "TemporalExpirationScheduler",
+    "TemporalExpirationSweeper",
+    "SystemClock",
+    "ManualClock",
+    "get_clock",
+    "set_clock",
+    "TemporalExpirationNotice",
+    "TemporalCallbackExecutor",
+    "get_temporal_callback_executor",
+    "set_temporal_callback_executor",
+    "CompiledCondition",
+    "ConditionSyntaxError",
+    "compile_condition",
+    "WebhookActionStatus",
+    "ActionExecutor",
+    "ActionResult",
+    "ActionBatcher",
+    "flag_json_mutations",
+    "enqueue_deleted_events",
+    "capture_deleted_events",
+    "pop_deleted_events",
+    "delete_with_events",
+    "WebhookPayloadFormat",
+    "WebhookEncoding",
+    "encode_payload",
+    "decode_payload",
+    "decode_payload_model",
+    "BackfillItem",
+    "WebhookBackfill",
+    "MetricsSink",
+    "NoOpMetricsSink",
+    "InMemoryMetricsSink",
+    "PrometheusMetricsSink",
+    "get_metrics",
+    "set_metrics",
+    "WebhookScopeIndex",
+    "register_all_scopes",
+    "verify_all_action_handlers",
+    "PayloadSlicer",
+    "payload_sections",
+    "union_fields",
+    "WebhookPriority",
+    "WeightedFairQueue",
+    "scope_priority",
 ]
@@ -0,0 +1,124 @@
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Type
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from uaproject_backend_schemas.webhooks.mixins.changes import WebhookChangesMixin
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["BackfillItem", "WebhookBackfill"]
+
+SessionFactory = Callable[[], AsyncSession]
+
+
+class BackfillItem(NamedTuple):
+    """Scope payload of a single existing row, built for replay"""
+
+    scope: str
+    entity_id: int
+    payload: Dict[str, Any]
+
+
+class WebhookBackfill:
+    """
+    Streaming replay of scope payloads for the existing rows of a model.
+
+    The table is walked in primary-key order, one keyset page per session, and
+    every page is streamed through a server-side cursor with `yield_per`.
+    Relationships used by the scopes are loaded per page with `selectinload`, so
+    `get_payload_for_scope` builds payloads without a query per row. Pages are
+    dropped from the session once handed to `deliver`, which is awaited for every
+    item; a bounded consumer such as `ShardedWebhookDispatcher.submit` therefore
+    throttles the walk and memory stays flat regardless of table size.
+
+    An interrupted run can be resumed by passing `last_id` as `start_after`.
+
+    Args:
+        model: Model whose rows are replayed
+        scopes: Full names of the scopes to build payloads for
+        deliver: Coroutine receiving every built item
+        page_size: Number of rows per keyset page
+    """
+
+    def __init__(
+        self,
+        model: Type[WebhookChangesMixin],
+        scopes: Iterable[str],
+        deliver: Callable[[BackfillItem], Awaitable[None]],
+        page_size: int = 500,
+    ):
+        self.model = model
+        self.scopes = list(scopes)
+        self.deliver = deliver
+        self.page_size = page_size
+        self.last_id: Optional[int] = None
+        self.emitted = 0
+
+        registered = model.get_webhook_scopes()
+        if unknown := [scope for scope in self.scopes if scope not in registered]:
+            raise ValueError(f"Unknown scopes for {model.__name__}: {unknown}")
+
+        self._relationships = sorted(
+            {
+                rel_name
+                for scope in self.scopes
+                for rel_name in (registered[scope].relationships or {})
+            }
+        )
+
+    def _page_query(self, after: Optional[int], criteria: List[Any]):
+        stmt = select(self.model).where(*criteria).order_by(self.model.id).limit(self.page_size)
+        if after is not None:
+            stmt = stmt.where(self.model.id > after)
+        if self._relationships:
+            stmt = stmt.options(
+                *(selectinload(getattr(self.model, rel_name)) for rel_name in self._relationships)
+            )
+        return stmt.execution_options(yield_per=self.page_size)
+
+    async def backfill_page(self, session: AsyncSession, criteria: List[Any]) -> int:
+        """Replay the page after `last_id`; returns the number of rows read"""
+        rows = 0
+        result = await session.stream_scalars(self._page_query(self.last_id, criteria))
+
+        async for instance in result:
+            for scope in self.scopes:
+                payload = await instance.get_payload_for_scope(session, scope, {})
+                await self.deliver(BackfillItem(scope, instance.id, payload))
+                self.emitted += 1
+            self.last_id = instance.id
+            rows += 1
+
+        session.expunge_all()
+        return rows
+
+    async def run(
+        self,
+        session_factory: SessionFactory,
+        *criteria: Any,
+        start_after: Optional[int] = None,
+    ) -> int:
+        """
+        Replay all rows matching `criteria`; returns the number of emitted items.
+
+        Args:
+            session_factory: Callable returning a new `AsyncSession`
+            criteria: Optional filters applied to the model's rows
+            start_after: Primary key after which to start, to resume a previous run
+        """
+        if start_after is not None:
+            self.last_id = start_after
+
+        while True:
+            async with session_factory() as session:
+                rows = await self.backfill_page(session, list(criteria))
+
+            logger.debug(
+                f"Backfilled {rows} {self.model.__name__} row(s) up to id {self.last_id}, "
+                f"{self.emitted} item(s) emitted"
+            )
+            if rows < self.page_size:
+                return self.emitted
@@ -0,0 +1,230 @@
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from uaproject_backend_schemas.webhooks.types import ChangesDict, TemporalCallback
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "TemporalExpirationNotice",
+    "TemporalCallbackExecutor",
+    "get_temporal_callback_executor",
+    "set_temporal_callback_executor",
+]
+
+
+class TemporalExpirationNotice(NamedTuple):
+    """Expiration of a temporal field of a single entity, passed to batch callbacks"""
+
+    entity_id: int
+    scope: str
+    changes: ChangesDict
+
+
+class _CallbackBatch(NamedTuple):
+    callback: TemporalCallback
+    batch: bool
+    notices: List[TemporalExpirationNotice]
+    queued_at: float
+
+
+class TemporalCallbackExecutor:
+    """
+    Bounded background executor of temporal expiration callbacks.
+
+    `notify` never blocks change detection: notices are buffered per callback
+    and handed to the queue once the current event loop iteration ends, so all
+    expirations detected during the same flush reach the workers as one batch.
+    Plain callbacks are still called once per notice, batch callbacks once per
+    batch with the list of notices. Sync callbacks run in a thread.
+
+    When the queue is full the batch is dropped and counted, since a blocked
+    `get_changes` would stall every pending change. Without a running event
+    loop callbacks are invoked inline. The workers are bound to the loop they
+    were started on; when notices arrive on another loop (e.g. a new
+    `asyncio.run` in tests or a worker process), the queue and workers are
+    rebuilt there and still queued batches are carried over.
+
+    Args:
+        maxsize: Capacity of the batch queue
+        concurrency: Number of worker tasks
+        latency_window: Number of recent batches kept for queue latency stats
+        clock: Monotonic clock returning seconds
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        concurrency: int = 4,
+        latency_window: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.concurrency = concurrency
+        self.clock = clock
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[Tuple[TemporalCallback, bool], List[TemporalExpirationNotice]] = {}
+        self._flush_scheduled = False
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self._counters = {"queued": 0, "processed": 0, "failed": 0, "dropped": 0}
+
+    def notify(
+        self, callback: TemporalCallback, notice: TemporalExpirationNotice, batch: bool = False
+    ) -> None:
+        """Schedule a callback for an expiration without waiting for it"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._invoke_inline(callback, batch, [notice])
+            return
+
+        self._pending.setdefault((callback, batch), []).append(notice)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self._flush_pending)
+
+    def _flush_pending(self) -> None:
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, {}
+        self.start()
+
+        for (callback, batch), notices in pending.items():
+            try:
+                self._queue.put_nowait(_CallbackBatch(callback, batch, notices, self.clock()))
+                self._counters["queued"] += len(notices)
+            except asyncio.QueueFull:
+                self._counters["dropped"] += len(notices)
+                logger.warning(
+                    f"Temporal callback queue is full, dropped {len(notices)} expiration(s)"
+                )
+
+    def _invoke_inline(
+        self, callback: TemporalCallback, batch: bool, notices: List[TemporalExpirationNotice]
+    ) -> None:
+        try:
+            for result in self._call(callback, batch, notices):
+                if inspect.isawaitable(result):
+                    asyncio.run(result)
+            self._counters["processed"] += len(notices)
+        except Exception as e:
+            self._counters["failed"] += len(notices)
+            logger.error(f"Error in temporal expiration callback: {e}", exc_info=True)
+
+    @staticmethod
+    def _call(
+        callback: TemporalCallback, batch: bool, notices: List[TemporalExpirationNotice]
+    ) -> List[Any]:
+        if batch:
+            return [callback(notices)]
+        return [callback(*notice) for notice in notices]
+
+    def start(self) -> None:
+        """Start the worker tasks on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._rebind(loop)
+        if self._workers:
+            return
+        self._queue = self._queue or asyncio.Queue(self.maxsize)
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"temporal-callbacks-{index}")
+            for index in range(self.concurrency)
+        ]
+
+    def _rebind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Drop the workers of another loop and move its queued batches to a new queue"""
+        old_loop, old_queue, workers = self._loop, self._queue, self._workers
+        if workers and old_loop is not None and not old_loop.is_closed():
+            for worker in workers:
+                old_loop.call_soon_threadsafe(worker.cancel)
+
+        self._loop = loop
+        self._workers = []
+        self._queue = None
+        if old_queue is None or old_queue.empty():
+            return
+
+        self._queue = asyncio.Queue(self.maxsize)
+        while not old_queue.empty():
+            self._queue.put_nowait(old_queue.get_nowait())
+        logger.info(
+            f"Temporal callback executor moved {self._queue.qsize()} batch(es) to a new event loop"
+        )
+
+    async def _work(self) -> None:
+        while True:
+            item: _CallbackBatch = await self._queue.get()
+            self._latencies.append(self.clock() - item.queued_at)
+            try:
+                await self._run_batch(item)
+                self._counters["processed"] += len(item.notices)
+            except Exception as e:
+                self._counters["failed"] += len(item.notices)
+                logger.error(f"Error in temporal expiration callback: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    async def _run_batch(self, item: _CallbackBatch) -> None:
+        if inspect.iscoroutinefunction(item.callback):
+            await asyncio.gather(*self._call(item.callback, item.batch, item.notices))
+            return
+
+        results = await asyncio.to_thread(self._call, item.callback, item.batch, item.notices)
+        awaitables = [result for result in results if inspect.isawaitable(result)]
+        if awaitables:
+            await asyncio.gather(*awaitables)
+
+    def stats(self) -> Dict[str, float]:
+        """Counters, queue depth and queue latency of recent batches in seconds"""
+        latencies = sorted(self._latencies)
+        return {
+            **self._counters,
+            "depth": self._queue.qsize() if self._queue else 0,
+            "latency_avg": sum(latencies) / len(latencies) if latencies else 0.0,
+            "latency_p95": latencies[min(int(0.95 * len(latencies)), len(latencies) - 1)]
+            if latencies
+            else 0.0,
+            "latency_max": latencies[-1] if latencies else 0.0,
+        }
+
+    async def join(self) -> None:
+        """Wait until every queued batch has been handled"""
+        await asyncio.sleep(0)
+        if self._queue is not None:
+            self.start()
+            await self._queue.join()
+
+    async def stop(self, drain: bool = True, timeout: Optional[float] = None) -> None:
+        """Stop the workers, optionally after handling the queued batches"""
+        if self._queue is not None:
+            self.start()
+        if drain:
+            await asyncio.wait_for(self.join(), timeout=timeout)
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        self._loop = None
+
+
+_executor = TemporalCallbackExecutor()
+
+
+def get_temporal_callback_executor() -> TemporalCallbackExecutor:
+    """Executor running temporal expiration callbacks"""
+    return _executor
+
+
+def set_temporal_callback_executor(executor: TemporalCallbackExecutor) -> None:
+    """Replace the executor running temporal expiration callbacks"""
+    global _executor
+    _executor = executor
@@ -0,0 +1,257 @@
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, NamedTuple, Optional, Set, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from uaproject_backend_schemas.webhooks.delivery import WebhookDeliveryError, WebhookDeliveryJob
+from uaproject_backend_schemas.webhooks.retry import WebhookStatusTracker
+from uaproject_backend_schemas.webhooks.schemas import WebhookCircuitState, WebhookStatus
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "CircuitBreakerConfig",
+    "CircuitPermit",
+    "EndpointCircuitBreaker",
+    "WebhookCircuitBreakers",
+    "WebhookCircuitOpenError",
+]
+
+SessionFactory = Callable[[], AsyncSession]
+
+
+class CircuitBreakerConfig(BaseModel):
+    """Thresholds of a per-endpoint circuit breaker"""
+
+    window_size: int = 50
+    min_requests: int = 10
+    error_rate_threshold: float = 0.5
+    latency_threshold: float = 5.0
+    latency_percentile: float = 0.95
+    open_duration: float = 30.0
+    half_open_probes: int = 2
+
+
+class WebhookCircuitOpenError(WebhookDeliveryError):
+    """Raised instead of delivering while the endpoint's circuit is open"""
+
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(
+            f"Circuit for {endpoint} is open",
+            status=WebhookStatus.UNRESPONSIVE,
+            retry_after=retry_after,
+        )
+
+
+class CircuitPermit(NamedTuple):
+    """Permission for a single call, tagged with the breaker generation that issued it"""
+
+    generation: int
+    probe: bool
+
+
+class EndpointCircuitBreaker:
+    """
+    Circuit breaker of a single endpoint.
+
+    The breaker keeps the outcome and latency of the last `window_size` calls.
+    It opens once at least `min_requests` calls were seen and either the error
+    rate or the configured latency percentile crosses its threshold. After
+    `open_duration` seconds it lets `half_open_probes` calls through; the circuit
+    closes if all of them succeed and opens again on the first failure.
+
+    Every state change starts a new generation. Outcomes of calls permitted in
+    an earlier generation are ignored, so a slow call allowed before the
+    circuit opened is never counted as a half-open probe.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        config: CircuitBreakerConfig,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.endpoint = endpoint
+        self.config = config
+        self.clock = clock
+        self.state = WebhookCircuitState.CLOSED
+        self.opened_at = 0.0
+        self.generation = 0
+
+        self._outcomes: Deque[Tuple[bool, float]] = deque(maxlen=config.window_size)
+        self._errors = 0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+    @property
+    def error_rate(self) -> float:
+        return self._errors / len(self._outcomes) if self._outcomes else 0.0
+
+    def latency(self, percentile: Optional[float] = None) -> float:
+        """Latency percentile of the calls in the window"""
+        if not self._outcomes:
+            return 0.0
+        percentile = self.config.latency_percentile if percentile is None else percentile
+        latencies = sorted(latency for _, latency in self._outcomes)
+        return latencies[min(int(percentile * len(latencies)), len(latencies) - 1)]
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets probes through"""
+        return max(self.opened_at + self.config.open_duration - self.clock(), 0.0)
+
+    def allow_request(self) -> Optional[CircuitPermit]:
+        """
+        Check whether a call may be made now, reserving a probe slot when half-open.
+
+        Returns:
+            Permit to pass to `record` with the outcome of the call, None if the
+            call must not be made
+        """
+        if self.state == WebhookCircuitState.OPEN:
+            if self.retry_after() > 0:
+                return None
+            self._transition(WebhookCircuitState.HALF_OPEN)
+
+        if self.state == WebhookCircuitState.HALF_OPEN:
+            if self._probes_in_flight + self._probe_successes >= self.config.half_open_probes:
+                return None
+            self._probes_in_flight += 1
+            return CircuitPermit(self.generation, probe=True)
+
+        return CircuitPermit(self.generation, probe=False)
+
+    def record(
+        self, permit: CircuitPermit, success: bool, latency: float
+    ) -> Optional[WebhookCircuitState]:
+        """Record the outcome of a permitted call and return the new state if it changed"""
+        if permit.generation != self.generation:
+            # The call was permitted before the last state change and says nothing about it
+            return None
+
+        if permit.probe:
+            self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+            if not success:
+                return self._transition(WebhookCircuitState.OPEN)
+
+            self._probe_successes += 1
+            if self._probe_successes >= self.config.half_open_probes:
+                return self._transition(WebhookCircuitState.CLOSED)
+            return None
+
+        if len(self._outcomes) == self._outcomes.maxlen and not self._outcomes[0][0]:
+            self._errors -= 1
+        self._outcomes.append((success, latency))
+        if not success:
+            self._errors += 1
+
+        if self.state == WebhookCircuitState.CLOSED and self._should_open():
+            return self._transition(WebhookCircuitState.OPEN)
+        return None
+
+    def _should_open(self) -> bool:
+        if len(self._outcomes) < self.config.min_requests:
+            return False
+        return (
+            self.error_rate >= self.config.error_rate_threshold
+            or self.latency() >= self.config.latency_threshold
+        )
+
+    def _transition(self, state: WebhookCircuitState) -> WebhookCircuitState:
+        logger.info(f"Circuit for {self.endpoint} changed from {self.state} to {state}")
+        self.state = state
+        self.generation += 1
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+        if state == WebhookCircuitState.OPEN:
+            self.opened_at = self.clock()
+        elif state == WebhookCircuitState.CLOSED:
+            self._outcomes.clear()
+            self._errors = 0
+        return state
+
+
+class WebhookCircuitBreakers:
+    """
+    Circuit breakers of all webhook endpoints.
+
+    Wraps a delivery coroutine so calls to an endpoint with an open circuit fail
+    immediately with `WebhookCircuitOpenError`, which the retry scheduler
+    reschedules without counting an attempt. Opening and closing a circuit is
+    reported to the `WebhookStatusTracker` for every webhook seen for the
+    endpoint; the tracker owns `Webhook.status`, so share it with the retry
+    scheduler and the outbox drainer.
+
+    Args:
+        deliver: Coroutine delivering a job, raising on failure
+        session_factory: Callable returning a new `AsyncSession` used for status
+            updates of the default tracker
+        config: Breaker thresholds shared by all endpoints
+        clock: Monotonic clock returning seconds
+        status_tracker: Tracker owning the webhook statuses, created from
+            `session_factory` if omitted
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[WebhookDeliveryJob], Awaitable[None]],
+        session_factory: Optional[SessionFactory] = None,
+        config: Optional[CircuitBreakerConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+        status_tracker: Optional[WebhookStatusTracker] = None,
+    ):
+        self.deliver_job = deliver
+        self.session_factory = session_factory
+        self.status_tracker = status_tracker or WebhookStatusTracker(session_factory)
+        self.config = config or CircuitBreakerConfig()
+        self.clock = clock
+
+        self._breakers: Dict[str, EndpointCircuitBreaker] = {}
+        self._webhook_ids: Dict[str, Set[int]] = {}
+
+    def get(self, endpoint: str) -> EndpointCircuitBreaker:
+        """Get or create the breaker of an endpoint"""
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = EndpointCircuitBreaker(
+                endpoint, self.config, self.clock
+            )
+        return breaker
+
+    def states(self) -> Dict[str, WebhookCircuitState]:
+        """Current state of every known endpoint"""
+        return {endpoint: breaker.state for endpoint, breaker in self._breakers.items()}
+
+    async def deliver(self, job: WebhookDeliveryJob) -> None:
+        """Deliver a job unless the circuit of its endpoint is open"""
+        breaker = self.get(job.endpoint)
+        self._webhook_ids.setdefault(job.endpoint, set()).add(job.webhook_id)
+
+        permit = breaker.allow_request()
+        if permit is None:
+            raise WebhookCircuitOpenError(
+                job.endpoint, breaker.retry_after() or self.config.open_duration
+            )
+
+        started = self.clock()
+        try:
+            await self.deliver_job(job)
+        except Exception:
+            await self._on_transition(
+                job.endpoint, breaker.record(permit, False, self.clock() - started)
+            )
+            raise
+
+        await self._on_transition(
+            job.endpoint, breaker.record(permit, True, self.clock() - started)
+        )
+
+    async def _on_transition(self, endpoint: str, state: Optional[WebhookCircuitState]) -> None:
+        if state not in (WebhookCircuitState.OPEN, WebhookCircuitState.CLOSED):
+            return
+
+        for webhook_id in self._webhook_ids.get(endpoint, ()):
+            await self.status_tracker.record_circuit(webhook_id, state == WebhookCircuitState.OPEN)
@@ -0,0 +1,73 @@
+import threading
+from datetime import UTC, datetime, timedelta
+from typing import Callable, Optional, Union
+
+__all__ = [
+    "Clock",
+    "SystemClock",
+    "ManualClock",
+    "as_aware",
+    "get_clock",
+    "set_clock",
+    "current_time",
+]
+
+Clock = Callable[[], datetime]
+
+
+def as_aware(value: datetime) -> datetime:
+    """Return a tz-aware datetime, treating naive values as UTC"""
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+class SystemClock:
+    """Tz-aware UTC wall clock that never goes backwards within the process"""
+
+    def __init__(self):
+        self._last = datetime.min.replace(tzinfo=UTC)
+        self._lock = threading.Lock()
+
+    def __call__(self) -> datetime:
+        current = datetime.now(UTC)
+        with self._lock:
+            if current < self._last:
+                return self._last
+            self._last = current
+        return current
+
+
+class ManualClock:
+    """Clock that only moves when told to, for tests and deterministic benchmarks"""
+
+    def __init__(self, start: Optional[datetime] = None):
+        self._now = as_aware(start) if start else datetime.now(UTC)
+
+    def __call__(self) -> datetime:
+        return self._now
+
+    def advance(self, delta: Union[timedelta, float]) -> datetime:
+        """Move the clock forward by a timedelta or a number of seconds"""
+        self._now += delta if isinstance(delta, timedelta) else timedelta(seconds=delta)
+        return self._now
+
+    def set(self, value: datetime) -> None:
+        self._now = as_aware(value)
+
+
+_clock: Clock = SystemClock()
+
+
+def get_clock() -> Clock:
+    """Clock used by temporal webhook evaluation"""
+    return _clock
+
+
+def set_clock(clock: Clock) -> None:
+    """Replace the clock used by temporal webhook evaluation"""
+    global _clock
+    _clock = clock
+
+
+def current_time() -> datetime:
+    """Current time of the configured clock"""
+    return _clock()
@@ -0,0 +1,143 @@
+import itertools
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from uaproject_backend_schemas.webhooks.mixins.changes import FieldChange, WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["WebhookCoalescer", "merge_scope_changes"]
+
+_META_KEYS = ("_untracked", "_unchanged")
+
+
+def _merge_field_changes(
+    older: Dict[str, FieldChange],
+    newer: Dict[str, FieldChange],
+    fallback: Optional[Dict[str, FieldChange]] = None,
+) -> Dict[str, FieldChange]:
+    """Merge field changes keeping the first "before" and the last "after" value"""
+    merged = dict(older)
+    for field, change in newer.items():
+        previous = merged.get(field)
+        if previous is None and fallback:
+            previous = fallback.get(field)
+
+        if previous is None:
+            merged[field] = change
+        else:
+            merged[field] = {"before": previous["before"], "after": change["after"]}
+    return merged
+
+
+def merge_scope_changes(older: Dict[str, Any], newer: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge two triggered scope payloads of the same entity into one.
+
+    Tracked and untracked fields keep the "before" state of the first change and
+    the "after" state of the last one, so `WebhookStage.BOTH` scopes describe the
+    whole burst. Fields that changed in any of the merged events are removed from
+    `_unchanged`.
+    """
+    older_untracked = older.get("_untracked") or {}
+    newer_untracked = newer.get("_untracked") or {}
+
+    merged = _merge_field_changes(
+        {field: change for field, change in older.items() if field not in _META_KEYS},
+        {field: change for field, change in newer.items() if field not in _META_KEYS},
+        fallback=older_untracked,
+    )
+    untracked = _merge_field_changes(older_untracked, newer_untracked)
+    unchanged = {**(older.get("_unchanged") or {}), **(newer.get("_unchanged") or {})}
+
+    for field in merged.keys() | untracked.keys():
+        unchanged.pop(field, None)
+
+    merged["_untracked"] = {
+        field: change for field, change in untracked.items() if field not in merged
+    }
+    merged["_unchanged"] = unchanged
+    return merged
+
+
+class WebhookCoalescer:
+    """
+    Coalescing stage for webhook events keyed by (scope, entity id).
+
+    The first event of a key opens a window of `window` seconds; every event for
+    the same key that arrives before the window closes is merged into the pending
+    one instead of producing a new event. Windows are fixed from the first event,
+    so a constantly edited entity is still delivered at least once per window.
+
+    Events of an entity are released in arrival order: an event is only merged
+    into the latest pending event of its entity, so a burst alternating between
+    scopes is kept as separate events rather than reordered.
+
+    Args:
+        window: Coalescing window in seconds. Zero disables coalescing, events
+            are then returned by the next `pop_ready` as they were pushed.
+        clock: Monotonic clock returning seconds, injectable for tests and benchmarks
+    """
+
+    def __init__(self, window: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        if window < 0:
+            raise ValueError("Coalescing window must not be negative")
+
+        self.window = window
+        self.clock = clock
+        self._sequence = itertools.count()
+        # Insertion order equals deadline order because every event gets the same window
+        self._pending: Dict[int, Tuple[float, WebhookEvent]] = {}
+        # Latest pending event of every entity, the only one new events merge into
+        self._latest: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def push(self, event: WebhookEvent) -> None:
+        """Add an event, merging it into the latest pending event of its entity if of the same scope"""
+        latest = self._latest.get(event.entity_id)
+        if latest is not None and self.window > 0:
+            deadline, pending = self._pending[latest]
+            if pending.scope == event.scope:
+                changes = merge_scope_changes(pending.changes, event.changes)
+                self._pending[latest] = (deadline, pending._replace(changes=changes))
+                return
+
+        sequence = next(self._sequence)
+        self._pending[sequence] = (self.clock() + self.window, event)
+        self._latest[event.entity_id] = sequence
+
+    def extend(self, events: Iterable[WebhookEvent]) -> None:
+        """Add several events in order"""
+        for event in events:
+            self.push(event)
+
+    def next_deadline(self) -> Optional[float]:
+        """Clock value at which the oldest pending event becomes ready"""
+        for deadline, _ in self._pending.values():
+            return deadline
+        return None
+
+    def pop_ready(self, now: Optional[float] = None) -> List[WebhookEvent]:
+        """Remove and return events whose coalescing window has elapsed, in arrival order"""
+        now = self.clock() if now is None else now
+        ready: List[int] = []
+
+        for sequence, (deadline, _) in self._pending.items():
+            if deadline > now:
+                break
+            ready.append(sequence)
+
+        return [self._pop(sequence) for sequence in ready]
+
+    def flush(self) -> List[WebhookEvent]:
+        """Remove and return all pending events regardless of their windows, in arrival order"""
+        return [self._pop(sequence) for sequence in list(self._pending)]
+
+    def _pop(self, sequence: int) -> WebhookEvent:
+        _, event = self._pending.pop(sequence)
+        if self._latest.get(event.entity_id) == sequence:
+            del self._latest[event.entity_id]
+        return event
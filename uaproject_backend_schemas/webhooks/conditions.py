@@ -0,0 +1,220 @@
+import ast
+import logging
+import operator
+import sys
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "CompiledCondition",
+    "ConditionSyntaxError",
+    "compile_condition",
+    "compile_field_condition",
+    "enum_namespace",
+]
+
+Getter = Callable[[Any], Any]
+
+COMPARISONS: Dict[type, Callable[[Any, Any], bool]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+
+OPERATORS: Dict[str, type] = {
+    "==": ast.Eq,
+    "!=": ast.NotEq,
+    "<": ast.Lt,
+    "<=": ast.LtE,
+    ">": ast.Gt,
+    ">=": ast.GtE,
+    "is": ast.Is,
+    "is not": ast.IsNot,
+    "in": ast.In,
+    "not in": ast.NotIn,
+}
+
+
+class ConditionSyntaxError(ValueError):
+    """Raised when a condition uses syntax outside of the supported grammar"""
+
+
+class CompiledCondition:
+    """
+    Predicate compiled from a condition expression.
+
+    Calling it with an instance evaluates the expression against the instance's
+    attributes. Type errors raised by comparisons are logged and count as an
+    unmet condition.
+    """
+
+    __slots__ = ("source", "fields", "_evaluate")
+
+    def __init__(self, source: str, fields: Set[str], evaluate: Getter):
+        self.source = source
+        self.fields = frozenset(fields)
+        self._evaluate = evaluate
+
+    def __call__(self, instance: Any) -> bool:
+        try:
+            return bool(self._evaluate(instance))
+        except TypeError as e:
+            logger.error(f"Condition '{self.source}' failed for {instance!r}: {e}")
+            return False
+
+    def __repr__(self) -> str:
+        return f"CompiledCondition({self.source!r})"
+
+
+def enum_namespace(module_name: str) -> Dict[str, type]:
+    """Enum classes visible in a module, used to resolve references like `Status.ACTIVE`"""
+    module = sys.modules.get(module_name)
+    if module is None:
+        return {}
+    return {
+        name: value
+        for name, value in vars(module).items()
+        if isinstance(value, type) and issubclass(value, Enum)
+    }
+
+
+class _Compiler:
+    def __init__(self, source: str, fields: Optional[Iterable[str]], namespace: Mapping[str, Any]):
+        self.source = source
+        self.allowed_fields = set(fields) if fields is not None else None
+        self.namespace = namespace
+        self.fields: Set[str] = set()
+
+    def error(self, message: str) -> ConditionSyntaxError:
+        return ConditionSyntaxError(f"{message} in condition '{self.source}'")
+
+    def compile(self, node: ast.AST) -> Getter:
+        if isinstance(node, ast.BoolOp):
+            operands = [self.compile(value) for value in node.values]
+            if isinstance(node.op, ast.And):
+                return lambda obj: all(operand(obj) for operand in operands)
+            return lambda obj: any(operand(obj) for operand in operands)
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            operand = self.compile(node.operand)
+            return lambda obj: not operand(obj)
+
+        if isinstance(node, ast.Compare):
+            return self.compile_compare(node)
+
+        if isinstance(node, ast.Name):
+            return self.compile_field(node.id)
+
+        if isinstance(node, ast.Attribute):
+            value = self.resolve_reference(node)
+            return lambda obj: value
+
+        if isinstance(node, (ast.Constant, ast.Tuple, ast.List, ast.Set)):
+            value = self.literal(node)
+            return lambda obj: value
+
+        raise self.error(f"Unsupported syntax '{ast.unparse(node)}'")
+
+    def compile_compare(self, node: ast.Compare) -> Getter:
+        getters = [self.compile(node.left), *(self.compile(value) for value in node.comparators)]
+        comparisons = []
+        for op in node.ops:
+            if type(op) not in COMPARISONS:
+                raise self.error(f"Unsupported operator '{op.__class__.__name__}'")
+            comparisons.append(COMPARISONS[type(op)])
+
+        if len(comparisons) == 1:
+            left, right = getters
+            compare = comparisons[0]
+            return lambda obj: compare(left(obj), right(obj))
+
+        def evaluate(obj: Any) -> bool:
+            values = [getter(obj) for getter in getters]
+            return all(
+                compare(values[index], values[index + 1])
+                for index, compare in enumerate(comparisons)
+            )
+
+        return evaluate
+
+    def compile_field(self, name: str) -> Getter:
+        if self.allowed_fields is not None and name not in self.allowed_fields:
+            raise self.error(f"Unknown field '{name}'")
+        self.fields.add(name)
+        return operator.attrgetter(name)
+
+    def resolve_reference(self, node: ast.Attribute) -> Any:
+        if not isinstance(node.value, ast.Name) or node.value.id not in self.namespace:
+            raise self.error(f"Unknown reference '{ast.unparse(node)}'")
+        container = self.namespace[node.value.id]
+        if node.attr.startswith("_") or not hasattr(container, node.attr):
+            raise self.error(f"Unknown reference '{ast.unparse(node)}'")
+        return getattr(container, node.attr)
+
+    def literal(self, node: ast.AST) -> Any:
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Attribute):
+            return self.resolve_reference(node)
+        if isinstance(node, (ast.Tuple, ast.List, ast.Set)):
+            return frozenset(self.literal(element) for element in node.elts)
+        raise self.error(f"Unsupported literal '{ast.unparse(node)}'")
+
+
+def compile_condition(
+    expression: str,
+    fields: Optional[Iterable[str]] = None,
+    namespace: Optional[Mapping[str, Any]] = None,
+) -> CompiledCondition:
+    """
+    Compile a condition expression into a predicate.
+
+    The grammar is a safe subset of Python expressions: field names, literals,
+    `None`/`True`/`False`, references to enum members like `TransactionType.PURCHASE`,
+    tuples of literals, comparisons (`==`, `!=`, `<`, `<=`, `>`, `>=`, `is`,
+    `is not`, `in`, `not in`) and `and`/`or`/`not`. A bare field name checks
+    the field's truthiness.
+
+    Args:
+        expression: Condition source
+        fields: Field names the expression may reference, any if omitted
+        namespace: Names available for references, usually from `enum_namespace`
+
+    Raises:
+        ConditionSyntaxError: If the expression is invalid or uses unknown names
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ConditionSyntaxError(f"Invalid condition '{expression}': {e.msg}") from e
+
+    compiler = _Compiler(expression, fields, namespace or {})
+    evaluate = compiler.compile(tree.body)
+    return CompiledCondition(expression, compiler.fields, evaluate)
+
+
+def compile_field_condition(
+    field: str,
+    value: Any,
+    condition_operator: str,
+    fields: Optional[Iterable[str]] = None,
+) -> CompiledCondition:
+    """Compile the structured `field`, `value`, `operator` form of a condition"""
+    op = OPERATORS.get(condition_operator)
+    if op is None:
+        raise ConditionSyntaxError(f"Unknown condition operator: {condition_operator}")
+
+    source = f"{field} {condition_operator} {value!r}"
+    compiler = _Compiler(source, fields, {})
+    getter = compiler.compile_field(field)
+    compare = COMPARISONS[op]
+    return CompiledCondition(source, compiler.fields, lambda obj: compare(getter(obj), value))
@@ -0,0 +1,59 @@
+import logging
+from typing import Any, List, Type
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from uaproject_backend_schemas.webhooks.mixins.changes import WebhookChangesMixin, WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["capture_deleted_events", "pop_deleted_events", "delete_with_events"]
+
+DELETED_EVENTS_KEY = "webhook_deleted_events"
+
+
+def capture_deleted_events(
+    session: Session, flush_context: Any = None, instances: Any = None
+) -> None:
+    """
+    Snapshot on-delete scopes of instances marked for deletion.
+
+    Meant as a `before_flush` listener, e.g.
+    `event.listen(AsyncSession.sync_session_class, "before_flush", capture_deleted_events)`.
+    Events are collected in the session until `pop_deleted_events` is called.
+    """
+    captured = session.info.setdefault(DELETED_EVENTS_KEY, [])
+    for instance in session.deleted:
+        if isinstance(instance, WebhookChangesMixin):
+            captured.extend(instance.get_deleted_events())
+
+
+def pop_deleted_events(session: Session) -> List[WebhookEvent]:
+    """Return and clear the delete events captured in a session"""
+    return session.info.pop(DELETED_EVENTS_KEY, [])
+
+
+async def delete_with_events(
+    session: AsyncSession, model: Type[WebhookChangesMixin], *criteria: Any
+) -> List[WebhookEvent]:
+    """
+    Delete the rows of a model matching `criteria` with a single statement.
+
+    The deleted rows come back through `DELETE ... RETURNING` and their on-delete
+    scope events are built from them, so bulk deletes emit events without
+    loading any row. Related objects already in the session are used for
+    relationship data, other relationships are reported as key stubs.
+    """
+    result = await session.execute(
+        delete(model).where(*criteria).returning(*model.__table__.columns)
+    )
+    identity_map = session.sync_session.identity_map
+
+    events: List[WebhookEvent] = []
+    for row in result.mappings():
+        events.extend(model.build_deleted_events(dict(row), identity_map))
+
+    logger.debug(f"Deleted rows of {model.__name__} emitted {len(events)} webhook event(s)")
+    return events
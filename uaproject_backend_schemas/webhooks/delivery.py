@@ -0,0 +1,164 @@
+import hashlib
+import hmac
+import logging
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+import httpx
+
+from uaproject_backend_schemas.webhooks.encoding import CONTENT_TYPES, encode_payload
+from uaproject_backend_schemas.webhooks.metrics import get_metrics
+from uaproject_backend_schemas.webhooks.schemas import WebhookEncoding, WebhookStatus
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "SIGNATURE_HEADER",
+    "SCOPE_HEADER",
+    "EVENT_ID_HEADER",
+    "WebhookDeliveryJob",
+    "WebhookDeliveryError",
+    "WebhookDeliverer",
+    "sign_payload",
+]
+
+SIGNATURE_HEADER = "X-Webhook-Signature"
+SCOPE_HEADER = "X-Webhook-Scope"
+EVENT_ID_HEADER = "X-Webhook-Event-Id"
+
+
+class WebhookDeliveryJob(NamedTuple):
+    """Single event addressed to a single webhook subscription"""
+
+    webhook_id: int
+    endpoint: str
+    authorization: Optional[str]
+    scope: str
+    entity_id: int
+    event_id: int
+    payload: Dict[str, Any]
+    attempts: int = 0
+    encoding: WebhookEncoding = WebhookEncoding.JSON
+    body: Optional[bytes] = None
+
+
+class WebhookDeliveryError(Exception):
+    """Raised when a webhook endpoint did not accept an event"""
+
+    def __init__(
+        self,
+        message: str,
+        status: WebhookStatus = WebhookStatus.ERROR,
+        status_code: Optional[int] = None,
+        retryable: bool = True,
+        retry_after: Optional[float] = None,
+        webhook_id: Optional[int] = None,
+    ):
+        super().__init__(message)
+        self.status = status
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
+        self.webhook_id = webhook_id
+
+
+def sign_payload(secret: str, body: bytes) -> str:
+    """Compute the signature header value of a request body"""
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+class WebhookDeliverer:
+    """
+    HTTP delivery of webhook events.
+
+    The body is the envelope `{"event_id", "scope", "action", "payload"}` encoded
+    with the subscription's `encoding`; it is signed with the subscription's
+    `authorization` secret when one is set.
+
+    Args:
+        client: Shared `httpx.AsyncClient`, created with `timeout` if omitted
+        timeout: Request timeout in seconds for the default client
+    """
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None, timeout: float = 10.0):
+        self.client = client or httpx.AsyncClient(timeout=timeout)
+
+    @staticmethod
+    def build_body(job: WebhookDeliveryJob) -> bytes:
+        """Serialize the delivery envelope of a job, unless it carries a prebuilt body"""
+        if job.body is not None:
+            return job.body
+        return encode_payload(
+            {
+                "event_id": job.event_id,
+                "scope": job.scope,
+                "action": job.scope.rsplit(".", 1)[-1],
+                "payload": job.payload,
+            },
+            job.encoding,
+        )
+
+    @staticmethod
+    def build_headers(job: WebhookDeliveryJob, body: bytes) -> Dict[str, str]:
+        """Build request headers of a job, including the body signature"""
+        headers = {
+            "Content-Type": CONTENT_TYPES[job.encoding],
+            SCOPE_HEADER: job.scope,
+            EVENT_ID_HEADER: str(job.event_id),
+        }
+        if job.authorization:
+            headers[SIGNATURE_HEADER] = sign_payload(job.authorization, body)
+        return headers
+
+    async def deliver(self, job: WebhookDeliveryJob) -> None:
+        """Send a job to its endpoint, raising `WebhookDeliveryError` on failure"""
+        body = self.build_body(job)
+        metrics = get_metrics()
+        if not metrics.enabled:
+            return await self._send(job, body)
+
+        metrics.observe("webhook_delivery_bytes", len(body), scope=job.scope)
+        started = time.perf_counter()
+        try:
+            await self._send(job, body)
+        except WebhookDeliveryError as e:
+            metrics.increment("webhook_failed_total", scope=job.scope, status=e.status)
+            raise
+        else:
+            metrics.increment("webhook_delivered_total", scope=job.scope)
+        finally:
+            metrics.observe(
+                "webhook_delivery_seconds", time.perf_counter() - started, scope=job.scope
+            )
+
+    async def _send(self, job: WebhookDeliveryJob, body: bytes) -> None:
+        try:
+            response = await self.client.post(
+                job.endpoint, content=body, headers=self.build_headers(job, body)
+            )
+        except httpx.TimeoutException as e:
+            raise WebhookDeliveryError(
+                f"Timed out delivering to {job.endpoint}",
+                status=WebhookStatus.UNRESPONSIVE,
+                webhook_id=job.webhook_id,
+            ) from e
+        except httpx.TransportError as e:
+            raise WebhookDeliveryError(
+                f"Could not reach {job.endpoint}: {e}",
+                status=WebhookStatus.UNRESPONSIVE,
+                webhook_id=job.webhook_id,
+            ) from e
+
+        if response.is_success:
+            return
+
+        raise WebhookDeliveryError(
+            f"{job.endpoint} responded with {response.status_code}",
+            status_code=response.status_code,
+            retryable=response.status_code >= 500 or response.status_code in (408, 429),
+            webhook_id=job.webhook_id,
+        )
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,307 @@
+import asyncio
+import itertools
+import logging
+import zlib
+from collections import deque
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from uaproject_backend_schemas.webhooks.mixins.base import scope_priority
+from uaproject_backend_schemas.webhooks.schemas import WebhookPriority
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ShardedWebhookDispatcher", "WeightedFairQueue", "shard_for"]
+
+T = TypeVar("T")
+ShardKey = Union[int, str]
+
+
+def shard_for(key: ShardKey, shards: int) -> int:
+    """
+    Stable shard index of a key, identical in every process.
+
+    The last three digits of UA ids hold the replica and sequence numbers and the
+    rest is the creation millisecond, so both parts are mixed in; the outbox
+    drainer applies the same formula in SQL.
+    """
+    if isinstance(key, int):
+        return (key // 1000 + key) % shards
+    return zlib.crc32(key.encode()) % shards
+
+
+def entity_key(item: Any) -> ShardKey:
+    return item.entity_id
+
+
+def item_priority(item: Any) -> WebhookPriority:
+    return scope_priority(item.scope)
+
+
+DEFAULT_WEIGHTS: Dict[WebhookPriority, int] = {
+    WebhookPriority.HIGH: 8,
+    WebhookPriority.NORMAL: 3,
+    WebhookPriority.LOW: 1,
+}
+
+
+class WeightedFairQueue(Generic[T]):
+    """
+    Asyncio queue of per-key FIFOs, with keys served by smooth weighted round-robin.
+
+    Items of the same key are always returned in the order they were put, whatever
+    their priority. A key is scheduled in the class of the highest priority among
+    its queued items, so an item waiting behind lower priority items of its key
+    lifts them to its own priority instead of overtaking them. While several
+    classes have keys waiting, each class is served in proportion to its weight
+    and the classes are interleaved evenly, so `HIGH` keys wait for at most a few
+    lower priority items however deep their backlog is, while `LOW` keys still
+    make progress. Idle classes accumulate no credit, and keys of a class take
+    turns. Every item priority has its own capacity, so a full `LOW` backlog
+    never blocks `put` of higher priority items.
+
+    Args:
+        weights: Share of every priority class, `DEFAULT_WEIGHTS` by default
+        maxsize: Capacity of every priority, 0 for unbounded
+    """
+
+    def __init__(self, weights: Optional[Dict[WebhookPriority, int]] = None, maxsize: int = 0):
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        if any(weight < 1 for weight in self.weights.values()):
+            raise ValueError("Priority weights must be positive")
+
+        self.maxsize = maxsize
+        self._items: Dict[Hashable, Deque[Tuple[T, WebhookPriority]]] = {}
+        self._key_depths: Dict[Hashable, Dict[WebhookPriority, int]] = {}
+        # Class and ticket a key is scheduled with; older tickets in `_ready` are stale
+        self._scheduled: Dict[Hashable, Tuple[WebhookPriority, int]] = {}
+        self._ready: Dict[WebhookPriority, Deque[Tuple[Hashable, int]]] = {
+            priority: deque() for priority in WebhookPriority
+        }
+        self._ready_keys: Dict[WebhookPriority, int] = dict.fromkeys(WebhookPriority, 0)
+        self._depths: Dict[WebhookPriority, int] = dict.fromkeys(WebhookPriority, 0)
+        self._credit: Dict[WebhookPriority, int] = dict.fromkeys(WebhookPriority, 0)
+        self._tickets = itertools.count()
+        self._changed = asyncio.Condition()
+        self._unfinished = 0
+        self._finished = asyncio.Event()
+        self._finished.set()
+
+    def qsize(self) -> int:
+        """Number of queued items of all priorities"""
+        return sum(self._depths.values())
+
+    def depths(self) -> Dict[WebhookPriority, int]:
+        """Number of queued items per priority"""
+        return dict(self._depths)
+
+    async def put(
+        self,
+        item: T,
+        priority: WebhookPriority = WebhookPriority.NORMAL,
+        key: Optional[Hashable] = None,
+    ) -> None:
+        """Queue an item after the other items of its key, waiting while its priority is full"""
+        if key is None:
+            key = object()
+        async with self._changed:
+            while self.maxsize and self._depths[priority] >= self.maxsize:
+                await self._changed.wait()
+
+            self._items.setdefault(key, deque()).append((item, priority))
+            key_depths = self._key_depths.setdefault(key, dict.fromkeys(WebhookPriority, 0))
+            key_depths[priority] += 1
+            self._depths[priority] += 1
+            self._schedule(key)
+
+            self._unfinished += 1
+            self._finished.clear()
+            self._changed.notify_all()
+
+    async def get(self) -> T:
+        """Remove and return the next item, waiting while the queue is empty"""
+        async with self._changed:
+            while not self.qsize():
+                await self._changed.wait()
+
+            key = self._pop_ready(self._next_priority())
+            items = self._items[key]
+            item, priority = items.popleft()
+            self._key_depths[key][priority] -= 1
+            self._depths[priority] -= 1
+            if items:
+                self._schedule(key)
+            else:
+                del self._items[key], self._key_depths[key]
+
+            self._changed.notify_all()
+            return item
+
+    def _schedule(self, key: Hashable) -> None:
+        """Queue a key in the class of its highest priority item, unless already there"""
+        key_depths = self._key_depths[key]
+        priority = next(priority for priority in WebhookPriority if key_depths[priority])
+        scheduled = self._scheduled.get(key)
+        if scheduled is not None:
+            if scheduled[0] == priority:
+                return
+            self._ready_keys[scheduled[0]] -= 1
+
+        ticket = next(self._tickets)
+        self._scheduled[key] = (priority, ticket)
+        self._ready[priority].append((key, ticket))
+        self._ready_keys[priority] += 1
+
+    def _pop_ready(self, priority: WebhookPriority) -> Hashable:
+        ready = self._ready[priority]
+        while True:
+            key, ticket = ready.popleft()
+            if self._scheduled.get(key) == (priority, ticket):
+                del self._scheduled[key]
+                self._ready_keys[priority] -= 1
+                return key
+
+    def _next_priority(self) -> WebhookPriority:
+        total = 0
+        selected = None
+        for priority in WebhookPriority:
+            if not self._ready_keys[priority]:
+                self._credit[priority] = 0
+                continue
+            weight = self.weights[priority]
+            self._credit[priority] += weight
+            total += weight
+            if selected is None or self._credit[priority] > self._credit[selected]:
+                selected = priority
+        self._credit[selected] -= total
+        return selected
+
+    def task_done(self) -> None:
+        """Mark a previously fetched item as handled"""
+        if self._unfinished <= 0:
+            raise ValueError("task_done() called too many times")
+        self._unfinished -= 1
+        if not self._unfinished:
+            self._finished.set()
+
+    async def join(self) -> None:
+        """Wait until every queued item has been handled"""
+        await self._finished.wait()
+
+
+class ShardedWebhookDispatcher(Generic[T]):
+    """
+    Ordered fan-out of webhook items over a fixed number of shards.
+
+    Every item is routed by `key` to one of `shards` queues, each consumed by a
+    single worker, so items with the same key (entity id, or `user_id` for
+    per-player ordering) are handled strictly in submission order while
+    different keys are handled in parallel. Shard queues are
+    `WeightedFairQueue`s scheduling keys by the scope priority of their items,
+    so a flood of `LOW` events never delays `HIGH` ones such as punishments and
+    purchases; priorities only reorder different keys. Bounded queues apply
+    backpressure to `submit`.
+
+    Args:
+        handler: Coroutine handling a single item
+        shards: Number of shards (workers)
+        key: Function extracting the ordering key of an item, `entity_id` by default
+        maxsize: Capacity of every priority of every shard queue, 0 for unbounded
+        priority: Function extracting the priority of an item, the priority
+            registered for its `scope` by default
+        weights: Share of every priority class, see `WeightedFairQueue`
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[T], Awaitable[None]],
+        shards: int = 8,
+        key: Callable[[T], ShardKey] = entity_key,
+        maxsize: int = 1000,
+        priority: Callable[[T], WebhookPriority] = item_priority,
+        weights: Optional[Dict[WebhookPriority, int]] = None,
+    ):
+        if shards < 1:
+            raise ValueError("Dispatcher needs at least one shard")
+
+        self.handler = handler
+        self.shards = shards
+        self.key = key
+        self.priority = priority
+        self._queues: List[WeightedFairQueue[T]] = [
+            WeightedFairQueue(weights, maxsize) for _ in range(shards)
+        ]
+        self._processed = [0] * shards
+        self._failed = [0] * shards
+        self._workers: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start one worker task per shard"""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._work(index), name=f"webhook-shard-{index}")
+            for index in range(self.shards)
+        ]
+
+    async def submit(self, item: T) -> int:
+        """Queue an item on its shard, waiting while its priority class is full; returns the shard"""
+        key = self.key(item)
+        index = shard_for(key, self.shards)
+        await self._queues[index].put(item, self.priority(item), key)
+        return index
+
+    def queue_depths(self) -> List[int]:
+        """Number of queued items per shard"""
+        return [queue.qsize() for queue in self._queues]
+
+    def stats(self) -> List[Dict[str, int]]:
+        """Queue depth per priority and in total, and processed and failed counters per shard"""
+        return [
+            {
+                "depth": queue.qsize(),
+                **{f"depth_{priority}": depth for priority, depth in queue.depths().items()},
+                "processed": processed,
+                "failed": failed,
+            }
+            for queue, processed, failed in zip(self._queues, self._processed, self._failed)
+        ]
+
+    async def _work(self, index: int) -> None:
+        queue = self._queues[index]
+        while True:
+            item = await queue.get()
+            try:
+                await self.handler(item)
+                self._processed[index] += 1
+            except Exception as e:
+                self._failed[index] += 1
+                logger.exception(f"Error handling webhook item on shard {index}: {e}")
+            finally:
+                queue.task_done()
+
+    async def join(self) -> None:
+        """Wait until every queued item has been handled"""
+        await asyncio.gather(*(queue.join() for queue in self._queues))
+
+    async def stop(self, drain: bool = True, timeout: Optional[float] = None) -> None:
+        """Stop the workers, optionally after handling the queued items"""
+        if drain:
+            await asyncio.wait_for(self.join(), timeout=timeout)
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
@@ -0,0 +1,117 @@
+import uuid
+from datetime import UTC, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Sequence, Type, TypeVar
+
+from pydantic import BaseModel
+from pydantic_core import from_json, to_json, to_jsonable_python
+
+from uaproject_backend_schemas.webhooks.schemas import WebhookEncoding
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+__all__ = [
+    "CONTENT_TYPES",
+    "encode_payload",
+    "decode_payload",
+    "decode_payload_model",
+    "encode_entry",
+    "encode_map",
+]
+
+M = TypeVar("M", bound=BaseModel)
+
+CONTENT_TYPES: Dict[WebhookEncoding, str] = {
+    WebhookEncoding.JSON: "application/json",
+    WebhookEncoding.MSGPACK: "application/msgpack",
+}
+
+# MessagePack extension type codes; -1 is the standard timestamp extension
+DECIMAL_EXT = 1
+UUID_EXT = 2
+
+
+def _require_msgpack() -> None:
+    if msgpack is None:
+        raise RuntimeError("MessagePack encoding requires the 'msgpack' package")
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return msgpack.ExtType(DECIMAL_EXT, str(value).encode())
+    if isinstance(value, uuid.UUID):
+        return msgpack.ExtType(UUID_EXT, value.bytes)
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return to_jsonable_python(value)
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == DECIMAL_EXT:
+        return Decimal(data.decode())
+    if code == UUID_EXT:
+        return uuid.UUID(bytes=data)
+    return msgpack.ExtType(code, data)
+
+
+def encode_payload(body: Any, encoding: WebhookEncoding = WebhookEncoding.JSON) -> bytes:
+    """
+    Serialize a delivery body with the subscription's encoding.
+
+    MessagePack keeps 64-bit ints native instead of stringifying them, sends
+    datetimes as timestamp extensions and decimals and UUIDs as extension types.
+    """
+    if encoding == WebhookEncoding.MSGPACK:
+        _require_msgpack()
+        return msgpack.packb(body, default=_msgpack_default, datetime=True)
+    return to_json(body)
+
+
+def encode_entry(
+    key: str, encoded_value: bytes, encoding: WebhookEncoding = WebhookEncoding.JSON
+) -> bytes:
+    """Encode a single map entry from an already encoded value"""
+    if encoding == WebhookEncoding.MSGPACK:
+        _require_msgpack()
+        return msgpack.packb(key) + encoded_value
+    return to_json(key) + b":" + encoded_value
+
+
+def encode_map(entries: Sequence[bytes], encoding: WebhookEncoding = WebhookEncoding.JSON) -> bytes:
+    """
+    Join entries built by `encode_entry` into a map.
+
+    The result is byte for byte what `encode_payload` produces for the same map,
+    so shared parts of several bodies are serialized only once.
+    """
+    if encoding == WebhookEncoding.MSGPACK:
+        _require_msgpack()
+        return msgpack.Packer().pack_map_header(len(entries)) + b"".join(entries)
+    return b"{" + b",".join(entries) + b"}"
+
+
+def decode_payload(data: bytes, encoding: WebhookEncoding = WebhookEncoding.JSON) -> Any:
+    """Deserialize a body produced by `encode_payload`"""
+    if encoding == WebhookEncoding.MSGPACK:
+        _require_msgpack()
+        return msgpack.unpackb(data, ext_hook=_msgpack_ext_hook, timestamp=3)
+    return from_json(data)
+
+
+def decode_payload_model(
+    data: bytes, model: Type[M], encoding: WebhookEncoding = WebhookEncoding.JSON
+) -> M:
+    """Deserialize a body and validate it into a typed payload model"""
+    if encoding == WebhookEncoding.JSON:
+        return model.model_validate_json(data)
+    return model.model_validate(decode_payload(data, encoding))
@@ -0,0 +1,478 @@
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from uaproject_backend_schemas.webhooks.clock import Clock, as_aware, current_time
+from uaproject_backend_schemas.webhooks.mixins.base import WebhookScopeFields
+from uaproject_backend_schemas.webhooks.mixins.changes import WebhookChangesMixin, WebhookEvent
+from uaproject_backend_schemas.webhooks.mixins.config import TemporalFieldConfig
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["TemporalExpiration", "TemporalExpirationScheduler", "TemporalExpirationSweeper"]
+
+SessionFactory = Callable[[], AsyncSession]
+Track = Tuple[Type[WebhookChangesMixin], TemporalFieldConfig]
+
+
+class TemporalExpiration(NamedTuple):
+    """Due expiration of a temporal field of a single row"""
+
+    model: Type[WebhookChangesMixin]
+    config: TemporalFieldConfig
+    entity_id: int
+    expires_at: datetime
+
+
+def _timestamp(value: datetime) -> float:
+    return as_aware(value).timestamp()
+
+
+def _is_pending_status(config: TemporalFieldConfig, status: Any) -> bool:
+    """Check whether a row with the given status can still expire"""
+    if config.active_value is not None:
+        return status == config.active_value
+    return status != config.status_value
+
+
+def _pending_status_filter(config: TemporalFieldConfig, status: Any) -> Any:
+    """SQL counterpart of `_is_pending_status`"""
+    if config.active_value is not None:
+        return status == config.active_value
+    return or_(status.is_(None), status != config.status_value)
+
+
+def _temporal_tracks(model: Type[WebhookChangesMixin]) -> List[Track]:
+    """Distinct temporal field configurations registered on a model"""
+    tracks: Dict[Tuple[str, str], Track] = {}
+    for scope_config in model.get_webhook_scopes().values():
+        for config in scope_config.temporal_fields or ():
+            tracks.setdefault((config.expires_at_field, config.scope_name), (model, config))
+    return list(tracks.values())
+
+
+class TemporalExpirationScheduler:
+    """
+    Timer-driven expiration of temporal fields.
+
+    Every `TemporalFieldConfig` registered on the given models becomes a track.
+    Upcoming `expires_at` values of each track are kept in a single min-heap, and
+    `run` sleeps until the earliest one is due instead of polling the tables.
+
+    Only expirations within `horizon` of the current time are held in memory;
+    `refill` loads them with an indexed range query on the `expires_at` column,
+    so memory stays bounded by the number of rows expiring within one horizon no
+    matter how many expirations are pending in total. Every refill queries the
+    whole window, so rows written by other processes are picked up by the next
+    refill even when they expire inside the already loaded part of it. Rows
+    changed by this process are (re)scheduled at once with `track_instance`.
+
+    Args:
+        models: Models with registered temporal scopes
+        horizon: How far ahead expirations are loaded into memory
+        clock: Returns the current tz-aware time, the configured webhook clock by default
+    """
+
+    def __init__(
+        self,
+        models: Iterable[Type[WebhookChangesMixin]],
+        horizon: timedelta = timedelta(hours=1),
+        clock: Clock = current_time,
+    ):
+        self.horizon = horizon
+        self.clock = clock
+        self.loaded_until: Optional[datetime] = None
+        self.refilled_at: Optional[datetime] = None
+
+        self._tracks: List[Track] = []
+        self._track_indexes: Dict[Type[WebhookChangesMixin], List[int]] = {}
+        self._heap: List[Tuple[float, int, int]] = []
+        self._due: Dict[Tuple[int, int], float] = {}
+        # Fired expirations of tracks without a status field, whose rows keep matching
+        self._fired: Dict[Tuple[int, int], float] = {}
+        self._wakeup = asyncio.Event()
+        self._stopped = False
+
+        for model in models:
+            self.register_model(model)
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def register_model(self, model: Type[WebhookChangesMixin]) -> None:
+        """Add a track for every temporal field configuration of a model"""
+        for track in _temporal_tracks(model):
+            self._track_indexes.setdefault(model, []).append(len(self._tracks))
+            self._tracks.append(track)
+
+    def schedule(self, track: int, entity_id: int, expires_at: Optional[datetime]) -> None:
+        """Schedule, move or cancel the expiration of a row on a track"""
+        key = (track, entity_id)
+        if expires_at is None:
+            self._due.pop(key, None)
+            return
+
+        due = _timestamp(expires_at)
+        if self.loaded_until is not None and due > _timestamp(self.loaded_until):
+            # Picked up by the refill that loads its slice of the horizon
+            self._due.pop(key, None)
+            return
+
+        if self._due.get(key) == due:
+            return
+
+        # Superseded heap entries are skipped lazily in pop_due
+        self._due[key] = due
+        heapq.heappush(self._heap, (due, track, entity_id))
+        self._wakeup.set()
+
+    def track_instance(self, instance: WebhookChangesMixin) -> None:
+        """(Re)schedule the expirations of a changed row"""
+        for track in self._track_indexes.get(instance.__class__, ()):
+            config = self._tracks[track][1]
+            expires_at = getattr(instance, config.expires_at_field, None)
+
+            if config.status_field and not _is_pending_status(
+                config, getattr(instance, config.status_field)
+            ):
+                expires_at = None
+            self.schedule(track, instance.id, expires_at)
+
+    def cancel(self, instance: WebhookChangesMixin) -> None:
+        """Drop all scheduled expirations of a row, e.g. after it was deleted"""
+        for track in self._track_indexes.get(instance.__class__, ()):
+            self._due.pop((track, instance.id), None)
+
+    def _pending_filter(self, track: int, until: datetime) -> Any:
+        model, config = self._tracks[track]
+        expires_at = getattr(model, config.expires_at_field)
+        criteria = [expires_at.is_not(None), expires_at <= until]
+
+        if config.status_field:
+            criteria.append(_pending_status_filter(config, getattr(model, config.status_field)))
+        elif self.refilled_at is not None:
+            # Without a status, expired rows keep matching; older ones were loaded before
+            criteria.append(expires_at > self.refilled_at)
+        return and_(*criteria)
+
+    async def refill(self, session: AsyncSession, page_size: int = 10_000) -> int:
+        """Load expirations up to one horizon ahead; returns the number of newly loaded rows"""
+        now = self.clock()
+        until = now + self.horizon
+        loaded = 0
+
+        for track, (model, config) in enumerate(self._tracks):
+            stmt = (
+                select(model.id, getattr(model, config.expires_at_field))
+                .where(self._pending_filter(track, until))
+                .execution_options(yield_per=page_size)
+            )
+            result = await session.stream(stmt)
+            async for rows in result.partitions():
+                for entity_id, expires_at in rows:
+                    key = (track, entity_id)
+                    due = _timestamp(expires_at)
+                    if self._due.get(key) == due or self._fired.get(key) == due:
+                        continue
+                    self._due[key] = due
+                    self._heap.append((due, track, entity_id))
+                    loaded += 1
+
+        heapq.heapify(self._heap)
+        # The next refill only loads status-less rows expiring after this one started
+        now_ts = _timestamp(now)
+        self._fired = {key: due for key, due in self._fired.items() if due > now_ts}
+        self.refilled_at = now
+        self.loaded_until = until
+        self._wakeup.set()
+        return loaded
+
+    def pop_due(self, now: Optional[datetime] = None) -> List[TemporalExpiration]:
+        """Remove and return all expirations that are due"""
+        now_ts = _timestamp(now or self.clock())
+        due: List[TemporalExpiration] = []
+
+        while self._heap and self._heap[0][0] <= now_ts:
+            timestamp, track, entity_id = heapq.heappop(self._heap)
+            if self._due.get((track, entity_id)) != timestamp:
+                continue
+
+            del self._due[(track, entity_id)]
+            model, config = self._tracks[track]
+            if config.status_field is None:
+                self._fired[(track, entity_id)] = timestamp
+            due.append(
+                TemporalExpiration(
+                    model, config, entity_id, datetime.fromtimestamp(timestamp, timezone.utc)
+                )
+            )
+        return due
+
+    def next_due_in(self) -> Optional[float]:
+        """Seconds until the next expiration, None when nothing is scheduled"""
+        while self._heap and self._due.get(self._heap[0][1:]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        return max(self._heap[0][0] - _timestamp(self.clock()), 0.0)
+
+    async def expire(
+        self, session: AsyncSession, expirations: List[TemporalExpiration]
+    ) -> List[WebhookEvent]:
+        """
+        Apply due expirations to their rows and build the configured scope events.
+
+        Rows are loaded with one query per track and skipped when they were
+        already moved to the configured status in the meantime; rows whose
+        expiration was extended are scheduled again with their new deadline. The
+        status change is left uncommitted in `session`.
+        """
+        now = self.clock()
+        events: List[WebhookEvent] = []
+        grouped: Dict[Tuple[Any, str], List[TemporalExpiration]] = {}
+        for expiration in expirations:
+            key = (expiration.model, expiration.config.scope_name)
+            grouped.setdefault(key, []).append(expiration)
+
+        for track_expirations in grouped.values():
+            model, config = track_expirations[0].model, track_expirations[0].config
+            track = self._track_of(model, config)
+            ids = {expiration.entity_id for expiration in track_expirations}
+            result = await session.execute(select(model).where(model.id.in_(ids)))
+
+            for instance in result.scalars():
+                status = getattr(instance, config.status_field) if config.status_field else None
+                if config.status_field and not _is_pending_status(config, status):
+                    continue
+
+                expires_at = getattr(instance, config.expires_at_field)
+                if expires_at is None:
+                    continue
+                if _timestamp(expires_at) > _timestamp(now):
+                    self.schedule(track, instance.id, expires_at)
+                    continue
+
+                changes: Dict[str, Any] = {
+                    config.expires_at_field: {"before": expires_at, "after": None},
+                    "_untracked": {},
+                    "_unchanged": {},
+                }
+                if config.status_field:
+                    changes[config.status_field] = {
+                        "before": status,
+                        "after": config.status_value,
+                    }
+                    setattr(instance, config.status_field, config.status_value)
+
+                events.append(WebhookEvent(config.scope_name, instance.id, changes))
+
+        return events
+
+    def _track_of(self, model: Type[WebhookChangesMixin], config: TemporalFieldConfig) -> int:
+        return next(
+            track for track in self._track_indexes[model] if self._tracks[track][1] is config
+        )
+
+    def stop(self) -> None:
+        """Stop `run` after the current iteration"""
+        self._stopped = True
+        self._wakeup.set()
+
+    async def run(
+        self,
+        session_factory: SessionFactory,
+        on_expired: Callable[[AsyncSession, List[WebhookEvent]], Awaitable[None]],
+    ) -> None:
+        """
+        Expire rows as they become due until `stop` is called.
+
+        `on_expired` receives the session holding the uncommitted status changes
+        together with the built events, so it can enqueue them (e.g. with
+        `enqueue_webhook_events`) in the same transaction; the session is committed
+        afterwards.
+        """
+        self._stopped = False
+
+        while not self._stopped:
+            now = self.clock()
+            try:
+                if self.loaded_until is None or now + self.horizon / 2 >= self.loaded_until:
+                    async with session_factory() as session:
+                        await self.refill(session)
+
+                if due := self.pop_due(now):
+                    async with session_factory() as session:
+                        events = await self.expire(session, due)
+                        if events:
+                            await on_expired(session, events)
+                        await session.commit()
+            except Exception as e:
+                logger.exception(f"Error processing temporal expirations: {e}")
+
+            timeout = self.next_due_in()
+            if self.loaded_until is not None:
+                refill_at = self.loaded_until - self.horizon / 2
+                refill_in = max((refill_at - self.clock()).total_seconds(), 0.0)
+                timeout = refill_in if timeout is None else min(timeout, refill_in)
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+
+class TemporalExpirationSweeper:
+    """
+    Set-based expiration of temporal fields.
+
+    Each batch is a single `UPDATE ... SET status = status_value WHERE id IN
+    (pending expired rows FOR UPDATE SKIP LOCKED) RETURNING ...` statement, and
+    the webhook events of the configured `scope_name` and of every other scope
+    triggered by the status field are built from the returned rows, without
+    loading or flushing ORM instances. Only temporal fields with a
+    `status_field` can be swept.
+
+    Args:
+        models: Models with registered temporal scopes
+        batch_size: Maximum number of rows expired per statement
+        clock: Returns the current tz-aware time, the configured webhook clock by default
+    """
+
+    def __init__(
+        self,
+        models: Iterable[Type[WebhookChangesMixin]],
+        batch_size: int = 1000,
+        clock: Clock = current_time,
+    ):
+        self.batch_size = batch_size
+        self.clock = clock
+        self._tracks: List[Tuple[Track, List[str], Dict[str, WebhookScopeFields]]] = []
+
+        for model in models:
+            for track in _temporal_tracks(model):
+                if track[1].status_field is None:
+                    logger.warning(
+                        f"Temporal field '{track[1].expires_at_field}' of {model.__name__} "
+                        "has no status field and cannot be swept"
+                    )
+                    continue
+                self._tracks.append((track, *self._resolve_fields(*track)))
+
+    @staticmethod
+    def _resolve_fields(
+        model: Type[WebhookChangesMixin], config: TemporalFieldConfig
+    ) -> Tuple[List[str], Dict[str, WebhookScopeFields]]:
+        """Scopes fired by a sweep of a track and the columns their events need"""
+        columns = set(model.__table__.columns.keys())
+        scopes = {
+            scope_name: scope_config
+            for scope_name, scope_config in model.get_webhook_scopes().items()
+            if scope_name == config.scope_name or config.status_field in scope_config.trigger_fields
+        }
+
+        fields = {"id", config.expires_at_field, config.status_field}
+        for scope_config in scopes.values():
+            fields |= set(scope_config.fields) & columns if scope_config.fields else columns
+        return sorted(fields), scopes
+
+    async def sweep_batch(
+        self,
+        session: AsyncSession,
+        track: Track,
+        fields: List[str],
+        scopes: Dict[str, WebhookScopeFields],
+        now: datetime,
+    ) -> Tuple[int, List[WebhookEvent]]:
+        """Expire one batch of a track; returns the number of expired rows and their events"""
+        model, config = track
+        table = model.__table__
+        expires_at = table.c[config.expires_at_field]
+        status = table.c[config.status_field]
+
+        expired = (
+            select(table.c.id, status.label("previous_status"))
+            .where(
+                expires_at.is_not(None),
+                expires_at <= now,
+                _pending_status_filter(config, status),
+            )
+            .order_by(expires_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .subquery("expired")
+        )
+        stmt = (
+            update(table)
+            .where(table.c.id == expired.c.id)
+            .values({config.status_field: config.status_value})
+            .returning(expired.c.previous_status, *(table.c[field] for field in fields))
+        )
+        rows = (await session.execute(stmt)).all()
+
+        events: List[WebhookEvent] = []
+        for row in rows:
+            values = dict(zip(fields, row[1:]))
+            status_change = {"before": row[0], "after": values[config.status_field]}
+
+            for scope_name, scope_config in scopes.items():
+                changes: Dict[str, Any] = {config.status_field: status_change}
+                if scope_name == config.scope_name:
+                    changes[config.expires_at_field] = {
+                        "before": values[config.expires_at_field],
+                        "after": None,
+                    }
+                changes["_untracked"] = {}
+                changes["_unchanged"] = {
+                    field: values[field]
+                    for field in scope_config.fields or fields
+                    if field in values and field not in changes
+                }
+                events.append(WebhookEvent(scope_name, values["id"], changes))
+
+        return len(rows), events
+
+    async def sweep(
+        self,
+        session_factory: SessionFactory,
+        on_expired: Optional[Callable[[AsyncSession, List[WebhookEvent]], Awaitable[None]]] = None,
+    ) -> int:
+        """
+        Expire every row that is due, batch by batch; returns the number of expired rows.
+
+        Every batch runs in its own transaction. `on_expired` receives the session
+        and the events of a batch before it is committed, so they can be written
+        to the outbox atomically with the status change.
+        """
+        now = self.clock()
+        total = 0
+
+        for track, fields, scopes in self._tracks:
+            while True:
+                async with session_factory() as session:
+                    expired, events = await self.sweep_batch(session, track, fields, scopes, now)
+                    if events and on_expired is not None:
+                        await on_expired(session, events)
+                    await session.commit()
+
+                total += expired
+                if expired < self.batch_size:
+                    break
+
+        return total
@@ -0,0 +1,225 @@
+import bisect
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+__all__ = [
+    "MetricsSink",
+    "NoOpMetricsSink",
+    "InMemoryMetricsSink",
+    "PrometheusMetricsSink",
+    "get_metrics",
+    "set_metrics",
+]
+
+Labels = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class MetricsSink(ABC):
+    """
+    Destination of webhook pipeline metrics.
+
+    Instrumented code checks `enabled` before measuring anything, so a disabled
+    sink costs one attribute lookup per hook.
+    """
+
+    enabled = True
+
+    @abstractmethod
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """Add `value` to a counter"""
+
+    @abstractmethod
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record a value in a histogram"""
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """Observe the duration of a block in seconds"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+
+class NoOpMetricsSink(MetricsSink):
+    """Sink discarding every metric, used by default"""
+
+    enabled = False
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        pass
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        pass
+
+
+class _Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class InMemoryMetricsSink(MetricsSink):
+    """
+    Sink keeping counters and histograms in memory.
+
+    Histograms whose name ends with `_bytes` use size buckets, all others use
+    latency buckets in seconds.
+    """
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        size_buckets: Sequence[float] = SIZE_BUCKETS,
+    ):
+        self.buckets = tuple(buckets)
+        self.size_buckets = tuple(size_buckets)
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.histograms: Dict[str, Dict[Labels, _Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                bounds = self.size_buckets if name.endswith("_bytes") else self.buckets
+                histogram = series[key] = _Histogram(bounds)
+            histogram.observe(value)
+
+    def counter(self, name: str, **labels: str) -> float:
+        """Current value of a counter series"""
+        return self.counters.get(name, {}).get(tuple(sorted(labels.items())), 0)
+
+    def summary(self, name: str, **labels: str) -> Dict[str, float]:
+        """Count, sum and mean of a histogram series"""
+        histogram = self.histograms.get(name, {}).get(tuple(sorted(labels.items())))
+        if histogram is None:
+            return {"count": 0, "sum": 0.0, "mean": 0.0}
+        return {
+            "count": histogram.count,
+            "sum": histogram.sum,
+            "mean": histogram.sum / histogram.count if histogram.count else 0.0,
+        }
+
+    def top(self, name: str, label: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Label values with the highest totals of a counter or histogram sum, e.g. hot scopes"""
+        totals: Dict[str, float] = {}
+        for key, value in self.counters.get(name, {}).items():
+            label_value = dict(key).get(label, "")
+            totals[label_value] = totals.get(label_value, 0) + value
+        for key, histogram in self.histograms.get(name, {}).items():
+            label_value = dict(key).get(label, "")
+            totals[label_value] = totals.get(label_value, 0) + histogram.sum
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in pairs) + "}"
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class PrometheusMetricsSink(InMemoryMetricsSink):
+    """In-memory sink that renders its metrics in the Prometheus text exposition format"""
+
+    def __init__(self, prefix: str = "", **kwargs):
+        super().__init__(**kwargs)
+        self.prefix = prefix
+
+    def render(self) -> str:
+        """Render all series, e.g. as the body of a `/metrics` endpoint"""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                metric = f"{self.prefix}{name}"
+                lines.append(f"# TYPE {metric} counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{metric}{_format_labels(labels)} {_format_number(value)}")
+
+            for name, series in sorted(self.histograms.items()):
+                metric = f"{self.prefix}{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for labels, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.bounds, histogram.counts):
+                        cumulative += count
+                        bucket_labels = _format_labels(labels, (("le", _format_number(bound)),))
+                        lines.append(f"{metric}_bucket{bucket_labels} {cumulative}")
+                    inf_labels = _format_labels(labels, (("le", "+Inf"),))
+                    lines.append(f"{metric}_bucket{inf_labels} {histogram.count}")
+                    lines.append(
+                        f"{metric}_sum{_format_labels(labels)} {_format_number(histogram.sum)}"
+                    )
+                    lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+_metrics: MetricsSink = NoOpMetricsSink()
+
+
+def get_metrics() -> MetricsSink:
+    """Sink receiving webhook pipeline metrics"""
+    return _metrics
+
+
+def set_metrics(sink: MetricsSink) -> None:
+    """Replace the sink receiving webhook pipeline metrics"""
+    global _metrics
+    _metrics = sink
@@ -1,8 +1,19 @@
 from uaproject_backend_schemas.webhooks.mixins.actions import WebhookActionsMixin
-from uaproject_backend_schemas.webhooks.mixins.base import WebhookBaseMixin, WebhookScopeFields
+from uaproject_backend_schemas.webhooks.mixins.base import (
+    WebhookBaseMixin,
+    WebhookScopeFields,
+    WebhookScopeIndex,
+    scope_priority,
+)
 from uaproject_backend_schemas.webhooks.mixins.changes import WebhookChangesMixin
+from uaproject_backend_schemas.webhooks.mixins.executor import (
+    ActionBatcher,
+    ActionExecutor,
+    ActionResult,
+)
 from uaproject_backend_schemas.webhooks.mixins.relationships import WebhookRelationshipsMixin
 from uaproject_backend_schemas.webhooks.mixins.temporal import WebhookTemporalMixin
+from uaproject_backend_schemas.webhooks.mixins.tracking import flag_json_mutations
 
 __all__ = [
     "WebhookActionsMixin",
@@ -11,4 +22,10 @@ __all__ = [
     "WebhookRelationshipsMixin",
     "WebhookTemporalMixin",
     "WebhookScopeFields",
+    "WebhookScopeIndex",
+    "ActionBatcher",
+    "ActionExecutor",
+    "ActionResult",
+    "flag_json_mutations",
+    "scope_priority",
 ]
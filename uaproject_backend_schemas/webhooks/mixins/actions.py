@@ -1,8 +1,16 @@
 import logging
-from typing import Any, Dict, List
+import time
+from typing import Dict, List
 
+from uaproject_backend_schemas.webhooks.conditions import compile_condition, enum_namespace
+from uaproject_backend_schemas.webhooks.metrics import get_metrics
 from uaproject_backend_schemas.webhooks.mixins.base import WebhookBaseMixin
 from uaproject_backend_schemas.webhooks.mixins.config import ActionConfigModel
+from uaproject_backend_schemas.webhooks.mixins.executor import (
+    ActionExecutor,
+    ActionResult,
+    validate_action_graph,
+)
 from uaproject_backend_schemas.webhooks.types import ActionConfig, ActionHandler
 
 logger = logging.getLogger(__name__)
@@ -13,73 +21,94 @@ __all__ = ["WebhookActionsMixin"]
 class WebhookActionsMixin(WebhookBaseMixin):
     """Mixin for handling webhook actions"""
 
-    _action_handlers: Dict[str, ActionHandler] = {}
+    _action_executor = ActionExecutor()
 
     @classmethod
     def register_action_handler(cls, action_type: str, handler: ActionHandler) -> None:
         """
-        Register a handler for a specific action type
+        Register a handler for a specific action type of this model
+
+        The handler is bound to the actions of already registered scopes right
+        away and to actions of scopes registered later at registration time.
 
         Args:
             action_type: The type of action to handle
-            handler: A function that takes (instance, action_config) as parameters
+            handler: A function that takes (instance, action_config) as parameters, or
+                (key, total, instances, action_config) for batched actions
         """
-        cls._action_handlers[action_type] = handler
+        cls._action_handlers = {**cls._get_action_handlers(), action_type: handler}
+        for scope_config in cls.get_webhook_scopes().values():
+            for action in scope_config.actions or ():
+                if action.type == action_type:
+                    action._handler = handler
 
     @classmethod
-    def _process_actions(cls, actions: List[ActionConfig]) -> List[ActionConfigModel]:
-        """Process and validate action configurations"""
-        return [ActionConfigModel(**action) for action in actions]
+    def _get_action_handlers(cls) -> Dict[str, ActionHandler]:
+        """Handlers registered on this model itself, never inherited from another model"""
+        return cls.__dict__.get("_action_handlers", {})
 
-    async def execute_actions(self, scope_name: str) -> None:
-        """Execute actions for the specified scope"""
-        scopes = self.__class__.get_webhook_scopes()
-        scope_config = scopes.get(scope_name)
+    @classmethod
+    def verify_action_handlers(cls) -> None:
+        """
+        Check that every action of every registered scope has a bound handler
 
-        if not scope_config or not scope_config.actions:
-            return
-
-        for action in scope_config.actions:
-            if action.condition and not self._evaluate_condition(
-                getattr(self, action.condition), True, "=="
-            ):
-                continue
-
-            handler = self._action_handlers.get(action.type)
-            if handler:
-                try:
-                    await handler(self, action.model_dump())
-                except Exception as e:
-                    logger.error(f"Error executing action {action.type}: {e}", exc_info=True)
-            else:
-                logger.warning(f"No handler registered for action type: {action.type}")
-
-    def _evaluate_condition(
-        self, field_value: Any, condition_value: Any, condition_operator: str
-    ) -> bool:
-        """Evaluate the condition based on the operator"""
-        operators = {
-            "==": lambda a, b: a == b,
-            "!=": lambda a, b: a != b,
-            ">": lambda a, b: a > b,
-            "<": lambda a, b: a < b,
-            ">=": lambda a, b: a >= b,
-            "<=": lambda a, b: a <= b,
-            "is": lambda a, b: a is b,
-            "is not": lambda a, b: a is not b,
+        Raises:
+            ValueError: If handlers are missing, listing their action types
+        """
+        missing = {
+            action.type
+            for scope_config in cls.get_webhook_scopes().values()
+            for action in scope_config.actions or ()
+            if action._handler is None
         }
+        if missing:
+            raise ValueError(f"Missing action handlers for {cls.__name__}: {sorted(missing)}")
 
-        try:
-            operator_func = operators.get(condition_operator)
-            if not operator_func:
-                logger.warning(f"Unknown condition operator: {condition_operator}")
-                return False
+    @classmethod
+    def _process_actions(cls, actions: List[ActionConfig]) -> List[ActionConfigModel]:
+        """Process and validate action configurations, compiling their conditions"""
+        action_configs = [ActionConfigModel(**action) for action in actions]
+        model_fields = set(cls.__table__.columns.keys())
+
+        for action in action_configs:
+            if action.batch:
+                batch_fields = {action.batch_key, action.amount} - {None}
+                if invalid := batch_fields - model_fields:
+                    raise ValueError(f"Invalid batch fields for {cls.__name__}: {invalid}")
+
+        cls._bind_actions(action_configs)
+        validate_action_graph(action_configs)
+        return action_configs
 
-            return operator_func(field_value, condition_value)
+    @classmethod
+    def _bind_actions(cls, action_configs: List[ActionConfigModel]) -> None:
+        """Bind registered handlers to action configurations and compile their conditions"""
+        model_fields = cls.__table__.columns.keys()
+        namespace = enum_namespace(cls.__module__)
+        handlers = cls._get_action_handlers()
+
+        for action in action_configs:
+            action._handler = handlers.get(action.type)
+            if action.condition:
+                action._predicate = compile_condition(action.condition, model_fields, namespace)
+
+    async def execute_actions(self, scope_name: str) -> List[ActionResult]:
+        """Execute actions for the specified scope, running independent actions concurrently"""
+        scopes = self.__class__.get_webhook_scopes()
+        scope_config = scopes.get(scope_name)
 
-        except TypeError as e:
-            logger.error(
-                f"Condition check failed for field with value '{field_value}' "
-                f"and condition value '{condition_value}': {e}"
+        if not scope_config or not scope_config.actions:
+            return []
+
+        metrics = get_metrics()
+        if not metrics.enabled:
+            return await self._action_executor.run(self, scope_config.actions)
+
+        started = time.perf_counter()
+        results = await self._action_executor.run(self, scope_config.actions)
+        metrics.observe("webhook_actions_seconds", time.perf_counter() - started, scope=scope_name)
+        for result in results:
+            metrics.increment(
+                "webhook_actions_total", scope=scope_name, action=result.name, status=result.status
             )
-            return False
+        return results
@@ -1,4 +1,4 @@
-from typing import Dict, Optional, Set
+from typing import Dict, FrozenSet, NamedTuple, Optional, Set, Tuple
 
 from pydantic import BaseModel
 
@@ -7,9 +7,22 @@ from uaproject_backend_schemas.webhooks.mixins.config import (
     RelationshipConfigModel,
     TemporalFieldConfig,
 )
-from uaproject_backend_schemas.webhooks.schemas import WebhookStage
+from uaproject_backend_schemas.webhooks.mixins.tracking import json_fields
+from uaproject_backend_schemas.webhooks.schemas import (
+    WebhookPayloadFormat,
+    WebhookPriority,
+    WebhookStage,
+)
+
+__all__ = ["WebhookScopeFields", "WebhookScopeIndex", "WebhookBaseMixin", "scope_priority"]
+
+# Priority of every registered scope, shared by all models for the delivery path
+_scope_priorities: Dict[str, WebhookPriority] = {}
+
 
-__all__ = ["WebhookScopeFields", "WebhookBaseMixin"]
+def scope_priority(scope_name: str) -> WebhookPriority:
+    """Delivery priority of a registered scope, `NORMAL` for unknown scopes"""
+    return _scope_priorities.get(scope_name, WebhookPriority.NORMAL)
 
 
 class WebhookScopeFields(BaseModel):
@@ -21,6 +34,29 @@ class WebhookScopeFields(BaseModel):
     relationships: Optional[Dict[str, RelationshipConfigModel]] = None
     temporal_fields: Optional[list[TemporalFieldConfig]] = None
     actions: Optional[list[ActionConfigModel]] = None
+    on_delete: bool = False
+    payload_format: WebhookPayloadFormat = WebhookPayloadFormat.FULL
+    priority: WebhookPriority = WebhookPriority.NORMAL
+
+
+class WebhookScopeIndex(NamedTuple):
+    """
+    Lookup tables compiled from the registered scopes of a model.
+
+    Attributes:
+        change_scopes: Scopes triggered by field changes, in registration order
+        delete_scopes: Scopes triggered by row deletes
+        trigger_index: Scopes triggered by each field
+        always_evaluated: Scopes evaluated on every change check, since their
+            changes are not visible in the attribute history (temporal and JSON fields)
+        payload_fields: Column fields included in the payload of each scope
+    """
+
+    change_scopes: Tuple[str, ...]
+    delete_scopes: Tuple[str, ...]
+    trigger_index: Dict[str, Tuple[str, ...]]
+    always_evaluated: FrozenSet[str]
+    payload_fields: Dict[str, Tuple[str, ...]]
 
 
 class WebhookBaseMixin:
@@ -35,6 +71,54 @@ class WebhookBaseMixin:
             cls._webhook_scopes_registry = {}
         return cls._webhook_scopes_registry
 
+    @classmethod
+    def get_scope_index(cls) -> WebhookScopeIndex:
+        """Get the compiled lookup tables of the registered scopes, compiling them if needed"""
+        index = cls.__dict__.get("_webhook_scope_index")
+        if index is None:
+            index = cls._webhook_scope_index = cls._compile_scope_index()
+        return index
+
+    @classmethod
+    def _compile_scope_index(cls) -> WebhookScopeIndex:
+        scopes = cls.get_webhook_scopes()
+        relationship_names = set(cls.__mapper__.relationships.keys())
+        column_fields = tuple(
+            field for field in cls.__table__.columns.keys() if field not in relationship_names
+        )
+        model_json_fields = set(json_fields(cls))
+
+        trigger_index: Dict[str, list[str]] = {}
+        always_evaluated = set()
+        payload_fields: Dict[str, Tuple[str, ...]] = {}
+
+        for scope_name, scope_config in scopes.items():
+            payload_fields[scope_name] = (
+                tuple(field for field in scope_config.fields if field not in relationship_names)
+                if scope_config.fields is not None
+                else column_fields
+            )
+            if scope_config.on_delete:
+                continue
+            for field in scope_config.trigger_fields:
+                trigger_index.setdefault(field, []).append(scope_name)
+            if scope_config.temporal_fields or model_json_fields & set(scope_config.trigger_fields):
+                always_evaluated.add(scope_name)
+
+        return WebhookScopeIndex(
+            change_scopes=tuple(name for name, config in scopes.items() if not config.on_delete),
+            delete_scopes=tuple(name for name, config in scopes.items() if config.on_delete),
+            trigger_index={field: tuple(names) for field, names in trigger_index.items()},
+            always_evaluated=frozenset(always_evaluated),
+            payload_fields=payload_fields,
+        )
+
+    @classmethod
+    def _require_mixin(cls, hook: str, mixin_name: str, feature: str) -> None:
+        """Check that the class provides a mixin's hook, inherited directly or not"""
+        if not hasattr(cls, hook):
+            raise TypeError(f"Class {cls.__name__} must inherit from {mixin_name} to use {feature}")
+
     @classmethod
     def register_scope(
         cls,
@@ -45,6 +129,9 @@ class WebhookBaseMixin:
         stage: WebhookStage = WebhookStage.AFTER,
         temporal_fields: Optional[list[TemporalFieldConfig]] | None = None,
         actions: Optional[list[ActionConfigModel]] = None,
+        on_delete: bool = False,
+        payload_format: WebhookPayloadFormat = WebhookPayloadFormat.FULL,
+        priority: WebhookPriority = WebhookPriority.NORMAL,
     ) -> None:
         """
         Register a new scope for the model with specified
@@ -59,6 +146,11 @@ class WebhookBaseMixin:
             stage: WebhookStage indicating when the webhook should be triggered
             temporal_fields: Optional list of temporal field configurations
             actions: Optional list of action configurations
+            on_delete: Trigger the scope when a row is deleted instead of on field changes
+            payload_format: `DIFF` sends unchanged fields once and before/after values
+                only for changed fields in `WebhookStage.BOTH` scopes
+            priority: Delivery priority class; `HIGH` scopes are scheduled ahead of
+                floods of lower priority events
         """
 
         scope_name = f"{cls.__scope_prefix__}.{scope_name}"
@@ -73,33 +165,22 @@ class WebhookBaseMixin:
         cls._validate_trigger_fields(trigger_fields_set)
         cls._validate_payload_fields(fields_set, relationships)
 
-        if not any(base.__name__ == "WebhookChangesMixin" for base in cls.__bases__):
-            raise TypeError(
-                f"Class {cls.__name__} must inherit from WebhookChangesMixin to use webhooks"
-            )
+        cls._require_mixin("get_changes", "WebhookChangesMixin", "webhooks")
 
         if relationships:
-            if not any(base.__name__ == "WebhookRelationshipsMixin" for base in cls.__bases__):
-                raise TypeError(
-                    f"Class {cls.__name__} must inherit from WebhookRelationshipsMixin to use relationships"
-                )
-
+            cls._require_mixin(
+                "_process_relationships", "WebhookRelationshipsMixin", "relationships"
+            )
             relationships = cls._process_relationships(relationships)
 
         if temporal_fields:
-            if not any(base.__name__ == "WebhookTemporalMixin" for base in cls.__bases__):
-                raise TypeError(
-                    f"Class {cls.__name__} must inherit from WebhookTemporalMixin to use temporal fields"
-                )
-
+            cls._require_mixin(
+                "_process_temporal_fields", "WebhookTemporalMixin", "temporal fields"
+            )
             temporal_fields = cls._process_temporal_fields(temporal_fields)
 
         if actions:
-            if not any(base.__name__ == "WebhookActionsMixin" for base in cls.__bases__):
-                raise TypeError(
-                    f"Class {cls.__name__} must inherit from WebhookActionsMixin to use actions"
-                )
-
+            cls._require_mixin("_process_actions", "WebhookActionsMixin", "actions")
             actions = cls._process_actions(actions)
 
         scopes[scope_name] = WebhookScopeFields(
@@ -109,4 +190,12 @@ class WebhookBaseMixin:
             stage=stage,
             temporal_fields=temporal_fields,
             actions=actions,
+            on_delete=on_delete,
+            payload_format=payload_format,
+            priority=priority,
         )
+        _scope_priorities[scope_name] = scopes[scope_name].priority
+        cls._webhook_scope_index = None
+
+        if track_json_fields := getattr(cls, "_track_json_fields", None):
+            track_json_fields()
@@ -1,19 +1,52 @@
 import logging
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Literal, NamedTuple, Optional, Set, TypedDict, TypeVar, Union
+from types import SimpleNamespace
+from typing import (
+    Any,
+    Collection,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Set,
+    TypedDict,
+    TypeVar,
+    Union,
+)
 
 from pydantic import BaseModel
+from pydantic_core import to_json
 from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapper
+from sqlalchemy.orm.identity import IdentityMap
+from sqlalchemy.orm.util import identity_key
 
+from uaproject_backend_schemas.webhooks.clock import as_aware, get_clock
+from uaproject_backend_schemas.webhooks.metrics import get_metrics
 from uaproject_backend_schemas.webhooks.mixins.base import WebhookBaseMixin, WebhookScopeFields
+from uaproject_backend_schemas.webhooks.mixins.config import RelationshipConfigModel
+from uaproject_backend_schemas.webhooks.mixins.relationships import WebhookRelationshipsMixin
 from uaproject_backend_schemas.webhooks.mixins.temporal import WebhookTemporalMixin
-from uaproject_backend_schemas.webhooks.schemas import WebhookStage
+from uaproject_backend_schemas.webhooks.mixins.tracking import (
+    json_field_change,
+    json_fields,
+    track_json_fields,
+)
+from uaproject_backend_schemas.webhooks.schemas import WebhookPayloadFormat, WebhookStage
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["FieldChange", "ChangeSet", "TriggeredScopeData", "WebhookChangesMixin"]
+__all__ = [
+    "FieldChange",
+    "ChangeSet",
+    "TriggeredScopeData",
+    "WebhookEvent",
+    "WebhookChangesMixin",
+]
 
 T = TypeVar("T")
 
@@ -40,9 +73,22 @@ class TriggeredScopeData(TypedDict):
     _unchanged: Dict[str, Any]
 
 
+class WebhookEvent(NamedTuple):
+    """Single triggered scope of a single entity, ready to be queued for delivery"""
+
+    scope: str
+    entity_id: int
+    changes: Dict[str, Any]
+
+
 class WebhookChangesMixin(WebhookTemporalMixin, WebhookBaseMixin):
     """Mixin for handling field changes"""
 
+    @classmethod
+    def _track_json_fields(cls) -> None:
+        """Snapshot JSON fields at load so in-place mutations trigger scopes"""
+        track_json_fields(cls)
+
     @classmethod
     def _process_fields(cls, fields: Union[List[str], BaseModel, None]) -> Optional[Set[str]]:
         """Process and return fields as a set."""
@@ -74,7 +120,7 @@ class WebhookChangesMixin(WebhookTemporalMixin, WebhookBaseMixin):
             if invalid_fields := fields_to_check - model_fields:
                 raise ValueError(f"Invalid payload fields for {cls.__name__}: {invalid_fields}")
 
-    def get_changes(self, scope_name: str) -> ChangeSet:
+    def get_changes(self, scope_name: str, now: Optional[datetime] = None) -> ChangeSet:
         """Check if the webhook should be triggered for the specified scope and return changed fields with their states"""
         scopes = self.__class__.get_webhook_scopes()
         scope_config = scopes.get(scope_name)
@@ -88,8 +134,9 @@ class WebhookChangesMixin(WebhookTemporalMixin, WebhookBaseMixin):
         untracked_fields: Dict[str, FieldChange] = {}
 
         if scope_config.temporal_fields:
+            now = as_aware(now) if now else get_clock()()
             self._get_temporal_field_changes(
-                scope_config.temporal_fields, inspector, changed_fields
+                scope_config.temporal_fields, inspector, changed_fields, now
             )
 
         self._get_regular_field_changes(
@@ -108,6 +155,7 @@ class WebhookChangesMixin(WebhookTemporalMixin, WebhookBaseMixin):
     ) -> None:
         """Process regular (non-temporal) fields and categorize changes"""
         model_relationships = set(self.__mapper__.relationships.keys())
+        model_json_fields = json_fields(type(self))
 
         fields_to_check = scope_config.fields or [
             field for field in self.__table__.columns.keys() if field not in model_relationships
@@ -122,13 +170,18 @@ class WebhookChangesMixin(WebhookTemporalMixin, WebhookBaseMixin):
                 continue
 
             history = getattr(inspector.attrs, field).history
+            change: Optional[FieldChange] = None
 
-            if history.has_changes():
-                change: FieldChange = {
+            if field in model_json_fields:
+                # Snapshots catch in-place mutations and keep the value they replaced
+                change = json_field_change(self, field)
+            if change is None and history.has_changes():
+                change = {
                     "before": history.deleted[0] if history.deleted else None,
                     "after": history.added[0] if history.added else getattr(self, field),
                 }
 
+            if change is not None:
                 if field in scope_config.trigger_fields and field not in changed_fields:
                     changed_fields[field] = change
                 elif field not in scope_config.trigger_fields:
@@ -136,52 +189,217 @@ class WebhookChangesMixin(WebhookTemporalMixin, WebhookBaseMixin):
             else:
                 unchanged_fields[field] = getattr(self, field)
 
-    def get_triggered_scopes(self) -> Dict[str, Dict[str, Any]]:
-        """Get all scopes that should be triggered based on field changes and their states"""
+    def get_triggered_scopes(self, now: Optional[datetime] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get all scopes that should be triggered based on field changes and their states.
+
+        Args:
+            now: Time every temporal check of this evaluation is made against, read once
+                from the configured clock if omitted; naive values are treated as UTC
+        """
         scopes = self.__class__.get_webhook_scopes()
+        index = self.__class__.get_scope_index()
         triggered_scopes: Dict[str, Dict[str, Any]] = {}
-
-        for scope_name, scope_config in scopes.items():
-            change_set = self.get_changes(scope_name)
+        now = as_aware(now) if now else get_clock()()
+        metrics = get_metrics()
+
+        candidates: Optional[Set[str]] = None
+        state = inspect(self)
+        if state.persistent:
+            # Attribute history of persistent rows only holds fields recorded in committed_state
+            candidates = set(index.always_evaluated)
+            for field in state.committed_state:
+                candidates.update(index.trigger_index.get(field, ()))
+
+        for scope_name in index.change_scopes:
+            if candidates is not None and scope_name not in candidates:
+                continue
+            if metrics.enabled:
+                started = time.perf_counter()
+                change_set = self.get_changes(scope_name, now)
+                metrics.observe(
+                    "webhook_changes_seconds", time.perf_counter() - started, scope=scope_name
+                )
+                metrics.increment("webhook_scope_evaluated_total", scope=scope_name)
+                if change_set.changed:
+                    metrics.increment("webhook_scope_triggered_total", scope=scope_name)
+            else:
+                change_set = self.get_changes(scope_name, now)
             if change_set.changed:
                 triggered_scopes[scope_name] = {
                     **change_set.changed,
                     "_untracked": change_set.untracked,
                     "_unchanged": change_set.unchanged,
                 }
-        self._check_temporal_expirations(scopes, triggered_scopes)
+        self._check_temporal_expirations(scopes, triggered_scopes, now)
 
         return triggered_scopes
 
+    def get_triggered_events(self, now: Optional[datetime] = None) -> List[WebhookEvent]:
+        """Get triggered scopes of this instance wrapped as webhook events"""
+        return [
+            WebhookEvent(scope_name, self.id, changes)
+            for scope_name, changes in self.get_triggered_scopes(now).items()
+        ]
+
+    def get_deleted_events(self) -> List[WebhookEvent]:
+        """
+        Snapshot the on-delete scopes of this instance from its loaded state.
+
+        Fields come from the instance state and relationships from loaded objects
+        or the session's identity map, falling back to a stub holding the foreign
+        key. Primary keys are taken from the instance identity. Expired columns,
+        e.g. after a commit, are loaded with a single refresh; when that is not
+        possible (no session or no greenlet) they are left out of the payload
+        instead of being reported as None.
+        """
+        state = inspect(self)
+        columns = {attr.key for attr in state.mapper.column_attrs}
+        unloaded = state.unloaded & columns
+        if unloaded and state.session is not None and state.key is not None:
+            try:
+                state.session.refresh(self, attribute_names=sorted(unloaded))
+            except Exception as e:
+                logger.warning(
+                    f"Could not load expired fields {sorted(unloaded)} of deleted "
+                    f"{self.__class__.__name__} {state.identity}: {e}"
+                )
+            unloaded = state.unloaded & columns
+
+        values = dict(state.dict)
+        if state.identity is not None:
+            for column, value in zip(state.mapper.primary_key, state.identity):
+                values[state.mapper.get_property_by_column(column).key] = value
+
+        identity_map = state.session.identity_map if state.session is not None else None
+        return self.__class__.build_deleted_events(values, identity_map, unloaded)
+
+    @classmethod
+    def build_deleted_events(
+        cls,
+        values: Dict[str, Any],
+        identity_map: Optional[IdentityMap] = None,
+        unloaded: Collection[str] = (),
+    ) -> List[WebhookEvent]:
+        """
+        Build the on-delete scope events of a deleted row from its column values.
+
+        Every payload field and relationship is reported as changed from its
+        last value to None.
+
+        Args:
+            values: Column values of the deleted row, e.g. a `DELETE ... RETURNING` row
+            identity_map: Identity map used to resolve relationship objects without loading them
+            unloaded: Fields whose last value is unknown, left out of the changes
+        """
+        events = []
+        scopes = cls.get_webhook_scopes()
+        index = cls.get_scope_index()
+        for scope_name in index.delete_scopes:
+            scope_config = scopes[scope_name]
+            changes: Dict[str, Any] = {
+                field: {"before": values.get(field), "after": None}
+                for field in index.payload_fields[scope_name]
+                if field not in unloaded
+            }
+
+            for rel_name, rel_config in (scope_config.relationships or {}).items():
+                predicate = rel_config._predicate
+                if predicate is not None and (
+                    not predicate.fields <= values.keys()
+                    or not predicate(SimpleNamespace(**values))
+                ):
+                    continue
+                changes[rel_name] = {
+                    "before": cls._relationship_snapshot(
+                        rel_name, rel_config, values, identity_map
+                    ),
+                    "after": None,
+                }
+
+            events.append(WebhookEvent(scope_name, values.get("id"), changes))
+        return events
+
+    @classmethod
+    def _relationship_snapshot(
+        cls,
+        rel_name: str,
+        rel_config: RelationshipConfigModel,
+        values: Dict[str, Any],
+        identity_map: Optional[IdentityMap],
+    ) -> Optional[Dict[str, Any]]:
+        """Relationship data of a deleted row, or a stub with its key if the object is not loaded"""
+        related = values.get(rel_name)
+        relationship = cls.__mapper__.relationships[rel_name]
+        stub = {
+            remote.key: values.get(local.key) for local, remote in relationship.local_remote_pairs
+        }
+
+        if related is None and identity_map is not None and len(stub) == 1:
+            ((remote_key, remote_value),) = stub.items()
+            if remote_value is not None and relationship.mapper.primary_key[0].key == remote_key:
+                related = identity_map.get(identity_key(relationship.mapper.class_, remote_value))
+
+        if related is None:
+            return stub if any(value is not None for value in stub.values()) else None
+        return WebhookRelationshipsMixin._extract_relationship_data(related, rel_config)
+
     async def get_payload_for_scope(
         self,
         session: AsyncSession,
         scope_name: str,
         scope_changes: Dict[str, Dict[Literal["before", "after"], Any]],
+        fields: Optional[Iterable[str]] = None,
     ) -> Dict[str, Any]:
         """
         Get payload for the specified scope according to its stage configuration.
+
+        Args:
+            session: Session used to load missing relationships
+            scope_name: Full scope name
+            scope_changes: Changes of the scope, as returned by `get_triggered_scopes`
+            fields: Only build these payload fields and relationships, e.g. the union of
+                the subscribers' field projections; all configured fields if None
         """
+        metrics = get_metrics()
+        if not metrics.enabled:
+            return await self._build_scope_payload(session, scope_name, scope_changes, fields)
+
+        started = time.perf_counter()
+        payload = await self._build_scope_payload(session, scope_name, scope_changes, fields)
+        metrics.observe("webhook_payload_seconds", time.perf_counter() - started, scope=scope_name)
+        metrics.observe(
+            "webhook_payload_bytes", len(to_json(payload, serialize_unknown=True)), scope=scope_name
+        )
+        return payload
+
+    async def _build_scope_payload(
+        self,
+        session: AsyncSession,
+        scope_name: str,
+        scope_changes: Dict[str, Dict[Literal["before", "after"], Any]],
+        fields: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
         scopes = self.__class__.get_webhook_scopes()
         if scope_name not in scopes:
             raise ValueError(f"Unknown scope: {scope_name}")
 
         scope_config = scopes[scope_name]
         relationships_to_load = scope_config.relationships or {}
-        model_fields = set(self.__table__.columns.keys())
-        relationship_names = set(self.__mapper__.relationships.keys())
-        fields_to_include = (
-            set(scope_config.fields)
-            if scope_config.fields is not None
-            else model_fields - relationship_names
-        )
+        fields_to_include = self.__class__.get_scope_index().payload_fields[scope_name]
+        if fields is not None:
+            requested = set(fields)
+            fields_to_include = tuple(field for field in fields_to_include if field in requested)
+            relationships_to_load = {
+                rel_name: rel_config
+                for rel_name, rel_config in relationships_to_load.items()
+                if rel_name in requested
+            }
 
         async def build_payload(state: Literal["before", "after"]) -> dict:
             payload = {}
             changes = scope_changes or {}
             for field in fields_to_include:
-                if field in relationship_names:
-                    continue
                 if field in changes and state in changes[field]:
                     payload[field] = changes[field][state]
                 else:
@@ -191,6 +409,13 @@ class WebhookChangesMixin(WebhookTemporalMixin, WebhookBaseMixin):
             return payload
 
         if scope_config.stage == WebhookStage.BOTH:
+            if scope_config.payload_format == WebhookPayloadFormat.DIFF:
+                return await self._build_diff_payload(
+                    session,
+                    scope_changes or {},
+                    fields_to_include,
+                    relationships_to_load,
+                )
             return {
                 "before": await build_payload("before"),
                 "after": await build_payload("after"),
@@ -198,11 +423,45 @@ class WebhookChangesMixin(WebhookTemporalMixin, WebhookBaseMixin):
         state = "before" if scope_config.stage == WebhookStage.BEFORE else "after"
         return await build_payload(state)
 
+    async def _build_diff_payload(
+        self,
+        session: AsyncSession,
+        scope_changes: Dict[str, Any],
+        fields_to_include: Iterable[str],
+        relationships: Dict[str, RelationshipConfigModel],
+    ) -> Dict[str, Any]:
+        """Build a payload holding unchanged fields once and before/after values of changed ones"""
+        changed = {
+            **scope_changes.get("_untracked", {}),
+            **{
+                field: change
+                for field, change in scope_changes.items()
+                if not field.startswith("_")
+            },
+        }
+
+        unchanged: Dict[str, Any] = {}
+        changes: Dict[str, Dict[str, Any]] = {}
+        for field in fields_to_include:
+            if field in changed:
+                changes[field] = {
+                    "before": changed[field].get("before"),
+                    "after": changed[field].get("after"),
+                }
+            else:
+                unchanged[field] = getattr(self, field)
+
+        if relationships:
+            await self._add_relationship_data(session, unchanged, relationships)
+        return {"unchanged": unchanged, "changes": changes}
+
     def _check_temporal_expirations(
-        self, scopes: Dict[str, WebhookScopeFields], triggered_scopes: Dict[str, Dict[str, Any]]
+        self,
+        scopes: Dict[str, WebhookScopeFields],
+        triggered_scopes: Dict[str, Dict[str, Any]],
+        now: datetime,
     ) -> None:
-        """Check for temporal fields that have expired and add to triggered scopes"""
-        now = datetime.now()
+        """Check for temporal fields that have expired as of `now` and add to triggered scopes"""
 
         for scope_name, scope_config in scopes.items():
             if not scope_config.temporal_fields or scope_name in triggered_scopes:
@@ -216,7 +475,7 @@ class WebhookChangesMixin(WebhookTemporalMixin, WebhookBaseMixin):
 
                 expires_at = getattr(self, temp_config.expires_at_field)
                 is_expired = expires_at is None or (
-                    isinstance(expires_at, datetime) and expires_at <= now
+                    isinstance(expires_at, datetime) and as_aware(expires_at) <= now
                 )
 
                 if is_expired:
@@ -1,6 +1,8 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr, model_validator
+
+from uaproject_backend_schemas.webhooks.conditions import CompiledCondition
 
 __all__ = ["ActionConfigModel", "RelationshipConfigModel", "TemporalFieldConfig"]
 
@@ -9,10 +11,34 @@ class ActionConfigModel(BaseModel):
     """Configuration for webhook actions"""
 
     type: str
+    name: Optional[str] = None
+    depends_on: List[str] = []
+    timeout: Optional[float] = None
     condition: Optional[str] = None
     fields: Optional[Dict[str, Any]] = None
     user_id: Optional[str] = None
     amount: Optional[str] = None
+    batch: bool = False
+    batch_key: Optional[str] = None
+    batch_window: float = 0.0
+
+    _predicate: Optional[CompiledCondition] = PrivateAttr(default=None)
+    _handler: Optional[Callable[..., Any]] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def set_defaults(self) -> "ActionConfigModel":
+        """Name actions after their type and group batches by `user_id` unless set explicitly"""
+        if self.name is None:
+            self.name = self.type
+        if self.batch:
+            self.batch_key = self.batch_key or self.user_id
+            if self.batch_key is None:
+                raise ValueError(f"Batched action '{self.name}' needs a batch_key or user_id")
+        return self
+
+    def is_met(self, instance: Any) -> bool:
+        """Check the compiled condition against an instance"""
+        return self._predicate is None or self._predicate(instance)
 
 
 class RelationshipConfigModel(BaseModel):
@@ -23,6 +49,12 @@ class RelationshipConfigModel(BaseModel):
     condition_value: Optional[Any] = None
     condition_operator: str = "=="
 
+    _predicate: Optional[CompiledCondition] = PrivateAttr(default=None)
+
+    def is_met(self, instance: Any) -> bool:
+        """Check the compiled condition against an instance"""
+        return self._predicate is None or self._predicate(instance)
+
 
 class TemporalFieldConfig(BaseModel):
     """Configuration for fields with temporal state"""
@@ -30,4 +62,5 @@ class TemporalFieldConfig(BaseModel):
     expires_at_field: str
     status_field: Optional[str] = None
     status_value: Optional[Any] = None
+    active_value: Optional[Any] = None
     scope_name: str
@@ -0,0 +1,254 @@
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from uaproject_backend_schemas.webhooks.mixins.config import ActionConfigModel
+from uaproject_backend_schemas.webhooks.schemas import WebhookActionStatus
+from uaproject_backend_schemas.webhooks.types import ActionHandler, BatchActionHandler
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ActionResult", "ActionBatcher", "ActionExecutor", "validate_action_graph"]
+
+
+class ActionResult(NamedTuple):
+    """Outcome and duration of a single executed action"""
+
+    name: str
+    type: str
+    status: WebhookActionStatus
+    duration: float
+    error: Optional[str] = None
+
+
+def validate_action_graph(actions: List[ActionConfigModel]) -> None:
+    """
+    Validate action names and dependencies of a scope.
+
+    Raises:
+        ValueError: If names are duplicated, a dependency is unknown or dependencies form a cycle
+    """
+    names = [action.name for action in actions]
+    if duplicates := {name for name in names if names.count(name) > 1}:
+        raise ValueError(f"Duplicate action names: {duplicates}")
+
+    dependencies = {action.name: action.depends_on for action in actions}
+    for name, depends_on in dependencies.items():
+        if unknown := set(depends_on) - dependencies.keys():
+            raise ValueError(f"Action '{name}' depends on unknown actions: {unknown}")
+
+    visited: Dict[str, bool] = {}
+
+    def visit(name: str) -> None:
+        if visited.get(name) is False:
+            raise ValueError(f"Circular action dependency involving '{name}'")
+        if name in visited:
+            return
+        visited[name] = False
+        for dependency in dependencies[name]:
+            visit(dependency)
+        visited[name] = True
+
+    for name in dependencies:
+        visit(name)
+
+
+class _PendingActionBatch:
+    __slots__ = ("action", "handler", "groups")
+
+    def __init__(self, action: ActionConfigModel, handler: BatchActionHandler):
+        self.action = action
+        self.handler = handler
+        self.groups: Dict[Any, List[Tuple[Any, asyncio.Future]]] = {}
+
+
+class ActionBatcher:
+    """
+    Aggregates batched actions raised close together.
+
+    Actions configured with `batch` are not handed to their handler one instance
+    at a time. Instances are grouped per model and action by the `batch_key`
+    field (`user_id` by default) until the current event loop iteration ends,
+    or for `batch_window` seconds, and the handler is then called once per key
+    with `(key, total, instances, action_config)`, where `total` is the sum of
+    the `amount` field of the grouped instances. Every caller waits for the call
+    covering its instance and sees its outcome.
+    """
+
+    def __init__(self):
+        self._pending: Dict[Tuple[type, str], _PendingActionBatch] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def add(
+        self, instance: Any, action: ActionConfigModel, handler: BatchActionHandler
+    ) -> asyncio.Future:
+        """Add an instance to the open batch of its action and return the future of its call"""
+        loop = asyncio.get_running_loop()
+        batch_id = (type(instance), action.name)
+        batch = self._pending.get(batch_id)
+
+        if batch is None:
+            batch = self._pending[batch_id] = _PendingActionBatch(action, handler)
+            if action.batch_window > 0:
+                loop.call_later(action.batch_window, self._flush, batch_id)
+            else:
+                loop.call_soon(self._flush, batch_id)
+
+        future = loop.create_future()
+        key = getattr(instance, action.batch_key)
+        batch.groups.setdefault(key, []).append((instance, future))
+        return future
+
+    def _flush(self, batch_id: Tuple[type, str]) -> None:
+        batch = self._pending.pop(batch_id, None)
+        if batch is None:
+            return
+        for key, entries in batch.groups.items():
+            task = asyncio.create_task(self._call(batch, key, entries))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    async def _call(
+        batch: _PendingActionBatch, key: Any, entries: List[Tuple[Any, asyncio.Future]]
+    ) -> None:
+        action = batch.action
+        instances = [instance for instance, _ in entries]
+        total = (
+            sum(getattr(instance, action.amount) or 0 for instance in instances)
+            if action.amount
+            else None
+        )
+
+        try:
+            if inspect.iscoroutinefunction(batch.handler):
+                await batch.handler(key, total, instances, action.model_dump())
+            else:
+                result = await asyncio.to_thread(
+                    batch.handler, key, total, instances, action.model_dump()
+                )
+                if inspect.isawaitable(result):
+                    await result
+        except Exception as e:
+            for _, future in entries:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for _, future in entries:
+            if not future.done():
+                future.set_result(None)
+
+
+class ActionExecutor:
+    """
+    Runs the actions of a scope as a dependency graph.
+
+    Every action starts as soon as the actions it `depends_on` have finished, so
+    independent actions run concurrently and a scope settles in the time of its
+    slowest dependency chain. Actions whose condition is not met are skipped
+    and count as finished; actions depending on a failed or timed out action
+    are skipped. Sync handlers run in a thread. Handlers running concurrently
+    must not share an `AsyncSession`. Batched actions go through `batcher`.
+
+    Args:
+        concurrency: Maximum number of actions running at the same time
+        clock: Clock returning seconds, used for action durations
+        batcher: Aggregator of batched actions shared by all runs
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 10,
+        clock: Callable[[], float] = time.perf_counter,
+        batcher: Optional[ActionBatcher] = None,
+    ):
+        self.concurrency = concurrency
+        self.clock = clock
+        self.batcher = batcher or ActionBatcher()
+
+    async def run(
+        self,
+        instance: Any,
+        actions: List[ActionConfigModel],
+    ) -> List[ActionResult]:
+        """Execute actions for an instance with their bound handlers, returning results in order"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_action(action: ActionConfigModel) -> ActionResult:
+            for dependency in action.depends_on:
+                result = await tasks[dependency]
+                if result.status not in (
+                    WebhookActionStatus.SUCCEEDED,
+                    WebhookActionStatus.SKIPPED,
+                ):
+                    return ActionResult(
+                        action.name,
+                        action.type,
+                        WebhookActionStatus.SKIPPED,
+                        0.0,
+                        f"Dependency '{dependency}' {result.status}",
+                    )
+
+            if not action.is_met(instance):
+                return ActionResult(action.name, action.type, WebhookActionStatus.SKIPPED, 0.0)
+
+            handler = action._handler
+            if handler is None:
+                logger.error(
+                    f"No handler bound for action '{action.name}' ({action.type}) "
+                    f"of {instance.__class__.__name__}"
+                )
+                return ActionResult(
+                    action.name, action.type, WebhookActionStatus.FAILED, 0.0, "No handler bound"
+                )
+
+            async with semaphore:
+                return await self._execute(instance, action, handler)
+
+        for action in actions:
+            tasks[action.name] = asyncio.create_task(run_action(action))
+
+        return list(await asyncio.gather(*tasks.values()))
+
+    async def _execute(
+        self, instance: Any, action: ActionConfigModel, handler: ActionHandler
+    ) -> ActionResult:
+        started = self.clock()
+        try:
+            if action.batch:
+                call = asyncio.shield(self.batcher.add(instance, action, handler))
+            else:
+                call = self._call(handler, instance, action)
+            await asyncio.wait_for(call, timeout=action.timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Action {action.name} timed out after {action.timeout}s")
+            return ActionResult(
+                action.name,
+                action.type,
+                WebhookActionStatus.TIMED_OUT,
+                self.clock() - started,
+                "Timed out",
+            )
+        except Exception as e:
+            logger.error(f"Error executing action {action.type}: {e}", exc_info=True)
+            return ActionResult(
+                action.name, action.type, WebhookActionStatus.FAILED, self.clock() - started, str(e)
+            )
+
+        return ActionResult(
+            action.name, action.type, WebhookActionStatus.SUCCEEDED, self.clock() - started
+        )
+
+    @staticmethod
+    async def _call(handler: ActionHandler, instance: Any, action: ActionConfigModel) -> None:
+        if inspect.iscoroutinefunction(handler):
+            await handler(instance, action.model_dump())
+            return
+
+        result = await asyncio.to_thread(handler, instance, action.model_dump())
+        if inspect.isawaitable(result):
+            await result
@@ -1,8 +1,17 @@
 import logging
+import time
 from typing import Any, Dict, Optional
 
 from pydantic import BaseModel
-
+from sqlalchemy import inspect
+from sqlalchemy.orm import MANYTOONE, InstanceState
+
+from uaproject_backend_schemas.webhooks.conditions import (
+    compile_condition,
+    compile_field_condition,
+    enum_namespace,
+)
+from uaproject_backend_schemas.webhooks.metrics import get_metrics
 from uaproject_backend_schemas.webhooks.mixins.base import WebhookBaseMixin
 from uaproject_backend_schemas.webhooks.mixins.config import RelationshipConfigModel
 from uaproject_backend_schemas.webhooks.types import FieldChanges, Session
@@ -19,35 +28,43 @@ class WebhookRelationshipsMixin(WebhookBaseMixin):
     def _process_relationships(
         cls, relationships: Optional[Dict[str, Any]]
     ) -> Optional[Dict[str, RelationshipConfigModel]]:
-        """Process and return relationship configurations"""
+        """Process and return relationship configurations, compiling their conditions"""
         if not relationships:
             return None
 
-        return {
+        rel_configs = {
             rel_name: RelationshipConfigModel(**rel_config.copy())
             for rel_name, rel_config in relationships.items()
         }
+        cls._compile_relationship_conditions(rel_configs)
+        return rel_configs
 
-    def _is_condition_met(self, rel_config: RelationshipConfigModel) -> bool:
-        """Check if the condition for a relationship is met"""
-        if not rel_config.condition:
-            return True
-
-        condition_field = rel_config.condition
-        condition_value = rel_config.condition_value
-        condition_operator = rel_config.condition_operator
-
-        if not hasattr(self, condition_field):
-            logger.warning(
-                f"Condition field '{condition_field}' not found in {self.__class__.__name__}"
-            )
-            return False
-
-        field_value = getattr(self, condition_field)
-        return self._evaluate_condition(field_value, condition_value, condition_operator)
+    @classmethod
+    def _compile_relationship_conditions(
+        cls, rel_configs: Dict[str, RelationshipConfigModel]
+    ) -> None:
+        """Compile the conditions of relationship configurations into their predicates"""
+        model_fields = cls.__table__.columns.keys()
+
+        for rel_config in rel_configs.values():
+            condition = rel_config.condition
+            if not condition:
+                continue
+            if condition.isidentifier():
+                rel_config._predicate = compile_field_condition(
+                    condition,
+                    rel_config.condition_value,
+                    rel_config.condition_operator,
+                    model_fields,
+                )
+            else:
+                rel_config._predicate = compile_condition(
+                    condition, model_fields, enum_namespace(cls.__module__)
+                )
 
+    @staticmethod
     def _extract_relationship_data(
-        self, rel_object: Any, rel_config: RelationshipConfigModel
+        rel_object: Any, rel_config: RelationshipConfigModel
     ) -> FieldChanges:
         """Extract data for a relationship based on its configuration"""
         if rel_config.fields:
@@ -67,6 +84,36 @@ class WebhookRelationshipsMixin(WebhookBaseMixin):
 
         return {key: value for key, value in rel_object.__dict__.items() if not key.startswith("_")}
 
+    @staticmethod
+    def _is_stale_relationship(state: InstanceState, rel_name: str) -> bool:
+        """Check whether a loaded relationship may no longer match its foreign key columns"""
+        relationship = state.mapper.relationships.get(rel_name)
+        # New and detached rows cannot be refreshed; their relationships are used as set
+        if relationship is None or not state.persistent:
+            return False
+
+        column_keys = {
+            column: state.mapper.get_property_by_column(column).key
+            for column in relationship.local_columns
+        }
+        if any(state.attrs[key].history.has_changes() for key in column_keys.values()):
+            return True
+        if relationship.direction is not MANYTOONE:
+            return False
+
+        # The key may have been flushed already while the old object is still attached
+        rel_object = state.dict.get(rel_name)
+        for local, remote in relationship.local_remote_pairs:
+            value = state.dict.get(column_keys[local])
+            if rel_object is None:
+                if value is not None:
+                    return True
+                continue
+            remote_key = relationship.mapper.get_property_by_column(remote).key
+            if getattr(rel_object, remote_key, None) != value:
+                return True
+        return False
+
     async def _add_relationship_data(
         self,
         session: Session,
@@ -77,12 +124,22 @@ class WebhookRelationshipsMixin(WebhookBaseMixin):
         if not relationships:
             return
 
+        metrics = get_metrics()
+        started = time.perf_counter() if metrics.enabled else 0.0
         try:
-            if rel_attrs := list(relationships.keys()):
+            # Relationships loaded up front (e.g. with selectinload) are not fetched again,
+            # unless their foreign key changed since they were loaded
+            state = inspect(self)
+            unloaded = state.unloaded
+            if rel_attrs := [
+                rel_name
+                for rel_name in relationships
+                if rel_name in unloaded or self._is_stale_relationship(state, rel_name)
+            ]:
                 await session.refresh(self, attribute_names=rel_attrs)
 
             for rel_name, rel_config in relationships.items():
-                if not self._is_condition_met(rel_config):
+                if not rel_config.is_met(self):
                     continue
 
                 rel_object = getattr(self, rel_name, None)
@@ -91,3 +148,10 @@ class WebhookRelationshipsMixin(WebhookBaseMixin):
 
         except Exception as e:
             logger.exception(f"Error processing relationships for {self.__class__.__name__}: {e}")
+
+        if metrics.enabled:
+            metrics.observe(
+                "webhook_relationships_seconds",
+                time.perf_counter() - started,
+                model=self.__class__.__name__,
+            )
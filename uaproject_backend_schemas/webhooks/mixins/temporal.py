@@ -1,7 +1,12 @@
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, List, Optional, Tuple
 
+from uaproject_backend_schemas.webhooks.callbacks import (
+    TemporalExpirationNotice,
+    get_temporal_callback_executor,
+)
+from uaproject_backend_schemas.webhooks.clock import as_aware
 from uaproject_backend_schemas.webhooks.mixins.config import TemporalFieldConfig
 from uaproject_backend_schemas.webhooks.types import ChangesDict, TemporalCallback, TemporalConfig
 
@@ -13,17 +18,29 @@ __all__ = ["WebhookTemporalMixin"]
 class WebhookTemporalMixin:
     """Mixin for handling temporal fields"""
 
-    _temporal_expiration_callbacks: Dict[str, TemporalCallback] = {}
-
     @classmethod
-    def register_temporal_expiration_callback(cls, callback: TemporalCallback) -> None:
+    def register_temporal_expiration_callback(
+        cls, callback: TemporalCallback, batch: bool = False
+    ) -> None:
         """
-        Register a callback function that will be called when a temporal field expires
+        Register a callback function that will be called when a temporal field of the model expires
+
+        Callbacks run on the background temporal callback executor, never inside
+        change detection, and may be sync or async.
 
         Args:
             callback: A function that takes (instance_id, scope_name, changes) as parameters
+            batch: Call the function once per flush with a list of `TemporalExpirationNotice`
         """
-        cls._temporal_expiration_callbacks[cls.__name__] = callback
+        cls._temporal_expiration_callbacks = [
+            *cls._get_temporal_expiration_callbacks(),
+            (callback, batch),
+        ]
+
+    @classmethod
+    def _get_temporal_expiration_callbacks(cls) -> List[Tuple[TemporalCallback, bool]]:
+        """Callbacks registered on this model itself, never inherited from another model"""
+        return cls.__dict__.get("_temporal_expiration_callbacks", [])
 
     @classmethod
     def _process_temporal_fields(
@@ -35,6 +52,7 @@ class WebhookTemporalMixin:
 
         model_fields = set(cls.__table__.columns.keys())
         temporal_field_configs = [TemporalFieldConfig(**config) for config in temporal_fields]
+        scope_prefix = f"{cls.__scope_prefix__}."
 
         for config in temporal_field_configs:
             if config.expires_at_field not in model_fields:
@@ -45,6 +63,8 @@ class WebhookTemporalMixin:
                 raise ValueError(
                     f"Status field '{config.status_field}' doesn't exist in {cls.__name__}"
                 )
+            if not config.scope_name.startswith(scope_prefix):
+                config.scope_name = f"{scope_prefix}{config.scope_name}"
 
         return temporal_field_configs
 
@@ -53,8 +73,9 @@ class WebhookTemporalMixin:
         temporal_configs: List[TemporalFieldConfig],
         inspector: Any,
         changed_fields: ChangesDict,
+        now: datetime,
     ) -> None:
-        """Extract changes from temporal fields"""
+        """Extract changes from temporal fields as of `now`"""
         for temp_config in temporal_configs:
             expires_field = temp_config.expires_at_field
 
@@ -67,7 +88,6 @@ class WebhookTemporalMixin:
 
             old_value = history.deleted[0] if history.deleted else None
             new_value = history.added[0] if history.added else None
-            now = datetime.now()
 
             if self._is_field_expired(old_value, new_value, now):
                 changed_fields[expires_field] = {
@@ -81,12 +101,14 @@ class WebhookTemporalMixin:
                 self._trigger_expiration_callback(temp_config, expires_field, old_value)
 
     def _is_field_expired(self, old_value: Any, new_value: Any, now: datetime) -> bool:
-        """Check if a temporal field has expired"""
+        """Check if a temporal field has expired, treating naive values as UTC"""
         return (
-            old_value
-            and isinstance(old_value, datetime)
-            and old_value > now
-            and (new_value is None or (isinstance(new_value, datetime) and new_value <= now))
+            isinstance(old_value, datetime)
+            and as_aware(old_value) > now
+            and (
+                new_value is None
+                or (isinstance(new_value, datetime) and as_aware(new_value) <= now)
+            )
         )
 
     def _handle_status_field_change(
@@ -107,48 +129,16 @@ class WebhookTemporalMixin:
     def _trigger_expiration_callback(
         self, temp_config: TemporalFieldConfig, expires_field: str, old_value: Any
     ) -> None:
-        """Call registered callback function when temporal field expires"""
-        class_name = self.__class__.__name__
-
-        if class_name not in self._temporal_expiration_callbacks or not hasattr(self, "id"):
+        """Queue registered callback functions when temporal field expires"""
+        callbacks = self._get_temporal_expiration_callbacks()
+        if not callbacks or not hasattr(self, "id"):
             return
 
-        callback = self._temporal_expiration_callbacks[class_name]
-        try:
-            callback(
-                self.id,
-                temp_config.scope_name,
-                {expires_field: {"before": old_value, "after": None}},
-            )
-        except Exception as e:
-            logger.error(f"Error in temporal expiration callback: {e}", exc_info=True)
-
-    def _evaluate_condition(
-        self, field_value: Any, condition_value: Any, condition_operator: str
-    ) -> bool:
-        """Evaluate the condition based on the operator"""
-        operators = {
-            "==": lambda a, b: a == b,
-            "!=": lambda a, b: a != b,
-            ">": lambda a, b: a > b,
-            "<": lambda a, b: a < b,
-            ">=": lambda a, b: a >= b,
-            "<=": lambda a, b: a <= b,
-            "is": lambda a, b: a is b,
-            "is not": lambda a, b: a is not b,
-        }
-
-        try:
-            operator_func = operators.get(condition_operator)
-            if not operator_func:
-                logger.warning(f"Unknown condition operator: {condition_operator}")
-                return False
-
-            return operator_func(field_value, condition_value)
-
-        except TypeError as e:
-            logger.error(
-                f"Condition check failed for field with value '{field_value}' "
-                f"and condition value '{condition_value}': {e}"
-            )
-            return False
+        notice = TemporalExpirationNotice(
+            self.id,
+            temp_config.scope_name,
+            {expires_field: {"before": old_value, "after": None}},
+        )
+        executor = get_temporal_callback_executor()
+        for callback, batch in callbacks:
+            executor.notify(callback, notice, batch)
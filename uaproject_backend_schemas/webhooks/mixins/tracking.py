@@ -0,0 +1,96 @@
+from functools import lru_cache
+from typing import Any, Iterable, Optional, Tuple
+
+from pydantic_core import from_json, to_json
+from sqlalchemy import JSON, event, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
+
+from uaproject_backend_schemas.webhooks.types import FieldChange
+
+__all__ = [
+    "json_fields",
+    "snapshot_json_fields",
+    "json_field_change",
+    "track_json_fields",
+    "flag_json_mutations",
+]
+
+JSON_SNAPSHOTS_KEY = "webhook_json_snapshots"
+TRACKED_FLAG = "__webhook_json_tracked__"
+
+
+def _serialize(value: Any) -> bytes:
+    return to_json(value, serialize_unknown=True)
+
+
+@lru_cache(maxsize=None)
+def json_fields(model: type) -> Tuple[str, ...]:
+    """Names of the JSON columns of a model"""
+    return tuple(column.key for column in model.__table__.columns if isinstance(column.type, JSON))
+
+
+def snapshot_json_fields(instance: Any, fields: Optional[Iterable[str]] = None) -> None:
+    """Store the serialized content of loaded JSON fields in the instance state"""
+    state = inspect(instance)
+    fields = json_fields(type(instance)) if fields is None else fields
+    snapshots = state.info.setdefault(JSON_SNAPSHOTS_KEY, {})
+    for field in fields:
+        if field in state.dict:
+            snapshots[field] = _serialize(state.dict[field])
+
+
+def json_field_change(instance: Any, field: str) -> Optional[FieldChange]:
+    """
+    Compare a JSON field with its snapshot.
+
+    Detects in-place mutations at any depth, including those missed by
+    `MutableDict`/`MutableList`, and recovers the value before the mutation.
+    Returns None if the field has no snapshot or is unchanged.
+    """
+    snapshot = inspect(instance).info.get(JSON_SNAPSHOTS_KEY, {}).get(field)
+    if snapshot is None:
+        return None
+
+    value = getattr(instance, field)
+    if _serialize(value) == snapshot:
+        return None
+    return {"before": from_json(snapshot), "after": value}
+
+
+def _snapshot_on_load(target: Any, *_: Any) -> None:
+    snapshot_json_fields(target)
+
+
+def _snapshot_after_write(mapper: Any, connection: Any, target: Any) -> None:
+    snapshot_json_fields(target)
+
+
+def track_json_fields(model: type) -> None:
+    """Snapshot the JSON fields of a model whenever its rows are loaded, refreshed or written"""
+    if model.__dict__.get(TRACKED_FLAG) or not json_fields(model):
+        return
+
+    event.listen(model, "load", _snapshot_on_load)
+    event.listen(model, "refresh", _snapshot_on_load)
+    event.listen(model, "after_insert", _snapshot_after_write)
+    event.listen(model, "after_update", _snapshot_after_write)
+    setattr(model, TRACKED_FLAG, True)
+
+
+def flag_json_mutations(session: Session, *_: Any) -> None:
+    """
+    Flag JSON fields mutated in place so the next flush persists them.
+
+    Meant as a `before_commit` listener, since a session holding only in-place
+    mutations looks clean and skips `before_flush`, e.g.
+    `event.listen(AsyncSession.sync_session_class, "before_commit", flag_json_mutations)`.
+    Call it directly before an explicit `flush()`.
+    """
+    for instance in list(session.identity_map.values()):
+        snapshots = inspect(instance).info.get(JSON_SNAPSHOTS_KEY)
+        if not snapshots:
+            continue
+        for field, snapshot in snapshots.items():
+            if _serialize(getattr(instance, field)) != snapshot:
+                flag_modified(instance, field)
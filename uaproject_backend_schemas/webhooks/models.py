@@ -1,17 +1,34 @@
 import logging
-from typing import TYPE_CHECKING, Dict, Optional
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from sqlmodel import JSON, BigInteger, Column, Enum, Field, ForeignKey, Relationship
+from sqlalchemy.ext.mutable import MutableDict
+from sqlmodel import (
+    JSON,
+    BigInteger,
+    Column,
+    DateTime,
+    Enum,
+    Field,
+    ForeignKey,
+    Index,
+    Relationship,
+)
 
-from uaproject_backend_schemas.base import Base, IDMixin, TimestampsMixin
+from uaproject_backend_schemas.base import Base, IDMixin, TimestampsMixin, utcnow
 from uaproject_backend_schemas.schemas import SerializableHttpUrl
 from uaproject_backend_schemas.webhooks.mixins import WebhookChangesMixin
-from uaproject_backend_schemas.webhooks.schemas import WebhookStatus
+from uaproject_backend_schemas.webhooks.schemas import (
+    WebhookEncoding,
+    WebhookOutboxStatus,
+    WebhookPriority,
+    WebhookStatus,
+)
 
 if TYPE_CHECKING:
     from uaproject_backend_schemas.users.models import User
 
-__all__ = ["Webhook"]
+__all__ = ["Webhook", "WebhookOutbox", "WebhookDeadLetter"]
 logger = logging.getLogger(__name__)
 
 
@@ -38,14 +55,29 @@ class Webhook(
         )
     )
 
-    scopes: Dict[str, bool] = Field(sa_column=Column(JSON, default=dict))
+    scopes: Dict[str, bool] = Field(sa_column=Column(MutableDict.as_mutable(JSON), default=dict))
+    scope_fields: Optional[Dict[str, List[str]]] = Field(
+        default=None, sa_column=Column(MutableDict.as_mutable(JSON), nullable=True)
+    )
     authorization: str | None = Field(sa_column=Column(JSON, default=None, nullable=True))
+    encoding: WebhookEncoding = Field(
+        sa_column=Column(
+            Enum(WebhookEncoding, native_enum=False),
+            default=WebhookEncoding.JSON.value,
+            server_default=WebhookEncoding.JSON.value,
+            nullable=False,
+        )
+    )
 
     user: Optional["User"] = Relationship(
         back_populates="webhooks",
         sa_relationship_kwargs={"foreign_keys": "[Webhook.user_id]"},
     )
 
+    def projection_for(self, scope: str) -> Optional[List[str]]:
+        """Payload fields this subscription receives for a scope, None for all of them"""
+        return (self.scope_fields or {}).get(scope)
+
     @classmethod
     def register_scopes(cls) -> None:
         cls.register_scope(
@@ -75,3 +107,59 @@ class Webhook(
             fields={"id", "endpoint", "status", "scopes", "authorization"},
             stage="both",
         )
+
+
+class WebhookOutbox(
+    Base,
+    IDMixin,
+    TimestampsMixin,
+    table=True,
+):
+    __tablename__ = "webhook_outbox"
+    __table_args__ = (
+        Index("ix_webhook_outbox_status_available_at", "status", "available_at"),
+        Index("ix_webhook_outbox_status_priority_id", "status", "priority", "id"),
+    )
+
+    scope: str = Field(max_length=255, index=True, nullable=False)
+    entity_id: int = Field(sa_column=Column(BigInteger(), nullable=False, index=True))
+    payload: Dict[str, Any] = Field(sa_column=Column(JSON, nullable=False))
+    status: WebhookOutboxStatus = Field(
+        default=WebhookOutboxStatus.PENDING,
+        sa_column=Column(
+            Enum(WebhookOutboxStatus, native_enum=False),
+            nullable=False,
+            default=WebhookOutboxStatus.PENDING.value,
+            server_default=WebhookOutboxStatus.PENDING.value,
+        ),
+    )
+    # `WebhookPriority.rank` of the scope, lower ranks are claimed first
+    priority: int = Field(default=WebhookPriority.NORMAL.rank, nullable=False)
+    attempts: int = Field(default=0, nullable=False)
+    available_at: datetime = Field(
+        default_factory=utcnow, sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    locked_until: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    locked_by: Optional[str] = Field(default=None, max_length=255, nullable=True)
+    last_error: Optional[str] = Field(default=None, nullable=True)
+
+
+class WebhookDeadLetter(
+    Base,
+    IDMixin,
+    TimestampsMixin,
+    table=True,
+):
+    __tablename__ = "webhook_dead_letters"
+
+    webhook_id: int = Field(
+        sa_column=Column(BigInteger(), ForeignKey("webhooks.id"), nullable=False, index=True)
+    )
+    event_id: int = Field(sa_column=Column(BigInteger(), nullable=False))
+    scope: str = Field(max_length=255, index=True, nullable=False)
+    entity_id: int = Field(sa_column=Column(BigInteger(), nullable=False))
+    payload: Dict[str, Any] = Field(sa_column=Column(JSON, nullable=False))
+    attempts: int = Field(default=0, nullable=False)
+    last_error: Optional[str] = Field(default=None, nullable=True)
@@ -0,0 +1,508 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from pydantic_core import to_jsonable_python
+from sqlalchemy import and_, delete, exists, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from uaproject_backend_schemas.base import utcnow
+from uaproject_backend_schemas.webhooks.dispatch import DEFAULT_WEIGHTS
+from uaproject_backend_schemas.webhooks.mixins.base import scope_priority
+from uaproject_backend_schemas.webhooks.mixins.changes import WebhookChangesMixin, WebhookEvent
+from uaproject_backend_schemas.webhooks.models import WebhookDeadLetter, WebhookOutbox
+from uaproject_backend_schemas.webhooks.retry import RetryPolicy, WebhookStatusTracker
+from uaproject_backend_schemas.webhooks.schemas import WebhookOutboxStatus, WebhookPriority
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "WebhookOutboxRecord",
+    "WebhookOutboxDrainer",
+    "enqueue_webhook_events",
+    "enqueue_deleted_events",
+]
+
+SessionFactory = Callable[[], AsyncSession]
+SKIPPED_ERROR = "Skipped after an earlier failed event of the entity"
+
+
+def _describe(error: Exception) -> str:
+    return str(error) or error.__class__.__name__
+
+
+class WebhookOutboxRecord(NamedTuple):
+    """Claimed outbox row detached from the session that leased it"""
+
+    id: int
+    scope: str
+    entity_id: int
+    payload: Dict[str, Any]
+    attempts: int
+
+
+async def enqueue_webhook_events(
+    session: AsyncSession,
+    instance: WebhookChangesMixin,
+    triggered_scopes: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> List[WebhookOutbox]:
+    """
+    Add outbox rows for the triggered scopes of an instance to the session.
+
+    Must be called before the session commits the change itself, so the change
+    and its webhook events are persisted in the same transaction.
+
+    Args:
+        session: Session holding the pending change
+        instance: Changed model instance
+        triggered_scopes: Precomputed result of `get_triggered_scopes`, computed if omitted
+    """
+    if triggered_scopes is None:
+        triggered_scopes = instance.get_triggered_scopes()
+
+    rows = []
+    for scope_name, scope_changes in triggered_scopes.items():
+        payload = await instance.get_payload_for_scope(session, scope_name, scope_changes)
+        rows.append(
+            WebhookOutbox(
+                scope=scope_name,
+                entity_id=instance.id,
+                payload=to_jsonable_python(payload),
+                priority=scope_priority(scope_name).rank,
+            )
+        )
+
+    session.add_all(rows)
+    return rows
+
+
+def enqueue_deleted_events(
+    session: AsyncSession, events: List[WebhookEvent]
+) -> List[WebhookOutbox]:
+    """
+    Add outbox rows for captured delete events to the session.
+
+    The payload of a delete event is the snapshot of the row before deletion.
+    """
+    rows = [
+        WebhookOutbox(
+            scope=event.scope,
+            entity_id=event.entity_id,
+            payload=to_jsonable_python(
+                {field: change["before"] for field, change in event.changes.items()}
+            ),
+            priority=scope_priority(event.scope).rank,
+        )
+        for event in events
+    ]
+    session.add_all(rows)
+    return rows
+
+
+class WebhookOutboxDrainer:
+    """
+    Batched drainer delivering webhook events from the outbox table.
+
+    Rows are claimed page by page with `FOR UPDATE SKIP LOCKED` and leased to this
+    worker for `lease` before being delivered outside the claiming transaction, so
+    any number of workers can drain the same table concurrently. Rows whose lease
+    expired without being acknowledged are claimed again by the next worker.
+
+    Every scope priority gets a share of each page proportional to its weight,
+    like in `WeightedFairQueue`, so `HIGH` rows are claimed ahead of a backlog
+    of `LOW` ones while `LOW` rows still make progress under sustained `HIGH`
+    load; shares left unused by one priority go to the others in priority
+    order.
+
+    Records of the same entity are delivered one after another in id order. A
+    row is only claimable while no earlier row of its entity waits on a retry
+    backoff or is leased, and earlier claimable rows of every entity in a page
+    are leased with it, so neither retries nor priorities reorder the events of
+    an entity; rows left `FAILED` no longer hold it back.
+    To keep that guarantee across several worker processes, give each of them a
+    distinct `shard` out of `shard_count`; rows are then split with the same
+    formula as `shard_for`.
+
+    Failed rows become claimable again after the backoff of `policy`. Rows that
+    exhaust `policy.max_attempts`, or fail with a non retryable error, are left
+    `FAILED` and copied to the dead-letter table when the error names the
+    webhook (`WebhookDeliveryError.webhook_id`). Webhook statuses follow the
+    outcomes through a `WebhookStatusTracker`, like with `WebhookRetryScheduler`.
+
+    Args:
+        session_factory: Callable returning a new `AsyncSession`
+        deliver: Coroutine delivering a single claimed record, raising on failure;
+            it may return the IDs of the webhooks it delivered to, so their
+            failure counts are reset
+        batch_size: Number of rows claimed per page
+        lease: How long claimed rows stay reserved for this worker
+        concurrency: Maximum number of records delivered at the same time
+        idle_interval: Seconds to wait before polling again after a partial page
+        worker_id: Identifier stored in `locked_by`, defaults to host and pid
+        shard: Index of the entity shard drained by this worker, all rows if omitted
+        shard_count: Total number of shards
+        policy: Backoff policy of failed rows
+        failure_threshold: Consecutive failures before a webhook status changes
+        rng: Random generator used for jitter
+        status_tracker: Tracker shared with the circuit breakers and the retry
+            scheduler, created from `session_factory` and `failure_threshold` if omitted
+        weights: Page share of every priority, `DEFAULT_WEIGHTS` by default
+    """
+
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        deliver: Callable[[WebhookOutboxRecord], Awaitable[Optional[Iterable[int]]]],
+        batch_size: int = 100,
+        lease: timedelta = timedelta(seconds=60),
+        concurrency: int = 10,
+        idle_interval: float = 1.0,
+        worker_id: Optional[str] = None,
+        shard: Optional[int] = None,
+        shard_count: int = 1,
+        policy: Optional[RetryPolicy] = None,
+        failure_threshold: int = 5,
+        rng: Optional[random.Random] = None,
+        status_tracker: Optional[WebhookStatusTracker] = None,
+        weights: Optional[Dict[WebhookPriority, int]] = None,
+    ):
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        if any(weight < 1 for weight in weights.values()):
+            raise ValueError("Priority weights must be positive")
+
+        self.session_factory = session_factory
+        self.deliver = deliver
+        self.batch_size = batch_size
+        self.lease = lease
+        self.idle_interval = idle_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.shard = shard
+        self.shard_count = shard_count
+        self.policy = policy or RetryPolicy()
+        self.status_tracker = status_tracker or WebhookStatusTracker(
+            session_factory, failure_threshold
+        )
+        self.rng = rng or random.Random()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        total = sum(weights.values())
+        self._shares = {
+            priority: max(batch_size * weights[priority] // total, 1)
+            for priority in WebhookPriority
+        }
+
+    def _claimable(self, now: datetime):
+        claimable = or_(
+            and_(
+                WebhookOutbox.status == WebhookOutboxStatus.PENDING,
+                WebhookOutbox.available_at <= now,
+            ),
+            and_(
+                WebhookOutbox.status == WebhookOutboxStatus.PROCESSING,
+                WebhookOutbox.locked_until < now,
+            ),
+        )
+        earlier = aliased(WebhookOutbox)
+        blocked_by_earlier = exists().where(
+            earlier.entity_id == WebhookOutbox.entity_id,
+            earlier.id < WebhookOutbox.id,
+            or_(
+                and_(
+                    earlier.status == WebhookOutboxStatus.PENDING,
+                    earlier.available_at > now,
+                ),
+                and_(
+                    earlier.status == WebhookOutboxStatus.PROCESSING,
+                    earlier.locked_until >= now,
+                ),
+            ),
+        )
+        claimable = and_(claimable, ~blocked_by_earlier)
+        if self.shard is None:
+            return claimable
+
+        entity_id = WebhookOutbox.entity_id
+        return and_(claimable, (entity_id // 1000 + entity_id) % self.shard_count == self.shard)
+
+    async def claim_batch(self, session: AsyncSession) -> List[WebhookOutboxRecord]:
+        """
+        Lease the next page of deliverable rows to this worker and commit the lease.
+
+        Each priority first fills its share of the page, the rest of the page is
+        filled by priority, then id. Earlier claimable rows of the entities in the
+        page are leased along with it, so an entity with a pending high priority
+        event is drained in order at that priority.
+        """
+        now = utcnow()
+        claimable = self._claimable(now)
+        records: List[WebhookOutboxRecord] = []
+        for priority, share in self._shares.items():
+            page_ids = self._page_ids(claimable, share, WebhookOutbox.priority == priority.rank)
+            records += await self._lease(session, WebhookOutbox.id.in_(page_ids), now)
+        if (remaining := self.batch_size - len(records)) > 0:
+            # Rows leased above are no longer claimable
+            page_ids = self._page_ids(claimable, remaining)
+            records += await self._lease(session, WebhookOutbox.id.in_(page_ids), now)
+
+        latest: Dict[int, int] = {}
+        for record in records:
+            latest[record.entity_id] = max(latest.get(record.entity_id, 0), record.id)
+        if latest:
+            earlier_ids = (
+                select(WebhookOutbox.id)
+                .where(
+                    claimable,
+                    or_(
+                        *(
+                            and_(WebhookOutbox.entity_id == entity_id, WebhookOutbox.id < last_id)
+                            for entity_id, last_id in latest.items()
+                        )
+                    ),
+                )
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            records += await self._lease(session, WebhookOutbox.id.in_(earlier_ids), now)
+
+        await session.commit()
+        return sorted(records, key=lambda r: r.id)
+
+    @staticmethod
+    def _page_ids(claimable: Any, limit: int, *criteria: Any) -> Any:
+        return (
+            select(WebhookOutbox.id)
+            .where(claimable, *criteria)
+            .order_by(WebhookOutbox.priority, WebhookOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+
+    async def _lease(
+        self, session: AsyncSession, criterion: Any, now: datetime
+    ) -> List[WebhookOutboxRecord]:
+        stmt = (
+            update(WebhookOutbox)
+            .where(criterion)
+            .values(
+                status=WebhookOutboxStatus.PROCESSING,
+                locked_until=now + self.lease,
+                locked_by=self.worker_id,
+                attempts=WebhookOutbox.attempts + 1,
+            )
+            .returning(
+                WebhookOutbox.id,
+                WebhookOutbox.scope,
+                WebhookOutbox.entity_id,
+                WebhookOutbox.payload,
+                WebhookOutbox.attempts,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        result = await session.execute(stmt)
+        return [WebhookOutboxRecord(*row) for row in result]
+
+    async def mark_delivered(self, session: AsyncSession, ids: List[int]) -> None:
+        """Mark leased rows as delivered"""
+        if not ids:
+            return
+
+        await session.execute(
+            update(WebhookOutbox)
+            .where(WebhookOutbox.id.in_(ids), WebhookOutbox.locked_by == self.worker_id)
+            .values(status=WebhookOutboxStatus.DELIVERED, locked_until=None)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def release(
+        self,
+        session: AsyncSession,
+        record: WebhookOutboxRecord,
+        error: str,
+        available_at: Optional[datetime] = None,
+        attempts: Optional[int] = None,
+    ) -> None:
+        """Return a leased row to the queue after a failed delivery"""
+        values: Dict[str, Any] = {
+            "status": WebhookOutboxStatus.PENDING,
+            "available_at": available_at or utcnow(),
+            "locked_until": None,
+            "last_error": error,
+        }
+        if attempts is not None:
+            values["attempts"] = attempts
+
+        await session.execute(
+            update(WebhookOutbox)
+            .where(WebhookOutbox.id == record.id, WebhookOutbox.locked_by == self.worker_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def dead_letter(
+        self, session: AsyncSession, record: WebhookOutboxRecord, error: Exception
+    ) -> None:
+        """Give up on a leased row, copying it to the dead-letter table when its webhook is known"""
+        logger.error(
+            f"Giving up on outbox event {record.id} ({record.scope}) "
+            f"after {record.attempts} attempts: {error}"
+        )
+        await session.execute(
+            update(WebhookOutbox)
+            .where(WebhookOutbox.id == record.id, WebhookOutbox.locked_by == self.worker_id)
+            .values(
+                status=WebhookOutboxStatus.FAILED,
+                locked_until=None,
+                last_error=_describe(error),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        webhook_id = getattr(error, "webhook_id", None)
+        if webhook_id is not None:
+            session.add(
+                WebhookDeadLetter(
+                    webhook_id=webhook_id,
+                    event_id=record.id,
+                    scope=record.scope,
+                    entity_id=record.entity_id,
+                    payload=record.payload,
+                    attempts=record.attempts,
+                    last_error=_describe(error),
+                )
+            )
+
+    async def _handle_failure(
+        self, session: AsyncSession, record: WebhookOutboxRecord, error: Exception
+    ) -> datetime:
+        """Release or dead-letter a failed row; returns when the entity may be retried"""
+        now = utcnow()
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            # The endpoint was not contacted (e.g. open circuit), so the attempt is not counted
+            available_at = now + timedelta(seconds=retry_after)
+            await self.release(
+                session, record, _describe(error), available_at, attempts=record.attempts - 1
+            )
+            return available_at
+
+        if not self.policy.should_retry(record.attempts, error):
+            await self.dead_letter(session, record, error)
+            return now
+
+        available_at = now + timedelta(seconds=self.policy.delay_for(record.attempts, self.rng))
+        await self.release(session, record, _describe(error), available_at)
+        return available_at
+
+    async def purge_delivered(self, session: AsyncSession, older_than: timedelta) -> int:
+        """Delete delivered rows last updated more than `older_than` ago"""
+        result = await session.execute(
+            delete(WebhookOutbox)
+            .where(
+                WebhookOutbox.status == WebhookOutboxStatus.DELIVERED,
+                WebhookOutbox.updated_at < utcnow() - older_than,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+        return result.rowcount
+
+    async def _deliver_entity(
+        self, records: List[WebhookOutboxRecord]
+    ) -> Tuple[Dict[int, Optional[Exception]], List[int]]:
+        # Failed records map to their error, records skipped after a failure to None
+        errors: Dict[int, Optional[Exception]] = {}
+        delivered_webhooks: List[int] = []
+        async with self._semaphore:
+            for record in records:
+                if errors:
+                    # Later events of the entity wait for the failed one to keep their order
+                    errors[record.id] = None
+                    continue
+                try:
+                    webhook_ids = await self.deliver(record)
+                except Exception as e:
+                    logger.warning(
+                        f"Delivery of outbox event {record.id} ({record.scope}) failed: {e}"
+                    )
+                    errors[record.id] = e
+                else:
+                    delivered_webhooks.extend(webhook_ids or ())
+        return errors, delivered_webhooks
+
+    async def drain_once(self) -> int:
+        """Claim, deliver and acknowledge a single page; returns the number of claimed rows"""
+        async with self.session_factory() as session:
+            records = await self.claim_batch(session)
+
+        if not records:
+            return 0
+
+        by_entity: Dict[int, List[WebhookOutboxRecord]] = {}
+        for record in records:
+            by_entity.setdefault(record.entity_id, []).append(record)
+
+        errors: Dict[int, Optional[Exception]] = {}
+        delivered_webhooks: List[int] = []
+        for entity_errors, entity_webhooks in await asyncio.gather(
+            *(self._deliver_entity(entity_records) for entity_records in by_entity.values())
+        ):
+            errors.update(entity_errors)
+            delivered_webhooks.extend(entity_webhooks)
+
+        async with self.session_factory() as session:
+            await self.mark_delivered(
+                session, [record.id for record in records if record.id not in errors]
+            )
+            retry_at: Dict[int, datetime] = {}
+            for record in records:
+                if record.id not in errors:
+                    continue
+                error = errors[record.id]
+                if error is None:
+                    # Skipped records were not attempted and follow their entity's failed one
+                    await self.release(
+                        session,
+                        record,
+                        SKIPPED_ERROR,
+                        retry_at[record.entity_id],
+                        attempts=record.attempts - 1,
+                    )
+                else:
+                    retry_at[record.entity_id] = await self._handle_failure(session, record, error)
+            await session.commit()
+
+        await self._track_statuses(errors.values(), delivered_webhooks)
+        return len(records)
+
+    async def _track_statuses(
+        self, errors: Iterable[Optional[Exception]], delivered_webhooks: List[int]
+    ) -> None:
+        for webhook_id in dict.fromkeys(delivered_webhooks):
+            await self.status_tracker.record_success(webhook_id)
+        for error in errors:
+            webhook_id = getattr(error, "webhook_id", None)
+            if webhook_id is not None and getattr(error, "retry_after", None) is None:
+                await self.status_tracker.record_failure(webhook_id, error)
+
+    async def run(self, stop_event: Optional[asyncio.Event] = None) -> None:
+        """Drain the outbox until `stop_event` is set"""
+        stop_event = stop_event or asyncio.Event()
+
+        while not stop_event.is_set():
+            try:
+                claimed = await self.drain_once()
+            except Exception as e:
+                logger.exception(f"Error draining webhook outbox: {e}")
+                claimed = 0
+
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=self.idle_interval)
+                except asyncio.TimeoutError:
+                    pass
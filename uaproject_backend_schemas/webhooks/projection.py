@@ -0,0 +1,134 @@
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Sequence, Tuple
+
+from uaproject_backend_schemas.webhooks.encoding import encode_entry, encode_map, encode_payload
+from uaproject_backend_schemas.webhooks.mixins.base import WebhookScopeFields
+from uaproject_backend_schemas.webhooks.schemas import (
+    WebhookEncoding,
+    WebhookPayloadFormat,
+    WebhookStage,
+)
+
+__all__ = ["payload_sections", "union_fields", "PayloadSlicer"]
+
+Projection = Optional[Iterable[str]]
+
+
+def payload_sections(scope_config: WebhookScopeFields) -> Optional[Tuple[str, ...]]:
+    """Keys of the nested field maps of a scope's payload, None for a flat payload"""
+    if scope_config.stage != WebhookStage.BOTH:
+        return None
+    if scope_config.payload_format == WebhookPayloadFormat.DIFF:
+        return ("unchanged", "changes")
+    return ("before", "after")
+
+
+def union_fields(projections: Iterable[Projection]) -> Optional[FrozenSet[str]]:
+    """
+    Fields requested by any of the subscribers of an event.
+
+    Returns None as soon as one subscriber has no projection, since the
+    payload must then be built in full.
+    """
+    fields = set()
+    for projection in projections:
+        if projection is None:
+            return None
+        fields.update(projection)
+    return frozenset(fields)
+
+
+class PayloadSlicer:
+    """
+    Delivery bodies of one event, sliced per subscriber field projection.
+
+    Every field is serialized at most once per encoding and shared by all
+    bodies; a body only joins the entries of its projected fields around the
+    shared envelope entries. Bodies are byte for byte identical to
+    `WebhookDeliverer.build_body` of the projected payload, and subscribers
+    with equal projections share the same bytes.
+
+    Args:
+        event_id: Event identifier of the envelope
+        scope: Full scope name
+        payload: Payload built by `get_payload_for_scope`
+        sections: Nested field maps of the payload, see `payload_sections`
+    """
+
+    def __init__(
+        self,
+        event_id: int,
+        scope: str,
+        payload: Dict[str, Any],
+        sections: Optional[Sequence[str]] = None,
+    ):
+        self.event_id = event_id
+        self.scope = scope
+        self.payload = payload
+        self.sections = tuple(sections) if sections else None
+        self._entries: Dict[Tuple[WebhookEncoding, Optional[str], str], bytes] = {}
+        self._bodies: Dict[Tuple[WebhookEncoding, Optional[FrozenSet[str]]], bytes] = {}
+
+    def _entry(
+        self, encoding: WebhookEncoding, section: Optional[str], key: str, value: Any
+    ) -> bytes:
+        cache_key = (encoding, section, key)
+        entry = self._entries.get(cache_key)
+        if entry is None:
+            entry = self._entries[cache_key] = encode_entry(
+                key, encode_payload(value, encoding), encoding
+            )
+        return entry
+
+    def _field_map(
+        self,
+        encoding: WebhookEncoding,
+        section: Optional[str],
+        values: Dict[str, Any],
+        fields: Optional[FrozenSet[str]],
+    ) -> bytes:
+        return encode_map(
+            [
+                self._entry(encoding, section, key, value)
+                for key, value in values.items()
+                if fields is None or key in fields
+            ],
+            encoding,
+        )
+
+    def _sliced_payload(self, encoding: WebhookEncoding, fields: Optional[FrozenSet[str]]) -> bytes:
+        if self.sections is None:
+            return self._field_map(encoding, None, self.payload, fields)
+        return encode_map(
+            [
+                encode_entry(
+                    section,
+                    self._field_map(encoding, section, self.payload.get(section) or {}, fields),
+                    encoding,
+                )
+                for section in self.sections
+            ],
+            encoding,
+        )
+
+    def body(
+        self, fields: Projection = None, encoding: WebhookEncoding = WebhookEncoding.JSON
+    ) -> bytes:
+        """Encoded delivery envelope holding only `fields` of the payload, all if None"""
+        projection = frozenset(fields) if fields is not None else None
+        cache_key = (encoding, projection)
+        body = self._bodies.get(cache_key)
+        if body is None:
+            envelope = {
+                "event_id": self.event_id,
+                "scope": self.scope,
+                "action": self.scope.rsplit(".", 1)[-1],
+            }
+            entries = [
+                encode_entry(key, encode_payload(value, encoding), encoding)
+                for key, value in envelope.items()
+            ]
+            entries.append(
+                encode_entry("payload", self._sliced_payload(encoding, projection), encoding)
+            )
+            body = self._bodies[cache_key] = encode_map(entries, encoding)
+        return body
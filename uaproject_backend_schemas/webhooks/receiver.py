@@ -0,0 +1,316 @@
+import asyncio
+import fnmatch
+import hmac
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from uaproject_backend_schemas.payloads import parse_webhook_payload
+from uaproject_backend_schemas.webhooks.delivery import (
+    EVENT_ID_HEADER,
+    SCOPE_HEADER,
+    SIGNATURE_HEADER,
+    sign_payload,
+)
+from uaproject_backend_schemas.webhooks.encoding import CONTENT_TYPES
+from uaproject_backend_schemas.webhooks.metrics import get_metrics
+from uaproject_backend_schemas.webhooks.schemas import WebhookEncoding
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "ReceivedWebhook",
+    "WebhookReceiveError",
+    "IdempotencyWindow",
+    "WebhookReceiver",
+]
+
+ENCODINGS: Dict[str, WebhookEncoding] = {
+    content_type: encoding for encoding, content_type in CONTENT_TYPES.items()
+}
+
+
+class ReceivedWebhook(NamedTuple):
+    """Verified and validated delivery handed to receiver handlers"""
+
+    event_id: Optional[int]
+    scope: str
+    payload: Any
+
+
+ReceiverHandler = Callable[[ReceivedWebhook], Awaitable[None]]
+
+
+class WebhookReceiveError(Exception):
+    """Raised when a delivery is rejected, carrying the HTTP status to answer with"""
+
+    def __init__(self, message: str, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class IdempotencyWindow:
+    """
+    Event IDs seen within the last `ttl` seconds.
+
+    Entries expire in insertion order, so expired IDs are evicted from the front
+    in O(1) each; at most `maxsize` IDs are kept.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 600.0,
+        maxsize: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._expires: "OrderedDict[int, float]" = OrderedDict()
+
+    def _evict(self, now: float) -> None:
+        while self._expires:
+            event_id, expires_at = next(iter(self._expires.items()))
+            if expires_at > now and len(self._expires) <= self.maxsize:
+                return
+            del self._expires[event_id]
+
+    def check_and_add(self, event_id: int) -> bool:
+        """Record an event ID; returns False if it was already seen within the window"""
+        now = self._clock()
+        self._evict(now)
+        if event_id in self._expires:
+            return False
+        self._expires[event_id] = now + self.ttl
+        return True
+
+    def discard(self, event_id: int) -> None:
+        """Forget an event ID so a retry of it is accepted again"""
+        self._expires.pop(event_id, None)
+
+    def __contains__(self, event_id: int) -> bool:
+        self._evict(self._clock())
+        return event_id in self._expires
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+
+class WebhookReceiver:
+    """
+    Receiving side of webhook deliveries.
+
+    Checks the `X-Webhook-Signature` header against the subscription's
+    `authorization` secret with a constant-time HMAC comparison, drops
+    duplicate event IDs, validates the body into the payload model of its
+    scope and awaits the handlers whose pattern matches the scope.
+
+    An event ID is only recorded as seen once its handlers have finished, so a
+    duplicate is acknowledged only after the original was processed. A
+    duplicate arriving while the original is still being handled is answered
+    with a retryable 503, so the sender retries it instead of dropping it in
+    case the original fails.
+
+    The receiver is an ASGI application, e.g. `app.mount("/webhooks", receiver)`;
+    frameworks with their own request objects call `handle` with the raw body
+    and headers instead.
+
+    Args:
+        secret: Shared `Webhook.authorization` secret; signatures are not checked if None
+        idempotency_window: Seconds during which repeated event IDs are dropped
+        max_tracked_events: Maximum number of event IDs kept for deduplication
+        in_flight_retry_after: Retry-After seconds answered to duplicates of events in progress
+    """
+
+    def __init__(
+        self,
+        secret: Optional[str] = None,
+        idempotency_window: float = 600.0,
+        max_tracked_events: int = 100_000,
+        in_flight_retry_after: float = 5.0,
+    ):
+        self.secret = secret
+        self.window = IdempotencyWindow(idempotency_window, max_tracked_events)
+        self.in_flight_retry_after = in_flight_retry_after
+        self._in_flight: Set[int] = set()
+        self._exact: Dict[str, List[ReceiverHandler]] = {}
+        self._patterns: List[Tuple[re.Pattern, ReceiverHandler]] = []
+        self._resolved: Dict[str, Tuple[ReceiverHandler, ...]] = {}
+
+    def add_handler(self, pattern: str, handler: ReceiverHandler) -> None:
+        """
+        Register a handler for scopes matching a pattern.
+
+        Args:
+            pattern: Scope key such as `user.discord_id`, or a glob such as `user.*` or `*`
+            handler: Coroutine function receiving a `ReceivedWebhook`
+        """
+        if any(char in pattern for char in "*?["):
+            self._patterns.append((re.compile(fnmatch.translate(pattern)), handler))
+        else:
+            self._exact.setdefault(pattern, []).append(handler)
+        self._resolved.clear()
+
+    def on(self, pattern: str) -> Callable[[ReceiverHandler], ReceiverHandler]:
+        """Decorator form of `add_handler`"""
+
+        def decorator(handler: ReceiverHandler) -> ReceiverHandler:
+            self.add_handler(pattern, handler)
+            return handler
+
+        return decorator
+
+    def handlers_for(self, scope: str) -> Tuple[ReceiverHandler, ...]:
+        """Handlers of a scope, resolved once per scope and cached"""
+        handlers = self._resolved.get(scope)
+        if handlers is None:
+            handlers = self._resolved[scope] = (
+                *self._exact.get(scope, ()),
+                *(handler for regex, handler in self._patterns if regex.match(scope)),
+            )
+        return handlers
+
+    def verify(self, body: bytes, signature: Optional[str]) -> bool:
+        """Check a body signature in constant time"""
+        if self.secret is None:
+            return True
+        if not signature:
+            return False
+        return hmac.compare_digest(sign_payload(self.secret, body), signature)
+
+    async def handle(self, body: bytes, headers: Mapping[str, str]) -> bool:
+        """
+        Verify, deduplicate, validate and dispatch a delivery.
+
+        Args:
+            body: Raw request body, exactly as received
+            headers: Request headers with lower-case names
+
+        Returns:
+            False if the event was already processed and was dropped
+
+        Raises:
+            WebhookReceiveError: If the delivery is rejected, with status 503 if the
+                same event is still being processed
+        """
+        if not self.verify(body, headers.get(SIGNATURE_HEADER.lower())):
+            raise WebhookReceiveError("Invalid webhook signature", 401)
+
+        encoding, scope = self._read_headers(headers)
+        raw_event_id = headers.get(EVENT_ID_HEADER.lower())
+        event_id = int(raw_event_id) if raw_event_id and raw_event_id.isdigit() else None
+        if event_id is not None:
+            if event_id in self.window:
+                logger.debug(f"Dropped duplicate webhook event {event_id}")
+                return False
+            if event_id in self._in_flight:
+                raise WebhookReceiveError(
+                    f"Webhook event {event_id} is still being processed",
+                    503,
+                    retry_after=self.in_flight_retry_after,
+                )
+            self._in_flight.add(event_id)
+
+        try:
+            await self._dispatch(body, scope, encoding, event_id)
+            # Failed events are not recorded, so a retry by the sender is accepted again
+            if event_id is not None:
+                self.window.check_and_add(event_id)
+        finally:
+            self._in_flight.discard(event_id)
+
+        metrics = get_metrics()
+        if metrics.enabled:
+            metrics.increment("webhook_received_total", scope=scope)
+        return True
+
+    @staticmethod
+    def _read_headers(headers: Mapping[str, str]) -> Tuple[WebhookEncoding, str]:
+        content_type = headers.get("content-type", CONTENT_TYPES[WebhookEncoding.JSON])
+        encoding = ENCODINGS.get(content_type.split(";", 1)[0].strip())
+        if encoding is None:
+            raise WebhookReceiveError(f"Unsupported content type {content_type}", 415)
+
+        scope = headers.get(SCOPE_HEADER.lower())
+        if not scope:
+            raise WebhookReceiveError(f"Missing {SCOPE_HEADER} header", 400)
+        return encoding, scope
+
+    async def _dispatch(
+        self, body: bytes, scope: str, encoding: WebhookEncoding, event_id: Optional[int]
+    ) -> None:
+        try:
+            payload = parse_webhook_payload(body, scope, encoding)
+        except ValueError as e:
+            raise WebhookReceiveError(f"Invalid webhook payload: {e}", 422) from e
+
+        event = ReceivedWebhook(event_id, scope, payload)
+        handlers = self.handlers_for(scope)
+        if len(handlers) == 1:
+            await handlers[0](event)
+        elif handlers:
+            await asyncio.gather(*(handler(event) for handler in handlers))
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        scope_type = scope["type"]
+        if scope_type == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope_type == "websocket":
+            # Deliveries are plain HTTP requests; refuse the handshake
+            return await send({"type": "websocket.close", "code": 1003})
+        if scope_type != "http":
+            raise ValueError(f"Unsupported ASGI scope type {scope_type}")
+
+        if scope["method"] != "POST":
+            return await self._respond(send, 405)
+
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+
+        headers = {
+            name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]
+        }
+        try:
+            await self.handle(b"".join(chunks), headers)
+        except WebhookReceiveError as e:
+            return await self._respond(send, e.status_code, e.retry_after)
+        except Exception as e:
+            logger.exception(f"Webhook handler failed: {e}")
+            return await self._respond(send, 500)
+        await self._respond(send, 204)
+
+    @staticmethod
+    async def _lifespan(receive: Callable, send: Callable) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _respond(send: Callable, status: int, retry_after: Optional[float] = None) -> None:
+        headers = []
+        if retry_after is not None:
+            headers.append((b"retry-after", str(max(int(retry_after), 1)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
@@ -0,0 +1,294 @@
+import hashlib
+import importlib
+import logging
+import os
+from enum import Enum
+from pathlib import Path
+from types import CodeType
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+from pydantic import BaseModel
+from pydantic_core import from_json, to_json
+from sqlalchemy.orm import configure_mappers
+
+from uaproject_backend_schemas.webhooks.conditions import enum_namespace
+from uaproject_backend_schemas.webhooks.mixins.base import (
+    WebhookBaseMixin,
+    WebhookScopeFields,
+    WebhookScopeIndex,
+    _scope_priorities,
+)
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "discover_webhook_models",
+    "scope_schema_hash",
+    "register_all_scopes",
+    "verify_all_action_handlers",
+]
+
+# Bumped whenever the layout of the cached scope configurations changes
+CACHE_VERSION = 3
+
+# Marks an enum `condition_value` in the cached scope configurations
+ENUM_KEY = "__enum__"
+
+
+def _model_key(model: type) -> str:
+    return f"{model.__module__}.{model.__qualname__}"
+
+
+def discover_webhook_models() -> List[type]:
+    """Mapped models of imported modules that declare their own `register_scopes`"""
+    models = []
+    pending = [WebhookBaseMixin]
+    seen = set()
+    while pending:
+        for subclass in pending.pop().__subclasses__():
+            if subclass in seen:
+                continue
+            seen.add(subclass)
+            pending.append(subclass)
+            if "register_scopes" in subclass.__dict__ and hasattr(subclass, "__table__"):
+                models.append(subclass)
+    return sorted(models, key=_model_key)
+
+
+def _hash_code(code: CodeType, digest: Any, names: Set[str]) -> None:
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    names.update(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _hash_code(const, digest, names)
+        elif isinstance(const, frozenset):
+            # Set literals are stored as frozensets whose repr order depends on hash seeds
+            digest.update(repr(sorted(map(repr, const))).encode())
+        else:
+            digest.update(repr(const).encode())
+
+
+def _hash_type(value: type, digest: Any, seen: Set[type]) -> None:
+    """Hash the members of an enum or the fields of a pydantic model, recursing into field types"""
+    if value in seen:
+        return
+    seen.add(value)
+    digest.update(_model_key(value).encode())
+
+    if issubclass(value, Enum):
+        digest.update(repr([(member.name, member.value) for member in value]).encode())
+        return
+
+    for name, field in value.model_fields.items():
+        digest.update(f"{name}:{field.annotation!r}:{field.is_required()}".encode())
+        for arg in _annotation_types(field.annotation):
+            _hash_type(arg, digest, seen)
+
+
+def _annotation_types(annotation: Any) -> List[type]:
+    """Enum and pydantic model classes referenced by a type annotation"""
+    if isinstance(annotation, type) and issubclass(annotation, (Enum, BaseModel)):
+        return [annotation]
+    return [
+        arg for inner in getattr(annotation, "__args__", ()) for arg in _annotation_types(inner)
+    ]
+
+
+def scope_schema_hash(models: Iterable[type]) -> str:
+    """
+    Hash of everything the compiled scopes of `models` depend on.
+
+    Covers table columns, relationships, scope prefixes and the bytecode of each
+    `register_scopes`, together with the fields of pydantic models and the members
+    of enums it references and the enums visible to its condition strings, so any
+    change to a model, its scope declarations or the schemas they use invalidates
+    a cached registry.
+    """
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    seen: Set[type] = set()
+    for model in sorted(models, key=_model_key):
+        digest.update(_model_key(model).encode())
+        digest.update(model.__scope_prefix__.encode())
+        for column in model.__table__.columns:
+            digest.update(f"{column.key}:{column.type!r}:{column.nullable}".encode())
+        digest.update(repr(sorted(model.__mapper__.relationships.keys())).encode())
+
+        register_scopes = model.__dict__["register_scopes"].__func__
+        names: Set[str] = set()
+        _hash_code(register_scopes.__code__, digest, names)
+        referenced = {
+            name: register_scopes.__globals__[name]
+            for name in names
+            if name in register_scopes.__globals__
+        }
+        referenced.update(enum_namespace(model.__module__))
+        for name in sorted(referenced):
+            value = referenced[name]
+            if isinstance(value, type) and issubclass(value, (Enum, BaseModel)):
+                _hash_type(value, digest, seen)
+    return digest.hexdigest()
+
+
+def _dump_enum(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return {ENUM_KEY: _model_key(type(value)), "value": value.value}
+    return value
+
+
+def _load_enum(value: Any) -> Any:
+    if not isinstance(value, dict) or ENUM_KEY not in value:
+        return value
+    # Only module-level enums are dumped, so the last dotted part is the class name
+    module_name, _, name = value[ENUM_KEY].rpartition(".")
+    try:
+        enum_type = getattr(importlib.import_module(module_name), name)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(f"Unknown enum {value[ENUM_KEY]}: {e}") from e
+    return enum_type(value["value"])
+
+
+def _dump_scopes(model: type) -> Dict[str, Any]:
+    dumped = {}
+    for scope_name, scope_config in model.get_webhook_scopes().items():
+        data = scope_config.model_dump(mode="json", exclude_defaults=True)
+        for rel_name, rel_config in (scope_config.relationships or {}).items():
+            if isinstance(rel_config.fields, BaseModel):
+                data["relationships"][rel_name]["fields"] = list(
+                    type(rel_config.fields).model_fields
+                )
+            if isinstance(rel_config.condition_value, Enum):
+                data["relationships"][rel_name]["condition_value"] = _dump_enum(
+                    rel_config.condition_value
+                )
+        dumped[scope_name] = data
+    return dumped
+
+
+def _load_scopes(model: type, dumped: Dict[str, Any]) -> None:
+    """Restore validated scope configurations, compiling conditions and binding handlers again"""
+    scopes = model.get_webhook_scopes()
+    for scope_name, data in dumped.items():
+        scope_config = WebhookScopeFields.model_validate(data)
+        for rel_config in (scope_config.relationships or {}).values():
+            rel_config.condition_value = _load_enum(rel_config.condition_value)
+        if scope_config.relationships:
+            model._compile_relationship_conditions(scope_config.relationships)
+        if scope_config.actions:
+            model._bind_actions(scope_config.actions)
+        scopes[scope_name] = scope_config
+        _scope_priorities[scope_name] = scope_config.priority
+
+    model._webhook_scope_index = None
+    if track_json_fields := getattr(model, "_track_json_fields", None):
+        track_json_fields()
+
+
+def _read_cache(path: Path, schema_hash: str) -> Optional[Dict[str, Any]]:
+    try:
+        cached = from_json(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("hash") != schema_hash:
+        return None
+    return cached.get("models")
+
+
+def _write_cache(path: Path, schema_hash: str, models: List[type]) -> None:
+    content = to_json(
+        {"hash": schema_hash, "models": {_model_key(m): _dump_scopes(m) for m in models}}
+    )
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write webhook scope cache {path}: {e}")
+
+
+def verify_all_action_handlers(models: Optional[Iterable[type]] = None) -> None:
+    """
+    Check that every action of every registered scope has a bound handler.
+
+    Meant to be called at startup once all action handlers are registered, so a
+    missing handler fails the deployment instead of every triggered action.
+
+    Args:
+        models: Models to check, all models found by `discover_webhook_models` if omitted
+
+    Raises:
+        ValueError: If handlers are missing, listing the models and action types
+    """
+    models = list(models) if models is not None else discover_webhook_models()
+    errors = []
+    for model in models:
+        if not hasattr(model, "verify_action_handlers"):
+            continue
+        try:
+            model.verify_action_handlers()
+        except ValueError as e:
+            errors.append(str(e))
+    if errors:
+        raise ValueError("; ".join(errors))
+
+
+def register_all_scopes(
+    models: Optional[Iterable[type]] = None,
+    cache_path: Union[str, Path, None] = None,
+    verify_handlers: bool = False,
+) -> Dict[type, WebhookScopeIndex]:
+    """
+    Register the scopes of all webhook models and compile their scope indexes.
+
+    Meant to be called once at startup, after all models are imported; mappers
+    are configured first. Models whose scopes are already registered are left
+    as they are, so calling it again is cheap.
+
+    With `cache_path`, the validated scope configurations are stored in a file
+    keyed by `scope_schema_hash`. Processes started later against the same
+    schema restore them from the file and skip field validation and config
+    processing; conditions are compiled and action handlers bound again.
+
+    Args:
+        models: Models to register, all models found by `discover_webhook_models` if omitted
+        cache_path: Optional file caching the compiled scope configurations
+        verify_handlers: Run `verify_all_action_handlers` once the scopes are
+            registered; handlers must then be registered before this call
+
+    Returns:
+        The compiled scope index of every model
+
+    Raises:
+        ValueError: If `verify_handlers` is set and action handlers are missing
+    """
+    configure_mappers()
+    models = list(models) if models is not None else discover_webhook_models()
+    pending = [model for model in models if not model.__dict__.get("_webhook_scopes_registry")]
+
+    if pending and cache_path is not None:
+        path = Path(cache_path)
+        schema_hash = scope_schema_hash(pending)
+        cached = _read_cache(path, schema_hash)
+
+        if cached is not None and all(_model_key(model) in cached for model in pending):
+            try:
+                for model in pending:
+                    _load_scopes(model, cached[_model_key(model)])
+                logger.debug(f"Restored webhook scopes of {len(pending)} model(s) from {path}")
+                pending = []
+            except ValueError as e:
+                logger.warning(f"Ignoring invalid webhook scope cache {path}: {e}")
+                for model in pending:
+                    model._webhook_scopes_registry = {}
+
+        if pending:
+            for model in pending:
+                model.register_scopes()
+            _write_cache(path, schema_hash, pending)
+    else:
+        for model in pending:
+            model.register_scopes()
+
+    if verify_handlers:
+        verify_all_action_handlers(models)
+    return {model: model.get_scope_index() for model in models}
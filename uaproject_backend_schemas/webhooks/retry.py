@@ -0,0 +1,297 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from uaproject_backend_schemas.webhooks.delivery import WebhookDeliveryJob
+from uaproject_backend_schemas.webhooks.models import Webhook, WebhookDeadLetter
+from uaproject_backend_schemas.webhooks.schemas import WebhookStatus
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "RetryPolicy",
+    "WebhookRetryScheduler",
+    "WebhookStatusTracker",
+    "update_webhook_status",
+]
+
+SessionFactory = Callable[[], AsyncSession]
+
+
+async def update_webhook_status(
+    session_factory: SessionFactory, webhook_id: int, status: WebhookStatus
+) -> None:
+    """Persist a new status of a webhook through the ORM, triggering `webhook.status`"""
+    try:
+        async with session_factory() as session:
+            webhook = await session.get(Webhook, webhook_id)
+            if webhook is None or webhook.status == status:
+                return
+            webhook.status = status
+            await session.commit()
+    except Exception as e:
+        logger.exception(f"Error updating status of webhook {webhook_id}: {e}")
+
+
+class RetryPolicy(BaseModel):
+    """Exponential backoff configuration for webhook deliveries"""
+
+    base_delay: float = 1.0
+    max_delay: float = 300.0
+    multiplier: float = 2.0
+    max_attempts: int = 8
+    jitter: bool = True
+
+    def delay_for(self, attempt: int, rng: Optional[random.Random] = None) -> float:
+        """Delay in seconds before retrying after the given (1-based) failed attempt"""
+        exponent = min(max(attempt - 1, 0), 64)
+        delay = min(self.max_delay, self.base_delay * self.multiplier**exponent)
+        if not self.jitter:
+            return delay
+        # Full jitter spreads retries of a burst of failures over the whole interval
+        return (rng or random).uniform(0, delay)
+
+    def should_retry(self, attempt: int, error: Exception) -> bool:
+        """Whether a delivery failed at the given (1-based) attempt is retried"""
+        return getattr(error, "retryable", True) and attempt < self.max_attempts
+
+
+class WebhookStatusTracker:
+    """
+    Single owner of `Webhook.status` in the delivery path.
+
+    After `failure_threshold` consecutive failures of the same webhook its
+    `status` is switched to the status suggested by the error (`UNRESPONSIVE`
+    or `ERROR`), and back to `ACTIVE` on the next success. Circuit breakers
+    report open circuits through `record_circuit`; a webhook behind an open
+    circuit is `UNRESPONSIVE`, and closing the circuit restores the status its
+    failure history calls for rather than `ACTIVE` unconditionally.
+
+    Args:
+        session_factory: Callable returning a new `AsyncSession` used for status
+            updates; changes are only logged when omitted
+        failure_threshold: Consecutive failures before the webhook status changes
+    """
+
+    def __init__(
+        self, session_factory: Optional[SessionFactory] = None, failure_threshold: int = 5
+    ):
+        self.session_factory = session_factory
+        self.failure_threshold = failure_threshold
+        self._failures: Dict[int, int] = {}
+        self._degraded: Dict[int, WebhookStatus] = {}
+        self._open_circuits: Set[int] = set()
+        self._statuses: Dict[int, WebhookStatus] = {}
+
+    def status_of(self, webhook_id: int) -> WebhookStatus:
+        """Status a webhook should have given its open circuit and failure history"""
+        if webhook_id in self._open_circuits:
+            return WebhookStatus.UNRESPONSIVE
+        return self._degraded.get(webhook_id, WebhookStatus.ACTIVE)
+
+    async def record_success(self, webhook_id: int) -> None:
+        """Reset the failure count of a webhook, restoring `ACTIVE` if it was degraded"""
+        self._failures.pop(webhook_id, None)
+        self._degraded.pop(webhook_id, None)
+        await self._apply(webhook_id)
+
+    async def record_failure(self, webhook_id: int, error: Exception) -> None:
+        """Count a failed delivery, degrading the webhook once the threshold is reached"""
+        failures = self._failures.get(webhook_id, 0) + 1
+        self._failures[webhook_id] = failures
+
+        if failures >= self.failure_threshold:
+            self._degraded[webhook_id] = getattr(error, "status", WebhookStatus.ERROR)
+            await self._apply(webhook_id)
+
+    async def record_circuit(self, webhook_id: int, is_open: bool) -> None:
+        """Record that the circuit of a webhook's endpoint opened or closed"""
+        if is_open:
+            self._open_circuits.add(webhook_id)
+        else:
+            self._open_circuits.discard(webhook_id)
+        await self._apply(webhook_id)
+
+    async def _apply(self, webhook_id: int) -> None:
+        status = self.status_of(webhook_id)
+        if self._statuses.get(webhook_id, WebhookStatus.ACTIVE) == status:
+            return
+        if status == WebhookStatus.ACTIVE:
+            self._statuses.pop(webhook_id, None)
+        else:
+            self._statuses[webhook_id] = status
+        await self.set_webhook_status(webhook_id, status)
+
+    async def set_webhook_status(self, webhook_id: int, status: WebhookStatus) -> None:
+        """Persist a new status of a webhook"""
+        logger.warning(f"Webhook {webhook_id} status changed to {status}")
+        if self.session_factory is not None:
+            await update_webhook_status(self.session_factory, webhook_id, status)
+
+
+class WebhookRetryScheduler:
+    """
+    Retry scheduler around webhook delivery.
+
+    Failed jobs are pushed to a heap ordered by their due time and `run` sleeps
+    until the earliest one is due instead of polling. Jobs that exhaust
+    `policy.max_attempts`, or fail with a non retryable error, are moved to the
+    dead-letter table. Webhook statuses follow the outcomes through a
+    `WebhookStatusTracker`.
+
+    Args:
+        deliver: Coroutine delivering a job, raising on failure
+        session_factory: Callable returning a new `AsyncSession` used for status
+            updates and dead letters; both are only logged when omitted
+        status_tracker: Tracker shared with the circuit breakers and the outbox
+            drainer, created from `session_factory` and `failure_threshold` if omitted
+        policy: Backoff policy
+        failure_threshold: Consecutive failures before the webhook status changes
+        concurrency: Maximum number of deliveries in flight
+        clock: Monotonic clock returning seconds
+        rng: Random generator used for jitter
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[WebhookDeliveryJob], Awaitable[None]],
+        session_factory: Optional[SessionFactory] = None,
+        policy: Optional[RetryPolicy] = None,
+        failure_threshold: int = 5,
+        concurrency: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+        status_tracker: Optional[WebhookStatusTracker] = None,
+    ):
+        self.deliver = deliver
+        self.session_factory = session_factory
+        self.policy = policy or RetryPolicy()
+        self.status_tracker = status_tracker or WebhookStatusTracker(
+            session_factory, failure_threshold
+        )
+        self.clock = clock
+        self.rng = rng or random.Random()
+
+        self._heap: List[Tuple[float, int, WebhookDeliveryJob]] = []
+        self._sequence = itertools.count()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._wakeup = asyncio.Event()
+        self._tasks: Set[asyncio.Task] = set()
+        self._stopped = False
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    async def submit(self, job: WebhookDeliveryJob) -> None:
+        """Deliver a job now, scheduling a retry if it fails"""
+        await self._attempt(job)
+
+    def schedule(self, job: WebhookDeliveryJob, delay: float) -> None:
+        """Schedule a delivery attempt of a job in `delay` seconds"""
+        heapq.heappush(self._heap, (self.clock() + delay, next(self._sequence), job))
+        self._wakeup.set()
+
+    def pop_due(self, now: Optional[float] = None) -> List[WebhookDeliveryJob]:
+        """Remove and return all jobs whose retry is due"""
+        now = self.clock() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[2])
+        return due
+
+    def next_due_in(self) -> Optional[float]:
+        """Seconds until the next retry is due, None when nothing is scheduled"""
+        if not self._heap:
+            return None
+        return max(self._heap[0][0] - self.clock(), 0.0)
+
+    async def _attempt(self, job: WebhookDeliveryJob) -> None:
+        job = job._replace(attempts=job.attempts + 1)
+
+        async with self._semaphore:
+            try:
+                await self.deliver(job)
+            except Exception as e:
+                await self._on_failure(job, e)
+            else:
+                await self._on_success(job)
+
+    async def _on_success(self, job: WebhookDeliveryJob) -> None:
+        await self.status_tracker.record_success(job.webhook_id)
+
+    async def _on_failure(self, job: WebhookDeliveryJob, error: Exception) -> None:
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            # The endpoint was not contacted (e.g. open circuit), so the attempt is not counted
+            self.schedule(job._replace(attempts=job.attempts - 1), retry_after)
+            return
+
+        await self.status_tracker.record_failure(job.webhook_id, error)
+
+        if not self.policy.should_retry(job.attempts, error):
+            await self.dead_letter(job, error)
+            return
+
+        self.schedule(job, self.policy.delay_for(job.attempts, self.rng))
+
+    async def set_webhook_status(self, webhook_id: int, status: WebhookStatus) -> None:
+        """Persist a new status of a webhook"""
+        await self.status_tracker.set_webhook_status(webhook_id, status)
+
+    async def dead_letter(self, job: WebhookDeliveryJob, error: Exception) -> None:
+        """Move a job that will not be retried to the dead-letter table"""
+        logger.error(
+            f"Giving up on event {job.event_id} ({job.scope}) for webhook {job.webhook_id} "
+            f"after {job.attempts} attempts: {error}"
+        )
+        if self.session_factory is None:
+            return
+
+        try:
+            async with self.session_factory() as session:
+                session.add(
+                    WebhookDeadLetter(
+                        webhook_id=job.webhook_id,
+                        event_id=job.event_id,
+                        scope=job.scope,
+                        entity_id=job.entity_id,
+                        payload=to_jsonable_python(job.payload),
+                        attempts=job.attempts,
+                        last_error=str(error),
+                    )
+                )
+                await session.commit()
+        except Exception as e:
+            logger.exception(f"Error storing dead letter for event {job.event_id}: {e}")
+
+    def stop(self) -> None:
+        """Stop `run` after the current iteration"""
+        self._stopped = True
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        """Attempt scheduled retries as they become due until `stop` is called"""
+        self._stopped = False
+
+        while not self._stopped:
+            for job in self.pop_due():
+                task = asyncio.create_task(self._attempt(job))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.next_due_in())
+            except asyncio.TimeoutError:
+                pass
+
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import StrEnum
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -16,6 +16,12 @@ __all__ = [
     "WebhookResponse",
     "WebhookFilterParams",
     "WebhookStage",
+    "WebhookOutboxStatus",
+    "WebhookCircuitState",
+    "WebhookActionStatus",
+    "WebhookPayloadFormat",
+    "WebhookPriority",
+    "WebhookEncoding",
 ]
 
 
@@ -35,11 +41,38 @@ class WebhookStatus(StrEnum):
     ERROR = "error"
 
 
+class WebhookOutboxStatus(StrEnum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    DELIVERED = "delivered"
+    FAILED = "failed"
+
+
+class WebhookCircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class WebhookActionStatus(StrEnum):
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    TIMED_OUT = "timed_out"
+    SKIPPED = "skipped"
+
+
+class WebhookEncoding(StrEnum):
+    JSON = "json"
+    MSGPACK = "msgpack"
+
+
 class WebhookBase(BaseResponseModel):
     endpoint: SerializableHttpUrl
     scopes: Dict[str, bool]
+    scope_fields: Optional[Dict[str, List[str]]] = None
     user_id: Optional[int] = None
     authorization: Optional[str] = None
+    encoding: WebhookEncoding = WebhookEncoding.JSON
 
 
 class WebhookCreate(WebhookBase):
@@ -50,6 +83,7 @@ class WebhookUpdate(WebhookBase):
     endpoint: Optional[SerializableHttpUrl] = None
     scopes: Optional[Dict[str, bool]] = None
     status: Optional[WebhookStatus] = None
+    encoding: Optional[WebhookEncoding] = None
 
 
 class WebhookStage(StrEnum):
@@ -58,6 +92,22 @@ class WebhookStage(StrEnum):
     BOTH = "both"
 
 
+class WebhookPriority(StrEnum):
+    HIGH = "high"
+    NORMAL = "normal"
+    LOW = "low"
+
+    @property
+    def rank(self) -> int:
+        """Sort key of the priority, lower ranks are delivered first"""
+        return list(WebhookPriority).index(self)
+
+
+class WebhookPayloadFormat(StrEnum):
+    FULL = "full"
+    DIFF = "diff"
+
+
 class WebhookResponse(WebhookBase):
     id: int
     user_id: Optional[int]
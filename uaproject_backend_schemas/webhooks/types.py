@@ -1,4 +1,4 @@
-from typing import Any, Callable, Dict, Optional, TypeVar
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar, Union
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -12,7 +12,8 @@ ChangesDict = Dict[str, FieldChange]
 
 # Callback types
 ActionHandler = Callable[[Any, Dict[str, Any]], None]
-TemporalCallback = Callable[[int, str, ChangesDict], None]
+BatchActionHandler = Callable[[Any, Any, List[Any], Dict[str, Any]], None]
+TemporalCallback = Callable[..., Union[None, Awaitable[None]]]
 
 # Configuration types
 ActionConfig = Dict[str, Any]